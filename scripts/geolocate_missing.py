@@ -57,7 +57,7 @@ Options:
     --id CODE             Chercher un seul invader (ex: PA_1531, LDN_42)
     --city, -c CODE       Filtrer par ville (ex: PA, NYC, BGK)
     --limit, -l N         Nombre max d'invaders à traiter
-    --retry-failed        Relancer même si geo_search_exhausted
+    --retry-failed        Relancer même si geo_search_exhausted (ignore aussi data/geo_cache.json)
     --no-browser          Mode sans navigateur: Pnote+EXIF+OCR+Lens+Vision (idéal CI/CD)
     --pnote-url [URL]     Télécharger pnote.eu (URL par défaut fournie)
     --pnote-file FILE     Fichier JSON pnote.eu local
@@ -101,6 +101,7 @@ import math
 import os
 import re
 import time
+from collections import Counter
 from datetime import datetime
 from io import BytesIO
 from pathlib import Path
@@ -115,6 +116,7 @@ DATA_DIR = REPO_DIR / "data"
 
 MASTER_FILE = DATA_DIR / "invaders_master.json"
 MISSING_FILE = DATA_DIR / "invaders_missing_from_github.json"
+GEO_CACHE_FILE = DATA_DIR / "geo_cache.json"
 
 def _p(path):
     """Convertit un Path en string pour les fonctions qui attendent str."""
@@ -145,6 +147,13 @@ try:
 except ImportError:
     CV2_AVAILABLE = False
 
+# Tentative d'import orjson pour la lecture/écriture JSON rapide (optionnel)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Configuration
 HEADERS = {
     'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
@@ -316,18 +325,20 @@ CITY_CENTERS = {
 }
 
 
+_DEG_TO_RAD = math.pi / 180
+_EARTH_DIAMETER_M = 2 * 6371000
+
+
 def calculate_distance(lat1, lng1, lat2, lng2):
-    """Calcule la distance en mètres entre deux points GPS"""
-    R = 6371000
-    lat1_rad = math.radians(lat1)
-    lat2_rad = math.radians(lat2)
-    delta_lat = math.radians(lat2 - lat1)
-    delta_lng = math.radians(lng2 - lng1)
-    
-    a = math.sin(delta_lat/2)**2 + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(delta_lng/2)**2
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
-    
-    return R * c
+    """Calcule la distance en mètres entre deux points GPS (haversine)"""
+    lat1_rad = lat1 * _DEG_TO_RAD
+    lat2_rad = lat2 * _DEG_TO_RAD
+    sin_dlat = math.sin((lat2_rad - lat1_rad) / 2)
+    sin_dlng = math.sin((lng2 - lng1) * _DEG_TO_RAD / 2)
+    
+    a = sin_dlat * sin_dlat + math.cos(lat1_rad) * math.cos(lat2_rad) * sin_dlng * sin_dlng
+    # 2·asin(√a) == 2·atan2(√a, √(1-a)) pour a ∈ [0, 1], avec une racine de moins
+    return _EARTH_DIAMETER_M * math.asin(math.sqrt(min(a, 1.0)))
 
 
 # Rayon max de cohérence ville (en mètres)
@@ -4612,15 +4623,7 @@ class InvaderLocationSearcher:
         
         # 10. Afficher le résumé
         if coherence['status'] != 'unknown':
-            status_icons = {
-                'excellent': '🟢',
-                'good': '🟢',
-                'warning': '🟡',
-                'conflict': '🔴',
-                'single_source': '🔵',
-                'not_found': '⚪'
-            }
-            icon = status_icons.get(coherence['status'], '❓')
+            icon = COHERENCE_ICONS.get(coherence['status'], '❓')
             print(f"   {icon} Cohérence: {coherence['details']}")
         
         if results.get('rejected_sources'):
@@ -4629,12 +4632,91 @@ class InvaderLocationSearcher:
         return results
 
 
+# Dict vide partagé pour les fallbacks `x.get(...) or _EMPTY` (lecture seule)
+_EMPTY = {}
+
+# Icônes d'affichage (cohérence entre sources, confiance, raisons --from-master)
+COHERENCE_ICONS = {
+    'excellent': '🟢',
+    'good': '🟢',
+    'warning': '🟡',
+    'conflict': '🔴',
+    'single_source': '🔵',
+    'not_found': '⚪'
+}
+
+CONFIDENCE_ICONS = {'high': '🟢', 'medium': '🟡', 'low': '🔴'}
+
+REASON_LABELS = {
+    'no_coords': '📭 Pas de coordonnées',
+    'invalid_coords': '❌ Coordonnées invalides',
+    'zero_coords': '0️⃣ Coordonnées à zéro',
+    'near_zero': '0️⃣ Coordonnées proches de zéro',
+    'location_unknown': '❓ Marqué location_unknown',
+    'city_center_tag': '🏙️ Source = city_center',
+    'very_low_confidence': '🔴 Confiance very_low',
+    'at_city_center': '📍 Au centre-ville exact',
+}
+
+
+_COMMA_TO_DOT = str.maketrans(',', '.')
+
+
+def parse_coord(value):
+    """Convertit une coordonnée ('48,8566', '48.8566', 48.8566) en float, None si absente/invalide"""
+    if value is None or value == '':
+        return None
+    try:
+        return float(str(value).translate(_COMMA_TO_DOT))
+    except (ValueError, TypeError):
+        return None
+
+
+def searcher_messages(searcher):
+    """Messages (démarrage, arrêt) selon le mode du searcher: navigateur ou HTTP seul"""
+    if searcher.no_browser:
+        return "🤖 Sources HTTP démarrées", "🤖 Sources HTTP arrêtées"
+    return "🌐 Navigateur démarré", "🌐 Navigateur fermé"
+
+
 def load_invaders(filepath):
-    """Charge le fichier JSON des invaders"""
+    """Charge le fichier JSON des invaders (orjson si disponible, sinon json)"""
+    if ORJSON_AVAILABLE:
+        with open(filepath, 'rb') as f:
+            return orjson.loads(f.read())
     with open(filepath, 'r', encoding='utf-8') as f:
         return json.load(f)
 
 
+def dump_json(data, filepath):
+    """Écrit un fichier JSON indenté (orjson si disponible, sinon json)"""
+    if ORJSON_AVAILABLE:
+        with open(filepath, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2, default=str))
+    else:
+        with open(filepath, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False, default=str)
+
+
+def geo_cache_key(inv_id, city_code):
+    """Clé du cache de recherche: 'PA_1234|PA' (id normalisé comme pour --id)"""
+    return f"{inv_id.upper().replace('-', '_')}|{(city_code or '').upper()}"
+
+
+def load_geo_cache(filepath=GEO_CACHE_FILE):
+    """Charge le cache persistant des recherches réussies ({} si absent ou corrompu)"""
+    try:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def save_geo_cache(cache, filepath=GEO_CACHE_FILE):
+    """Sauvegarde le cache persistant des recherches réussies"""
+    dump_json(cache, filepath)
+
+
 # =============================================================================
 # NOUVELLES FONCTIONS: Mode --from-missing et --merge
 # =============================================================================
@@ -4816,22 +4898,26 @@ def interactive_manual_address(inv_id, city_name):
         return None
 
 
-def process_missing_invaders(missing_file, output_file, searcher, city_filter=None, limit=None, pause=1.0, interactive=False):
+def process_missing_invaders(missing_file, output_file, searcher, city_filter=None, limit=None, pause=1.0, interactive=False, missing_data=None):
     """
     Traite les invaders depuis invaders_missing_from_github.json
     et génère un fichier compatible avec invaders_updated.json
     
     Args:
         interactive: Si True, propose Google Lens pour les non trouvés
+        missing_data: Liste déjà en mémoire (même format), utilisée à la place de missing_file
     """
-    print(f"📂 Chargement de {missing_file}...")
-    with open(missing_file, 'r', encoding='utf-8') as f:
-        missing_invaders = json.load(f)
-    print(f"   {len(missing_invaders)} invaders manquants chargés")
+    if missing_data is not None:
+        missing_invaders = missing_data
+    else:
+        print(f"📂 Chargement de {missing_file}...")
+        missing_invaders = load_invaders(missing_file)
+        print(f"   {len(missing_invaders)} invaders manquants chargés")
     
     # Filtrer par ville
     if city_filter:
-        missing_invaders = [inv for inv in missing_invaders if inv.get('city', '').upper() == city_filter.upper()]
+        city_up = city_filter.upper()
+        missing_invaders = [inv for inv in missing_invaders if inv.get('city', '').upper() == city_up]
         print(f"   {len(missing_invaders)} invaders pour {city_filter}")
     
     # Limiter
@@ -5150,8 +5236,7 @@ def process_missing_invaders(missing_file, output_file, searcher, city_filter=No
     print(f"   🔴 LOW:    {stats['low']}")
     
     # Sauvegarder JSON
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(results, f, indent=2, ensure_ascii=False, default=str)
+    dump_json(results, output_file)
     print(f"\n📄 Résultats: {output_file}")
     
     # Rapport texte
@@ -5180,7 +5265,7 @@ def process_missing_invaders(missing_file, output_file, searcher, city_filter=No
         f.write(f", LOW: {stats['low']}\n\n")
         
         for inv in results:
-            conf_icon = {'high': '🟢', 'medium': '🟡', 'low': '🔴'}.get(inv['geo_confidence'], '❓')
+            conf_icon = CONFIDENCE_ICONS.get(inv['geo_confidence'], '❓')
             f.write(f"{inv['id']} {conf_icon} ({inv['geo_confidence'].upper()})\n")
             if inv['lat'] and inv['lng']:
                 f.write(f"   GPS: {inv['lat']:.6f}, {inv['lng']:.6f}\n")
@@ -5211,26 +5296,19 @@ def merge_with_updated(geolocated_file, updated_file=None, backup=False, dry_run
     print(f"🔗 FUSION AVEC {os.path.basename(updated_file)}")
     print("=" * 60)
     
-    # Vérifier les fichiers
-    if not os.path.exists(geolocated_file):
-        print(f"❌ Fichier non trouvé: {geolocated_file}")
-        return
-    
-    if not os.path.exists(updated_file):
-        print(f"❌ Fichier non trouvé: {updated_file}")
+    # Charger (EAFP: pas de os.path.exists préalable)
+    try:
+        print(f"\n📂 Chargement de {updated_file}...")
+        updated_db = load_invaders(updated_file)
+        print(f"   {len(updated_db)} invaders existants")
+        
+        print(f"📂 Chargement de {geolocated_file}...")
+        geolocated = load_invaders(geolocated_file)
+        print(f"   {len(geolocated)} invaders géolocalisés")
+    except FileNotFoundError as e:
+        print(f"❌ Fichier non trouvé: {e.filename}")
         return
     
-    # Charger
-    print(f"\n📂 Chargement de {updated_file}...")
-    with open(updated_file, 'r', encoding='utf-8') as f:
-        updated_db = json.load(f)
-    print(f"   {len(updated_db)} invaders existants")
-    
-    print(f"📂 Chargement de {geolocated_file}...")
-    with open(geolocated_file, 'r', encoding='utf-8') as f:
-        geolocated = json.load(f)
-    print(f"   {len(geolocated)} invaders géolocalisés")
-    
     # Index des existants
     existing_ids = {}
     for i, inv in enumerate(updated_db):
@@ -5334,7 +5412,7 @@ def main():
     parser.add_argument('--id', dest='invader_id', default=None,
                         help='Chercher un seul invader par son code (ex: PA_1531, LDN_42)')
     parser.add_argument('--retry-failed', dest='retry_failed', action='store_true',
-                        help='Relancer la recherche des invaders marqués geo_search_exhausted')
+                        help='Relancer la recherche des invaders marqués geo_search_exhausted (et ignorer le cache de recherche)')
     parser.add_argument('--no-browser', dest='no_browser', action='store_true',
                         help='Mode sans navigateur: Pnote + EXIF + OCR + Lens + Vision uniquement (idéal CI/CD)')
     parser.add_argument('--no-lens', dest='no_lens', action='store_true',
@@ -5368,22 +5446,31 @@ def main():
     # Mode --from-master: géolocaliser les invaders mal localisés du master
     # =========================================================================
     if args.from_master:
-        if not MASTER_FILE.exists():
+        print(f"📂 Chargement du master: {MASTER_FILE.name}...")
+        try:
+            master_db = load_invaders(_p(MASTER_FILE))
+        except FileNotFoundError:
             print(f"❌ Fichier master non trouvé: {MASTER_FILE}")
             return
-        
-        print(f"📂 Chargement du master: {MASTER_FILE.name}...")
-        with open(_p(MASTER_FILE), 'r', encoding='utf-8') as f:
-            master_db = json.load(f)
         print(f"   {len(master_db)} invaders chargés")
         
-        # Centres des villes connus (utilise le dictionnaire global CITY_CENTERS)
-        city_centers_coords = {code: (info['lat'], info['lng']) for code, info in CITY_CENTERS.items()}
+        # Centres des villes connus, arrondis à 1e-4° et convertis en entiers
+        # (comparaison entière au lieu de 4 round() flottants par invader)
+        city_centers_int = {
+            code: (round(info['lat'] * 10000), round(info['lng'] * 10000))
+            for code, info in CITY_CENTERS.items()
+        }
+        
+        # Raisons ignorées si la recherche a déjà échoué (geo_search_exhausted),
+        # sauf --retry-failed. Les coordonnées absentes/invalides sont toujours retentées.
+        skip_exhausted = not args.retry_failed
+        exhaustible_reasons = {'location_unknown', 'city_center_tag', 'very_low_confidence', 'at_city_center'}
         
-        def is_poorly_located(inv):
-            """Détermine si un invader a besoin d'être re-géolocalisé."""
-            lat = inv.get('lat')
-            lng = inv.get('lng')
+        def is_poorly_located(inv, city):
+            """Détermine si un invader a besoin d'être re-géolocalisé (city: code ville en majuscules)."""
+            g = inv.get
+            lat = g('lat')
+            lng = g('lng')
             
             # Pas de coordonnées
             if lat is None or lng is None:
@@ -5391,9 +5478,8 @@ def main():
             if lat == '' or lng == '':
                 return True, 'no_coords'
             
-            try:
-                lat, lng = float(lat), float(lng)
-            except (ValueError, TypeError):
+            lat, lng = parse_coord(lat), parse_coord(lng)
+            if lat is None or lng is None:
                 return True, 'invalid_coords'
             
             # Coordonnées à zéro
@@ -5403,77 +5489,61 @@ def main():
                 return True, 'near_zero'
             
             # Marqué explicitement comme inconnu
-            if inv.get('location_unknown') is True:
-                # Mais si déjà cherché et échoué → skip (sauf --retry-failed)
-                if inv.get('geo_search_exhausted') and not args.retry_failed:
-                    return False, 'search_exhausted_skip'
+            if g('location_unknown') is True:
                 return True, 'location_unknown'
             
             # Source = city_center
-            if inv.get('geo_source') == 'city_center':
-                # Déjà cherché et échoué → skip (sauf --retry-failed)
-                if inv.get('geo_search_exhausted') and not args.retry_failed:
-                    return False, 'search_exhausted_skip'
+            if g('geo_source') == 'city_center':
                 return True, 'city_center_tag'
             
             # Confiance très basse
-            if inv.get('geo_confidence') == 'very_low':
-                if inv.get('geo_search_exhausted') and not args.retry_failed:
-                    return False, 'search_exhausted_skip'
+            if g('geo_confidence') == 'very_low':
                 return True, 'very_low_confidence'
             
             # Coordonnées = centre-ville connu
-            city = inv.get('city', '').upper()
-            if city in city_centers_coords:
-                c_lat, c_lng = city_centers_coords[city]
-                if round(lat, 4) == round(c_lat, 4) and round(lng, 4) == round(c_lng, 4):
-                    if inv.get('geo_search_exhausted') and not args.retry_failed:
-                        return False, 'search_exhausted_skip'
-                    return True, 'at_city_center'
+            if city_centers_int.get(city) == (round(lat * 10000), round(lng * 10000)):
+                return True, 'at_city_center'
             
             return False, None
         
-        # Filtrer par ville
-        candidates = master_db
-        if args.city:
-            candidates = [inv for inv in candidates if inv.get('city', '').upper() == args.city.upper()]
-            print(f"   {len(candidates)} invaders pour {args.city}")
-        
-        # Filtrer par ID spécifique (--id PA_1531)
-        if args.invader_id:
-            target_id = args.invader_id.upper().replace('-', '_')
-            candidates = [inv for inv in candidates 
-                         if inv.get('id', inv.get('name', '')).upper().replace('-', '_') == target_id]
-            if not candidates:
-                print(f"❌ Invader '{args.invader_id}' non trouvé dans le master")
-                return
-            print(f"   🎯 Cible unique: {target_id}")
-        
-        # Identifier les mal localisés
+        # Filtrer (ville, --id) et identifier les mal localisés en une seule passe
+        city_up = args.city.upper() if args.city else None
+        target_id = args.invader_id.upper().replace('-', '_') if args.invader_id else None
+        targets = []  # Invaders correspondant à --id (recherche forcée si coords OK)
+        n_candidates = 0
         poorly_located = []
-        reasons_count = {}
+        reasons_count = Counter()
         exhausted_skip_count = 0
-        for inv in candidates:
-            needs_geo, reason = is_poorly_located(inv)
-            if needs_geo:
-                poorly_located.append(inv)
-                reasons_count[reason] = reasons_count.get(reason, 0) + 1
-            elif reason == 'search_exhausted_skip':
+        for inv in master_db:
+            city = inv.get('city', '').upper()
+            if city_up and city != city_up:
+                continue
+            if target_id:
+                if inv.get('id', inv.get('name', '')).upper().replace('-', '_') != target_id:
+                    continue
+                targets.append(inv)
+            n_candidates += 1
+            
+            needs_geo, reason = is_poorly_located(inv, city)
+            if not needs_geo:
+                continue
+            if skip_exhausted and reason in exhaustible_reasons and inv.get('geo_search_exhausted'):
                 exhausted_skip_count += 1
+                continue
+            poorly_located.append(inv)
+            reasons_count[reason] += 1
         
-        print(f"\n📊 {len(poorly_located)} invaders à re-géolocaliser sur {len(candidates)}:")
-        for reason, count in sorted(reasons_count.items(), key=lambda x: -x[1]):
-            labels = {
-                'no_coords': '📭 Pas de coordonnées',
-                'invalid_coords': '❌ Coordonnées invalides',
-                'zero_coords': '0️⃣ Coordonnées à zéro',
-                'near_zero': '0️⃣ Coordonnées proches de zéro',
-                'location_unknown': '❓ Marqué location_unknown',
-                'city_center_tag': '🏙️ Source = city_center',
-                'very_low_confidence': '🔴 Confiance very_low',
-                'at_city_center': '📍 Au centre-ville exact',
-            }
-            print(f"   {labels.get(reason, reason)}: {count}")
+        if target_id:
+            if not targets:
+                print(f"❌ Invader '{args.invader_id}' non trouvé dans le master")
+                return
+            print(f"   🎯 Cible unique: {target_id}")
+        elif city_up:
+            print(f"   {n_candidates} invaders pour {args.city}")
+        
+        print(f"\n📊 {len(poorly_located)} invaders à re-géolocaliser sur {n_candidates}:")
+        for reason, count in reasons_count.most_common():
+            print(f"   {REASON_LABELS.get(reason, reason)}: {count}")
         if exhausted_skip_count > 0:
             print(f"   ⏭️  Ignorés (recherche déjà échouée): {exhausted_skip_count}")
             if not args.retry_failed:
@@ -5481,8 +5551,8 @@ def main():
         
         if not poorly_located:
             # Si --id est passé, forcer la recherche même si les coords sont OK
-            if args.invader_id and candidates:
-                poorly_located = candidates
+            if targets:
+                poorly_located = targets
                 print(f"   🎯 Recherche forcée pour {args.invader_id}")
             else:
                 print("✅ Tous les invaders ont des coordonnées valides!")
@@ -5494,10 +5564,9 @@ def main():
             print(f"   Limité à {len(poorly_located)} invaders")
         
         # Convertir au format attendu par process_missing_invaders
-        tmp_file = _p(DATA_DIR / '_tmp_poorly_located.json')
-        missing_format = []
-        for inv in poorly_located:
-            missing_format.append({
+        # (les champs peuvent manquer dans le master → .get avec défauts, pas itemgetter)
+        missing_format = [
+            {
                 'name': inv.get('id', inv.get('name', '')),
                 'city': inv.get('city', ''),
                 'status': inv.get('status', 'OK'),
@@ -5506,21 +5575,22 @@ def main():
                 'image_lieu': inv.get('image_lieu'),
                 'landing_date': inv.get('landing_date'),
                 'status_date': inv.get('status_date'),
-            })
-        
-        with open(tmp_file, 'w', encoding='utf-8') as f:
-            json.dump(missing_format, f, indent=2, ensure_ascii=False)
+            }
+            for inv in poorly_located
+        ]
         
         # Lancer le searcher
         searcher = InvaderLocationSearcher(visible=args.visible, verbose=args.verbose, pnote_file=args.pnote_file, pnote_url=args.pnote_url, flickr=not args.no_flickr, anthropic_key=args.anthropic_key, no_browser=args.no_browser, no_lens=getattr(args, "no_lens", False))
+        start_msg, stop_msg = searcher_messages(searcher)
         try:
             searcher.start()
-            print("🌐 Navigateur démarré" if not getattr(searcher, "no_browser", False) else "🤖 Sources HTTP démarrées")
+            print(start_msg)
             
             output_file = args.output if args.output else _p(DATA_DIR / 'invaders_relocalized.json')
             
             process_missing_invaders(
-                missing_file=tmp_file,
+                missing_file=None,
+                missing_data=missing_format,
                 output_file=output_file,
                 searcher=searcher,
                 city_filter=None,  # Déjà filtré
@@ -5533,10 +5603,7 @@ def main():
             print(f"   python geolocate_missing.py --merge {output_file} --backup")
         finally:
             searcher.stop()
-            # Nettoyer le fichier temporaire
-            if os.path.exists(tmp_file):
-                os.remove(tmp_file)
-            print("\n🌐 Navigateur fermé" if not getattr(searcher, "no_browser", False) else "\n🤖 Sources HTTP arrêtées")
+            print(f"\n{stop_msg}")
         return
     
     # =========================================================================
@@ -5550,9 +5617,10 @@ def main():
         
         # Démarrer le searcher
         searcher = InvaderLocationSearcher(visible=args.visible, verbose=args.verbose, pnote_file=args.pnote_file, pnote_url=args.pnote_url, flickr=not args.no_flickr, anthropic_key=args.anthropic_key, no_browser=args.no_browser, no_lens=getattr(args, "no_lens", False))
+        start_msg, stop_msg = searcher_messages(searcher)
         try:
             searcher.start()
-            print("🌐 Navigateur démarré" if not getattr(searcher, "no_browser", False) else "🤖 Sources HTTP démarrées")
+            print(start_msg)
             
             output_file = args.output if args.output else _p(DATA_DIR / 'invaders_geolocated.json')
             
@@ -5570,39 +5638,37 @@ def main():
             print(f"   python geolocate_missing.py --merge {output_file} --backup")
         finally:
             searcher.stop()
-            print("\n🌐 Navigateur fermé" if not getattr(searcher, "no_browser", False) else "\n🤖 Sources HTTP arrêtées")
+            print(f"\n{stop_msg}")
         return
     
     # =========================================================================
     # Mode classique: fichier invaders existant
     # =========================================================================
     invaders_file = args.invaders_file or _p(MASTER_FILE)
-    if not os.path.exists(invaders_file):
+    
+    # Charger les invaders
+    try:
+        invaders = load_invaders(invaders_file)
+    except FileNotFoundError:
         parser.print_help()
         print(f"\n❌ Fichier non trouvé: {invaders_file}")
         print("   Spécifiez un fichier ou utilisez --from-missing ou --merge")
         return
-    
-    
-    # Charger les invaders
     print(f"📂 Chargement de {invaders_file}...")
-    invaders = load_invaders(invaders_file)
     print(f"   {len(invaders)} invaders chargés")
     
     # Filtrer par ville
     if args.city:
-        invaders = [inv for inv in invaders if inv.get('city', '').upper() == args.city.upper()]
+        city_up = args.city.upper()
+        invaders = [inv for inv in invaders if inv.get('city', '').upper() == city_up]
         print(f"   {len(invaders)} invaders pour {args.city}")
     
     # Filtrer ceux sans coordonnées
     if args.only_missing:
         def has_coords(inv):
-            try:
-                lat = float(str(inv.get('lat', '')).replace(',', '.'))
-                lng = float(str(inv.get('lng', '')).replace(',', '.'))
-                return lat != 0 and lng != 0
-            except:
-                return False
+            lat = parse_coord(inv.get('lat'))
+            lng = parse_coord(inv.get('lng'))
+            return bool(lat and lng)  # None ou 0 → pas de coordonnées
         
         invaders = [inv for inv in invaders if not has_coords(inv)]
         print(f"   {len(invaders)} invaders sans coordonnées")
@@ -5633,7 +5699,11 @@ def main():
         'matches': 0,
         'differs': 0,
         'new_coords': 0,
-        'distances': [],
+        # Distances au GPS existant (accumulateurs, pas de liste)
+        'dist_n': 0,
+        'dist_sum': 0.0,
+        'dist_min': None,
+        'dist_max': None,
         # Cohérence entre sources
         'coherence': {
             'excellent': 0,
@@ -5646,29 +5716,30 @@ def main():
     }
     
     results = []
+    coherence_counts = stats['coherence']
     
     # Initialiser le searcher
     searcher = InvaderLocationSearcher(visible=args.visible, verbose=args.verbose, pnote_file=args.pnote_file, pnote_url=args.pnote_url, flickr=not args.no_flickr, anthropic_key=args.anthropic_key, no_browser=args.no_browser, no_lens=getattr(args, "no_lens", False))
+    start_msg, stop_msg = searcher_messages(searcher)
+    
+    # Cache des recherches réussies (ignoré avec --retry-failed)
+    geo_cache = load_geo_cache()
+    cache_hits = 0
     
     try:
         searcher.start()
-        print("🌐 Navigateur démarré" if not getattr(searcher, "no_browser", False) else "🤖 Sources HTTP démarrées")
+        print(start_msg)
         
         for i, inv in enumerate(invaders, 1):
             inv_id = inv.get('id', '')
             city_code = inv.get('city', '')
             
-            # Coordonnées existantes
-            existing_lat = None
-            existing_lng = None
-            try:
-                existing_lat = float(str(inv.get('lat', '')).replace(',', '.'))
-                existing_lng = float(str(inv.get('lng', '')).replace(',', '.'))
-                if existing_lat == 0 or existing_lng == 0:
-                    existing_lat = None
-                    existing_lng = None
-            except:
-                pass
+            # Coordonnées existantes (None si absentes, invalides ou à zéro)
+            existing_lat = parse_coord(inv.get('lat'))
+            existing_lng = parse_coord(inv.get('lng'))
+            if not (existing_lat and existing_lng):
+                existing_lat = None
+                existing_lng = None
             
             has_existing = existing_lat is not None
             if has_existing:
@@ -5676,8 +5747,17 @@ def main():
             
             print(f"\n[{i}/{len(invaders)}] {inv_id}")
             
-            # Rechercher
-            search_result = searcher.search(inv_id, city_code)
+            # Rechercher (ou réutiliser un résultat d'un run précédent)
+            cache_key = geo_cache_key(inv_id, city_code)
+            cached = geo_cache.get(cache_key) if not args.retry_failed else None
+            if cached:
+                search_result = cached
+                cache_hits += 1
+                print(f"   💾 Cache: {cached['lat']:.5f}, {cached['lng']:.5f} ({cached.get('source', '?')})")
+            else:
+                search_result = searcher.search(inv_id, city_code)
+                if search_result['found']:
+                    geo_cache[cache_key] = {**search_result, 'cached_at': datetime.now().isoformat()}
             stats['searched'] += 1
             
             result = {
@@ -5688,12 +5768,15 @@ def main():
                 **search_result
             }
             
-            if search_result['found']:
+            coherence = search_result.get('coherence') or _EMPTY
+            found = search_result['found']
+            
+            if found:
                 stats['found'] += 1
                 
                 # Compter par source
-                aroundus_found = (search_result.get('aroundus') or {}).get('found', False)
-                illuminate_found = (search_result.get('illuminate') or {}).get('found', False)
+                aroundus_found = (search_result.get('aroundus') or _EMPTY).get('found', False)
+                illuminate_found = (search_result.get('illuminate') or _EMPTY).get('found', False)
                 
                 if aroundus_found:
                     stats['found_aroundus'] += 1
@@ -5703,17 +5786,12 @@ def main():
                     stats['found_both'] += 1
                 
                 # Sources v3
-                if search_result.get('source') == 'pnote':
+                source = search_result.get('source')
+                if source == 'pnote':
                     stats['found_pnote'] += 1
-                elif search_result.get('source') == 'flickr':
+                elif source == 'flickr':
                     stats['found_flickr'] += 1
                 
-                # Cohérence
-                coherence = search_result.get('coherence') or {}
-                coherence_status = coherence.get('status', 'unknown')
-                if coherence_status in stats['coherence']:
-                    stats['coherence'][coherence_status] += 1
-                
                 # Comparer avec existant
                 if has_existing:
                     distance = calculate_distance(
@@ -5721,7 +5799,12 @@ def main():
                         search_result['lat'], search_result['lng']
                     )
                     result['distance_to_existing'] = distance
-                    stats['distances'].append(distance)
+                    stats['dist_n'] += 1
+                    stats['dist_sum'] += distance
+                    if stats['dist_min'] is None or distance < stats['dist_min']:
+                        stats['dist_min'] = distance
+                    if stats['dist_max'] is None or distance > stats['dist_max']:
+                        stats['dist_max'] = distance
                     
                     if distance < 100:
                         stats['matches'] += 1
@@ -5732,20 +5815,23 @@ def main():
                 else:
                     stats['new_coords'] += 1
                     print(f"   🆕 Nouvelles coordonnées!")
-            else:
-                # Pas trouvé - compter quand même la cohérence
-                coherence = search_result.get('coherence') or {}
-                coherence_status = coherence.get('status', 'not_found')
-                if coherence_status in stats['coherence']:
-                    stats['coherence'][coherence_status] += 1
+            
+            # Cohérence (comptée aussi si pas trouvé)
+            coherence_status = coherence.get('status', 'unknown' if found else 'not_found')
+            if coherence_status in coherence_counts:
+                coherence_counts[coherence_status] += 1
             
             results.append(result)
             
-            time.sleep(args.pause)
+            if not cached:
+                time.sleep(args.pause)
     
     finally:
         searcher.stop()
-        print("\n🌐 Navigateur fermé" if not getattr(searcher, "no_browser", False) else "\n🤖 Sources HTTP arrêtées")
+        save_geo_cache(geo_cache)
+        if cache_hits:
+            print(f"\n💾 {cache_hits} résultat(s) repris du cache ({GEO_CACHE_FILE.name})")
+        print(f"\n{stop_msg}")
     
     # Statistiques
     print("\n" + "=" * 60)
@@ -5778,108 +5864,107 @@ def main():
     print(f"   - Différent (>100m):   {stats['differs']}")
     print(f"   - Nouvelles coords:    {stats['new_coords']}")
     
-    if stats['distances']:
+    if stats['dist_n']:
         print(f"\n📏 Distances:")
-        print(f"   Min:                   {min(stats['distances']):.0f}m")
-        print(f"   Max:                   {max(stats['distances']):.0f}m")
-        print(f"   Moyenne:               {sum(stats['distances'])/len(stats['distances']):.0f}m")
+        print(f"   Min:                   {stats['dist_min']:.0f}m")
+        print(f"   Max:                   {stats['dist_max']:.0f}m")
+        print(f"   Moyenne:               {stats['dist_sum']/stats['dist_n']:.0f}m")
     
     # Sauvegarder
     output_path = args.output if args.output else _p(DATA_DIR / 'location_search_results.json')
     output_data = {
-        'stats': {k: v for k, v in stats.items() if k != 'distances'},
-        'distances': [round(d, 2) for d in stats['distances']],
+        'stats': stats,
         'results': results
     }
     
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(output_data, f, indent=2, ensure_ascii=False, default=str)
+    dump_json(output_data, output_path)
     
     print(f"\n📄 Résultats: {output_path}")
     
-    # Rapport texte
+    # Rapport texte (construit en mémoire puis écrit en une fois)
     txt_output = output_path.replace('.json', '.txt')
+    coh = stats['coherence']
+    parts = [
+        "RECHERCHE LOCALISATION - Sources Spécialisées\n"
+        + "=" * 60 + "\n\n"
+        "Sources:\n"
+        "  - aroundus.com\n"
+        "  - illuminateartofficial.com\n"
+        "  - pnote.eu (fallback)\n"
+        "  - flickr.com (fallback)\n\n"
+        "STATISTIQUES\n"
+        + "-" * 40 + "\n"
+        f"Total recherchés:     {stats['searched']}\n"
+        f"GPS trouvés:          {stats['found']}\n"
+        f"- AroundUs:           {stats['found_aroundus']}\n"
+        f"- IlluminateArt:      {stats['found_illuminate']}\n"
+        f"- Les deux:           {stats['found_both']}\n"
+        f"- Pnote.eu:           {stats['found_pnote']}\n"
+        f"- Flickr:             {stats['found_flickr']}\n"
+        f"Nouvelles coords:     {stats['new_coords']}\n\n"
+        "COHERENCE ENTRE SOURCES\n"
+        + "-" * 40 + "\n"
+        f"Excellent (<50m):     {coh['excellent']}\n"
+        f"Good (<200m):         {coh['good']}\n"
+        f"Warning (<500m):      {coh['warning']}\n"
+        f"Conflit (>500m):      {coh['conflict']}\n"
+        f"Source unique:        {coh['single_source']}\n\n"
+    ]
+    append = parts.append
+    
+    # Liste des invaders trouvés
+    found_results = [r for r in results if r.get('found')]
+    if found_results:
+        append(f"\n📍 {len(found_results)} INVADERS AVEC GPS:\n" + "-" * 40 + "\n\n")
+        
+        for r in found_results:
+            coherence = r.get('coherence') or _EMPTY
+            coherence_icon = COHERENCE_ICONS.get(coherence.get('status', ''), '❓')
+            
+            append(f"{r['id']} {coherence_icon} (source: {r.get('source', '?')})\n"
+                   f"   GPS: {r['lat']:.6f}, {r['lng']:.6f}\n")
+            
+            # Adresses
+            if r.get('address'):
+                append(f"   Adresse (source): {r['address']}\n")
+            if r.get('address_geocoded') and r.get('address_geocoded') != r.get('address'):
+                append(f"   Adresse (geocoded): {r['address_geocoded']}\n")
+            
+            # Détails des deux sources
+            aroundus = r.get('aroundus') or _EMPTY
+            illuminate = r.get('illuminate') or _EMPTY
+            
+            if aroundus.get('found') and illuminate.get('found'):
+                append(f"   AroundUs:    {aroundus['lat']:.6f}, {aroundus['lng']:.6f}\n"
+                       f"   Illuminate:  {illuminate['lat']:.6f}, {illuminate['lng']:.6f}\n"
+                       f"   Cohérence:   {coherence.get('details', '?')}\n")
+            
+            # Comparaison avec existant
+            if r.get('existing_lat'):
+                append(f"   Existant:    {r['existing_lat']:.6f}, {r['existing_lng']:.6f}\n"
+                       f"   Distance:    {r.get('distance_to_existing', 0):.0f}m\n")
+            else:
+                append("   🆕 Nouvelles coordonnées!\n")
+            
+            append(f"   Maps: https://www.google.com/maps?q={r['lat']},{r['lng']}\n")
+            if r.get('url'):
+                append(f"   Source: {r['url']}\n")
+            append("\n")
+    
+    # Liste des conflits
+    conflicts = [r for r in results if (r.get('coherence') or _EMPTY).get('status') == 'conflict']
+    if conflicts:
+        append(f"\n⚠️ {len(conflicts)} CONFLITS À VÉRIFIER:\n" + "-" * 40 + "\n\n")
+        for r in conflicts:
+            aroundus = r.get('aroundus') or _EMPTY
+            illuminate = r.get('illuminate') or _EMPTY
+            append(f"{r['id']}:\n"
+                   f"   AroundUs:   {aroundus.get('lat', 0):.6f}, {aroundus.get('lng', 0):.6f}\n"
+                   f"   Illuminate: {illuminate.get('lat', 0):.6f}, {illuminate.get('lng', 0):.6f}\n"
+                   f"   Distance:   {(r.get('coherence') or _EMPTY).get('distance_m', 0):.0f}m\n\n")
+    
     with open(txt_output, 'w', encoding='utf-8') as f:
-        f.write("RECHERCHE LOCALISATION - Sources Spécialisées\n")
-        f.write("=" * 60 + "\n\n")
-        
-        f.write("Sources:\n")
-        f.write("  - aroundus.com\n")
-        f.write("  - illuminateartofficial.com\n")
-        f.write("  - pnote.eu (fallback)\n")
-        f.write("  - flickr.com (fallback)\n\n")
-        
-        f.write(f"STATISTIQUES\n")
-        f.write(f"-" * 40 + "\n")
-        f.write(f"Total recherchés:     {stats['searched']}\n")
-        f.write(f"GPS trouvés:          {stats['found']}\n")
-        f.write(f"- AroundUs:           {stats['found_aroundus']}\n")
-        f.write(f"- IlluminateArt:      {stats['found_illuminate']}\n")
-        f.write(f"- Les deux:           {stats['found_both']}\n")
-        f.write(f"- Pnote.eu:           {stats['found_pnote']}\n")
-        f.write(f"- Flickr:             {stats['found_flickr']}\n")
-        f.write(f"Nouvelles coords:     {stats['new_coords']}\n\n")
-        
-        f.write(f"COHERENCE ENTRE SOURCES\n")
-        f.write(f"-" * 40 + "\n")
-        f.write(f"Excellent (<50m):     {stats['coherence']['excellent']}\n")
-        f.write(f"Good (<200m):         {stats['coherence']['good']}\n")
-        f.write(f"Warning (<500m):      {stats['coherence']['warning']}\n")
-        f.write(f"Conflit (>500m):      {stats['coherence']['conflict']}\n")
-        f.write(f"Source unique:        {stats['coherence']['single_source']}\n\n")
-        
-        # Liste des invaders trouvés
-        found_results = [r for r in results if r.get('found')]
-        if found_results:
-            f.write(f"\n📍 {len(found_results)} INVADERS AVEC GPS:\n")
-            f.write("-" * 40 + "\n\n")
-            
-            for r in found_results:
-                coherence = r.get('coherence', {})
-                coherence_icon = {'excellent': '🟢', 'good': '🟢', 'warning': '🟡', 'conflict': '🔴', 'single_source': '🔵'}.get(coherence.get('status', ''), '❓')
-                
-                f.write(f"{r['id']} {coherence_icon} (source: {r.get('source', '?')})\n")
-                f.write(f"   GPS: {r['lat']:.6f}, {r['lng']:.6f}\n")
-                
-                # Adresses
-                if r.get('address'):
-                    f.write(f"   Adresse (source): {r['address']}\n")
-                if r.get('address_geocoded') and r.get('address_geocoded') != r.get('address'):
-                    f.write(f"   Adresse (geocoded): {r['address_geocoded']}\n")
-                
-                # Détails des deux sources
-                aroundus = r.get('aroundus', {})
-                illuminate = r.get('illuminate', {})
-                
-                if aroundus.get('found') and illuminate.get('found'):
-                    f.write(f"   AroundUs:    {aroundus['lat']:.6f}, {aroundus['lng']:.6f}\n")
-                    f.write(f"   Illuminate:  {illuminate['lat']:.6f}, {illuminate['lng']:.6f}\n")
-                    f.write(f"   Cohérence:   {coherence.get('details', '?')}\n")
-                
-                # Comparaison avec existant
-                if r.get('existing_lat'):
-                    f.write(f"   Existant:    {r['existing_lat']:.6f}, {r['existing_lng']:.6f}\n")
-                    f.write(f"   Distance:    {r.get('distance_to_existing', 0):.0f}m\n")
-                else:
-                    f.write(f"   🆕 Nouvelles coordonnées!\n")
-                    
-                f.write(f"   Maps: https://www.google.com/maps?q={r['lat']},{r['lng']}\n")
-                if r.get('url'):
-                    f.write(f"   Source: {r['url']}\n")
-                f.write("\n")
-        
-        # Liste des conflits
-        conflicts = [r for r in results if (r.get('coherence') or {}).get('status') == 'conflict']
-        if conflicts:
-            f.write(f"\n⚠️ {len(conflicts)} CONFLITS À VÉRIFIER:\n")
-            f.write("-" * 40 + "\n\n")
-            for r in conflicts:
-                aroundus = r.get('aroundus', {})
-                illuminate = r.get('illuminate', {})
-                f.write(f"{r['id']}:\n")
-                f.write(f"   AroundUs:   {aroundus.get('lat', 0):.6f}, {aroundus.get('lng', 0):.6f}\n")
-                f.write(f"   Illuminate: {illuminate.get('lat', 0):.6f}, {illuminate.get('lng', 0):.6f}\n")
-                f.write(f"   Distance:   {(r.get('coherence') or {}).get('distance_m', 0):.0f}m\n\n")
+        f.write("".join(parts))
     
     print(f"📄 Rapport: {txt_output}")
     
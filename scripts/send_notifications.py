@@ -36,12 +36,56 @@ detail_level :
 import json
 import os
 import smtplib
+import ssl
 import sys
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.base import MIMEBase
 from email import encoders
 from datetime import datetime
+from pathlib import Path
+
+# Tentative d'import orjson pour lire le master plus vite (optionnel)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+# Marqueur remplacé par la salutation de chaque destinataire dans les corps
+# pré-construits (un corps par niveau de détail, pas un par destinataire)
+GREETING_PLACEHOLDER = '__GREETING__'
+
+# Niveaux de détail reconnus (voir docstring du module)
+DETAIL_LEVELS = ('full', 'summary', 'minimal')
+
+# Serveur SMTP (Gmail, TLS implicite) et contexte TLS partagé entre reconnexions
+# (certificats CA chargés une seule fois)
+SMTP_HOST = 'smtp.gmail.com'
+SMTP_PORT = 465
+SMTP_TIMEOUT = 30
+SSL_CONTEXT = ssl.create_default_context()
+
+# Nombre max d'envois sur une même connexion SMTP avant reconnexion
+# (les fournisseurs limitent le nombre de messages par session)
+MAX_PER_CONN = 100
+
+# Erreurs SMTP justifiant une reconnexion suivie d'un seul nouvel essai
+RECONNECT_ERRORS = (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError)
+
+# Marqueur du header To: dans les messages pré-sérialisés (remplacé par l'adresse)
+TO_PLACEHOLDER = b'__RECIPIENT__'
+
+# Signature commune à tous les corps
+FOOTER_LINES = ('---', 'Space Invaders Bot 🛸')
+
+# Libellés du statut du job GitHub Actions
+STATUS_LABELS = {
+    'success': '✅ Succès',
+    'failure': '❌ Échec',
+    'cancelled': '⚠️ Annulé'
+}
 
 
 def load_config():
@@ -61,6 +105,12 @@ def load_config():
         return []
 
 
+def load_json(path):
+    """Lit un fichier JSON (orjson si disponible, sinon json)."""
+    raw = Path(path).read_bytes()
+    return orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+
+
 def load_report_data():
     """Charge les données du rapport depuis les fichiers générés par le workflow."""
     data = {
@@ -71,45 +121,79 @@ def load_report_data():
         'job_status': os.environ.get('JOB_STATUS', 'unknown'),
         'run_url': os.environ.get('RUN_URL', ''),
         'repo_name': os.environ.get('REPO_NAME', 'space-invaders-db'),
+        # Horodatage unique du run (runners GitHub en UTC)
+        'now_str': datetime.now().strftime('%d/%m/%Y %H:%M UTC'),
     }
 
-    # Lire le rapport détaillé (texte)
-    detail_file = '/tmp/email_body.txt'
-    if os.path.exists(detail_file):
-        with open(detail_file, 'r') as f:
-            data['detail_text'] = f.read()
-    else:
-        data['detail_text'] = ''
+    # Lire le rapport détaillé une seule fois (texte pour le corps, octets pour la PJ)
+    try:
+        data['detail_bytes'] = Path('/tmp/email_body.txt').read_bytes()
+    except FileNotFoundError:
+        data['detail_bytes'] = b''
+    data['detail_text'] = data['detail_bytes'].decode('utf-8')
 
     # Lire les stats géoloc depuis metadata si disponible
     try:
-        with open('data/metadata.json') as f:
-            m = json.load(f)
+        m = load_json('data/metadata.json')
         data['total_invaders'] = m.get('total_invaders', data['total_invaders'])
         data['total_cities'] = m.get('total_cities', data['total_cities'])
         data['with_coordinates'] = m.get('with_coordinates', '?')
         data['status_counts'] = m.get('status_counts', {})
-    except:
+    except (OSError, ValueError):  # Fichier absent ou JSON invalide
         data['with_coordinates'] = '?'
         data['status_counts'] = {}
 
-    # Stats géoloc détaillées
+    return data
+
+
+def load_geo_stats():
+    """Stats géoloc détaillées (scan complet du master, seulement si un corps les affiche)."""
     try:
-        with open('data/invaders_master.json') as f:
-            db = json.load(f)
-        data['geolocated'] = sum(1 for inv in db if inv.get('geo_source') not in (None, 'city_center', 'unknown'))
-        data['exhausted'] = sum(1 for inv in db if inv.get('geo_search_exhausted'))
-        data['city_center'] = sum(1 for inv in db if inv.get('geo_source') == 'city_center')
-    except:
-        data['geolocated'] = '?'
-        data['exhausted'] = '?'
-        data['city_center'] = '?'
+        db = load_json('data/invaders_master.json')
+        geolocated = exhausted = city_center = 0
+        for inv in db:  # Une seule passe pour les trois compteurs
+            get = inv.get
+            src = get('geo_source')
+            if src == 'city_center':
+                city_center += 1
+            elif src is not None and src != 'unknown':
+                geolocated += 1
+            if get('geo_search_exhausted'):
+                exhausted += 1
+        return {'geolocated': geolocated, 'exhausted': exhausted, 'city_center': city_center}
+    except (OSError, ValueError):  # Fichier absent ou JSON invalide
+        return {'geolocated': '?', 'exhausted': '?', 'city_center': '?'}
+
+
+def clean_recipients(recipients):
+    """Filtre les entrées sans email et dédoublonne (email insensible à la casse).
+
+    Retourne une liste de (email, destinataire), dans l'ordre de la config.
+    """
+    seen = set()
+    clean = []
+    for r in recipients:
+        email = r.get('email', '').strip() if isinstance(r, dict) else ''
+        if not email:
+            print("  ⚠️  Entrée sans email ignorée")
+            continue
+        key = email.lower()
+        if key in seen:
+            print(f"  ⚠️  Doublon ignoré : {email}")
+            continue
+        seen.add(key)
+        clean.append((email, r))
+    return clean
 
-    return data
+
+def recipient_level(recipient):
+    """Niveau de détail du destinataire ('summary' par défaut ou si inconnu)."""
+    level = recipient.get('detail_level', 'summary')
+    return level if level in DETAIL_LEVELS else 'summary'
 
 
-def build_subject(report, recipient):
-    """Construit le sujet du mail."""
+def build_subject(report):
+    """Construit le sujet du mail (identique pour tous les destinataires)."""
     status_icon = '✅' if report['job_status'] == 'success' else '❌'
     if report['has_changes']:
         return f"🛸 Invaders Update [{report['change_count']} changements] {status_icon}"
@@ -117,56 +201,57 @@ def build_subject(report, recipient):
         return f"🛸 Invaders Update [Aucun changement] {status_icon}"
 
 
-def build_body_minimal(report, recipient):
-    """Corps minimal : statut + lien."""
-    name = recipient.get('name', '')
-    greeting = recipient.get('greeting', f'Bonjour{" " + name if name else ""} !')
+def _default_greeting(name):
+    """Salutation par défaut quand la config n'en fournit pas."""
+    return f'Bonjour {name} !' if name else 'Bonjour !'
 
-    status_label = {
-        'success': '✅ Succès',
-        'failure': '❌ Échec',
-        'cancelled': '⚠️ Annulé'
-    }.get(report['job_status'], report['job_status'])
 
-    lines = [
-        greeting,
-        '',
-        f"Statut du workflow : {status_label}",
-        '',
-    ]
+def recipient_greeting(recipient):
+    """Salutation du destinataire (greeting de la config, sinon 'Bonjour <name> !')."""
+    # Le greeting est presque toujours fourni : le défaut n'est construit que s'il manque
+    return recipient.get('greeting') or _default_greeting(recipient.get('name', ''))
+
+
+def render_body(template, recipient):
+    """Insère la salutation du destinataire dans un corps pré-construit."""
+    return template.replace(GREETING_PLACEHOLDER, recipient_greeting(recipient), 1)
+
+
+def build_body_minimal(report):
+    """Corps minimal : statut + lien."""
+    status_label = STATUS_LABELS.get(report['job_status'], report['job_status'])
 
     if report['has_changes']:
-        lines.append(f"📊 {report['change_count']} changements détectés")
+        changes_line = f"📊 {report['change_count']} changements détectés"
     else:
-        lines.append("Aucun changement cette semaine.")
+        changes_line = "Aucun changement cette semaine."
 
-    lines.extend([
+    return '\n'.join((
+        GREETING_PLACEHOLDER,
+        '',
+        f"Statut du workflow : {status_label}",
+        '',
+        changes_line,
         '',
         f"→ Voir le rapport : {report['run_url']}",
         '',
-        '---',
-        'Space Invaders Bot 🛸',
-    ])
-
-    return '\n'.join(lines)
+    ) + FOOTER_LINES)
 
 
-def build_body_summary(report, recipient):
-    """Corps résumé : stats globales sans le détail des changements."""
-    name = recipient.get('name', '')
-    greeting = recipient.get('greeting', f'Bonjour{" " + name if name else ""} !')
+def summary_lines(report):
+    """Lignes du résumé (sans la signature), partagées par les corps summary et full."""
+    status_label = STATUS_LABELS.get(report['job_status'], report['job_status'])
 
-    status_label = {
-        'success': '✅ Succès',
-        'failure': '❌ Échec',
-        'cancelled': '⚠️ Annulé'
-    }.get(report['job_status'], report['job_status'])
+    if report['has_changes']:
+        changes_line = f"🔄 {report['change_count']} changements cette semaine"
+    else:
+        changes_line = "✅ Aucun changement cette semaine"
 
-    lines = [
-        greeting,
+    return (
+        GREETING_PLACEHOLDER,
         '',
         f"Rapport hebdomadaire — {report['repo_name']}",
-        f"Date : {datetime.now().strftime('%d/%m/%Y %H:%M UTC')}",
+        f"Date : {report['now_str']}",
         f"Statut : {status_label}",
         '',
         '📊 Statistiques :',
@@ -175,65 +260,89 @@ def build_body_summary(report, recipient):
         f"  • Avec coordonnées : {report.get('with_coordinates', '?')}",
         f"  • Géolocalisés (précis) : {report.get('geolocated', '?')}",
         '',
-    ]
-
-    if report['has_changes']:
-        lines.append(f"🔄 {report['change_count']} changements cette semaine")
-    else:
-        lines.append("✅ Aucun changement cette semaine")
-
-    lines.extend([
+        changes_line,
         '',
         f"→ Rapport détaillé : {report['run_url']}",
         '',
-        '---',
-        'Space Invaders Bot 🛸',
-    ])
+    )
+
 
-    return '\n'.join(lines)
+def build_body_summary(report):
+    """Corps résumé : stats globales sans le détail des changements."""
+    return '\n'.join(summary_lines(report) + FOOTER_LINES)
 
 
-def build_body_full(report, recipient):
+def build_body_full(report):
     """Corps complet : stats + détail de tous les changements."""
-    # Commence par le résumé
-    body = build_body_summary(report, recipient)
+    # Le détail s'insère entre le résumé et la signature
+    if not report['detail_text']:
+        return build_body_summary(report)
+    detail = (
+        '',
+        '📋 DÉTAIL DES CHANGEMENTS :',
+        '-' * 40,
+        report['detail_text'],
+        '',
+    )
+    return '\n'.join(summary_lines(report) + detail + FOOTER_LINES)
 
-    # Ajoute le détail
-    if report['detail_text']:
-        body = body.replace(
-            '---\nSpace Invaders Bot 🛸',
-            '\n📋 DÉTAIL DES CHANGEMENTS :\n'
-            + '-' * 40 + '\n'
-            + report['detail_text']
-            + '\n\n---\nSpace Invaders Bot 🛸'
-        )
 
-    return body
+def build_attachment(payload):
+    """Construit (encodée une seule fois) la pièce jointe du rapport, ou None si vide."""
+    if not payload:
+        return None
+    part = MIMEBase('application', 'octet-stream')
+    part.set_payload(payload)
+    encoders.encode_base64(part)
+    part.add_header('Content-Disposition', f'attachment; filename="rapport_invaders.txt"')
+    return part
 
 
-def send_email(smtp, sender, recipient_email, subject, body, attach_file=None):
-    """Envoie un email via une connexion SMTP existante."""
+def build_message(sender, subject, body, attachment=None):
+    """Construit et sérialise un message une seule fois, header To: laissé à TO_PLACEHOLDER.
+
+    attachment : partie MIME pré-construite (build_attachment), partagée entre destinataires.
+    """
     msg = MIMEMultipart()
     msg['From'] = f'Space Invaders Bot <{sender}>'
-    msg['To'] = recipient_email
+    msg['To'] = TO_PLACEHOLDER.decode('ascii')
     msg['Subject'] = subject
 
     msg.attach(MIMEText(body, 'plain', 'utf-8'))
 
     # Pièce jointe si demandée
-    if attach_file and os.path.exists(attach_file):
-        with open(attach_file, 'rb') as f:
-            part = MIMEBase('application', 'octet-stream')
-            part.set_payload(f.read())
-        encoders.encode_base64(part)
-        part.add_header('Content-Disposition', f'attachment; filename="rapport_invaders.txt"')
-        msg.attach(part)
+    if attachment is not None:
+        msg.attach(attachment)
+
+    return msg.as_bytes()
 
-    smtp.sendmail(sender, [recipient_email], msg.as_string())
+
+def send_email(smtp, sender, recipient_email, message):
+    """Envoie un message pré-sérialisé (build_message) via une connexion SMTP existante."""
+    # Adresse non ASCII : UnicodeEncodeError, comptée comme erreur pour ce destinataire
+    payload = message.replace(TO_PLACEHOLDER, recipient_email.encode('ascii'), 1)
+    smtp.sendmail(sender, [recipient_email], payload)
+
+
+def connect_smtp(user, password):
+    """Ouvre et authentifie une connexion SMTP (Gmail, TLS implicite sur le port 465)."""
+    smtp = smtplib.SMTP_SSL(SMTP_HOST, SMTP_PORT, context=SSL_CONTEXT, timeout=SMTP_TIMEOUT)
+    smtp.ehlo_or_helo_if_needed()
+    smtp.login(user, password)
+    return smtp
+
+
+def close_smtp(smtp):
+    """Ferme une connexion SMTP sans échouer si le serveur l'a déjà coupée."""
+    try:
+        smtp.quit()
+    except (smtplib.SMTPException, OSError):
+        smtp.close()
 
 
 def main():
-    recipients = load_config()
+    # Validation et dédoublonnage avant toute connexion SMTP
+    recipients = clean_recipients(load_config())
     if not recipients:
         sys.exit(0)
 
@@ -244,50 +353,75 @@ def main():
         sys.exit(1)
 
     report = load_report_data()
+    # Le scan du master ne sert qu'aux corps summary/full
+    if any(recipient_level(r) != 'minimal' for _, r in recipients):
+        report.update(load_geo_stats())
     print(f"📊 Rapport : {report['change_count']} changements, statut={report['job_status']}")
 
     # Connexion SMTP unique pour tous les envois
     try:
-        smtp = smtplib.SMTP('smtp.gmail.com', 587)
-        smtp.starttls()
-        smtp.login(smtp_user, smtp_pass)
+        smtp = connect_smtp(smtp_user, smtp_pass)
     except Exception as e:
         print(f"❌ Connexion SMTP échouée : {e}")
         sys.exit(1)
 
     sent = 0
     errors = 0
+    sent_on_conn = 0
+
+    # Sujet et corps ne dépendent pas du destinataire (hors salutation) :
+    # construits une seule fois, corps à la demande par niveau de détail
+    subject = build_subject(report)
+    body_builders = {
+        'full': build_body_full,
+        'minimal': build_body_minimal,
+        'summary': build_body_summary,
+    }
+    templates = {}
+    # Messages sérialisés par (niveau, corps) : seul le To: change d'un destinataire à l'autre
+    messages = {}
+    # Pièce jointe (niveau full) : lue et encodée en base64 une seule fois
+    attachment = build_attachment(report['detail_bytes']) if report['has_changes'] else None
 
-    for r in recipients:
-        email = r.get('email', '').strip()
-        if not email:
-            continue
-
-        name = r.get('name', email.split('@')[0])
-        level = r.get('detail_level', 'summary')
+    for email, r in recipients:
+        # Libellé des logs (sans découpage de l'adresse si le nom manque)
+        who = f"{r['name']} <{email}>" if r.get('name') else email
+        level = recipient_level(r)
 
         # Construire le body selon le niveau
-        if level == 'full':
-            body = build_body_full(report, r)
-            attach = '/tmp/email_body.txt' if report['has_changes'] else None
-        elif level == 'minimal':
-            body = build_body_minimal(report, r)
-            attach = None
-        else:  # summary (défaut)
-            body = build_body_summary(report, r)
-            attach = None
-
-        subject = build_subject(report, r)
+        if level not in templates:
+            templates[level] = body_builders[level](report)
+        body = render_body(templates[level], r)
+        key = (level, body)
+        if key not in messages:
+            attach = attachment if level == 'full' else None
+            messages[key] = build_message(smtp_user, subject, body, attach)
+        message = messages[key]
 
         try:
-            send_email(smtp, smtp_user, email, subject, body, attach)
-            print(f"  ✅ {name} <{email}> ({level})")
+            # Limite d'envois par session atteinte : nouvelle connexion
+            if sent_on_conn >= MAX_PER_CONN:
+                print(f"  🔄 {sent_on_conn} envois sur cette connexion, reconnexion...")
+                close_smtp(smtp)
+                smtp = connect_smtp(smtp_user, smtp_pass)
+                sent_on_conn = 0
+            try:
+                send_email(smtp, smtp_user, email, message)
+            except RECONNECT_ERRORS:
+                # Connexion coupée (timeout d'inactivité…) : reconnexion et un seul nouvel essai
+                print(f"  🔌 Connexion SMTP perdue, reconnexion...")
+                close_smtp(smtp)
+                smtp = connect_smtp(smtp_user, smtp_pass)
+                sent_on_conn = 0
+                send_email(smtp, smtp_user, email, message)
+            print(f"  ✅ {who} ({level})")
             sent += 1
+            sent_on_conn += 1
         except Exception as e:
-            print(f"  ❌ {name} <{email}> : {e}")
+            print(f"  ❌ {who} : {e}")
             errors += 1
 
-    smtp.quit()
+    close_smtp(smtp)
 
     print(f"\n📧 {sent} email(s) envoyé(s), {errors} erreur(s)")
     if errors > 0:
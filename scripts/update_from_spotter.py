@@ -11,7 +11,7 @@ Améliorations v4:
 - Parsing amélioré basé sur la structure textuelle du site
 
 Installation:
-    pip install playwright
+    pip install playwright requests
     playwright install chromium
 
 Usage:
@@ -42,6 +42,15 @@ Options:
     --max-retries N     Nombre max de tentatives par ville (défaut: 3)
     --pause N           Pause entre villes en ms (défaut: 1000)
     --existing FILE     Charger un JSON existant pour comparer les statuts (historique)
+    --no-cache          Ignorer le cache de géocodage Nominatim (data/geocode_cache.json)
+
+Variables d'environnement:
+    NOMINATIM_URL       Endpoint /search d'une instance Nominatim auto-hébergée
+                        (ex: http://localhost:8080/search), sans pause entre requêtes.
+                        Défaut: serveur public, limité à 1 requête/seconde
+    GOOGLE_CSE_KEY      Clé API Google Custom Search + identifiant du moteur
+    GOOGLE_CSE_ID       (--geolocate): recherches via l'API JSON au lieu de
+                        charger les pages de résultats Google dans le navigateur
 
 Fichiers générés:
     - invaders_updated.json             → Base fusionnée prête à l'emploi  
@@ -128,19 +137,36 @@ Exemple d'utilisation:
     python update_invaders_v4.py --merge-geolocated invaders_geolocated_missing.json --backup
 """
 
+import csv
 import json
 import re
 import sys
 import os
 import time
 import math
+import traceback
+import random
 import asyncio
+import threading
+from bisect import bisect_left
 from datetime import datetime, timedelta
-from collections import defaultdict
+from collections import Counter, defaultdict, namedtuple
+from functools import lru_cache
+from http.client import HTTPException
+from urllib.error import HTTPError
 from urllib.request import urlopen, Request
-from urllib.parse import quote, unquote
+from urllib.parse import quote, unquote, parse_qs, parse_qsl, urlsplit
 from pathlib import Path
 
+import requests
+
+# Tentative d'import orjson pour charger le master plus vite (optionnel)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # ============================================================================
 # CHEMINS DU REPO
 # ============================================================================
@@ -163,6 +189,31 @@ GEOLOCATED_TXT = DATA_DIR / "invaders_geolocated.txt"
 GEOLOC_AUDIT_JSON = DATA_DIR / "invaders_geoloc_audit.json"
 GEOLOC_AUDIT_TXT = DATA_DIR / "invaders_geoloc_audit.txt"
 GEOLOCATED_MISSING_FILE = DATA_DIR / "invaders_geolocated_missing.json"
+GEOCODE_CACHE_FILE = DATA_DIR / "geocode_cache.json"
+# Un échec de géocodage en cache est retenté passé ce délai (OSM évolue)
+GEOCODE_MISS_TTL = timedelta(days=30)
+
+# Cookies Google (consentement accepté) réutilisés d'un lancement à l'autre.
+# Hors de data/, que le workflow commite.
+GOOGLE_STATE_FILE = SCRIPT_DIR / ".google_state.json"
+
+# Reprise du scraping: une ligne JSON par ville terminée, relue au lancement
+# suivant si récente (crash Playwright en cours de run). Hors de data/ aussi.
+SCRAPE_CHECKPOINT_FILE = SCRIPT_DIR / ".scrape_checkpoint.jsonl"
+SCRAPE_CHECKPOINT_MAX_AGE = 6 * 3600  # secondes
+
+# Serveur Nominatim: public par défaut, ou instance auto-hébergée via NOMINATIM_URL
+NOMINATIM_PUBLIC_URL = "https://nominatim.openstreetmap.org/search"
+NOMINATIM_URL = os.environ.get('NOMINATIM_URL', '').strip() or NOMINATIM_PUBLIC_URL
+
+# API Google Custom Search (optionnelle) pour les recherches de --geolocate
+GOOGLE_CSE_URL = "https://www.googleapis.com/customsearch/v1"
+GOOGLE_CSE_KEY = os.environ.get('GOOGLE_CSE_KEY', '').strip()
+GOOGLE_CSE_ID = os.environ.get('GOOGLE_CSE_ID', '').strip()
+
+# Intervalle minimal entre deux requêtes Nominatim (politique d'usage du serveur
+# public: 1 req/sec; aucune attente pour une instance auto-hébergée)
+NOMINATIM_MIN_INTERVAL = 1.1 if NOMINATIM_URL == NOMINATIM_PUBLIC_URL else 0.0
 
 def _p(path):
     """Convertit un Path en string pour les fonctions qui attendent str."""
@@ -173,37 +224,29 @@ GITHUB_DB_URL = "https://raw.githubusercontent.com/goguelnikov/SpaceInvaders/mai
 DEFAULT_GITHUB_REPO = "jojosh1er/space-invaders-db"
 INVADER_SPOTTER_BASE = "https://www.invader-spotter.art"
 
-# Centres des villes (pour fallback si aucune géolocalisation trouvée)
+# Villes scrapées en parallèle (un contexte navigateur chacune)
+SCRAPE_WORKERS = 3
+
+# Centres des villes (pour fallback si aucune géolocalisation trouvée),
+# table unique partagée par le géocodage manuel et --add-missing
 CITY_CENTERS = {
+    # France
     'PA': {'lat': 48.8566, 'lng': 2.3522, 'name': 'Paris'},
     'LY': {'lat': 45.7640, 'lng': 4.8357, 'name': 'Lyon'},
     'MARS': {'lat': 43.2965, 'lng': 5.3698, 'name': 'Marseille'},
-    'LDN': {'lat': 51.5074, 'lng': -0.1278, 'name': 'London'},
-    'NY': {'lat': 40.7128, 'lng': -74.0060, 'name': 'New York'},
-    'LA': {'lat': 34.0522, 'lng': -118.2437, 'name': 'Los Angeles'},
-    'TK': {'lat': 35.6762, 'lng': 139.6503, 'name': 'Tokyo'},
-    'ROM': {'lat': 41.9028, 'lng': 12.4964, 'name': 'Rome'},
-    'BCN': {'lat': 41.3851, 'lng': 2.1734, 'name': 'Barcelona'},
-    'BKK': {'lat': 13.7563, 'lng': 100.5018, 'name': 'Bangkok'},
-    'HK': {'lat': 22.3193, 'lng': 114.1694, 'name': 'Hong Kong'},
-    'MIA': {'lat': 25.7617, 'lng': -80.1918, 'name': 'Miami'},
-    'SD': {'lat': 32.7157, 'lng': -117.1611, 'name': 'San Diego'},
-    'RAV': {'lat': 44.4184, 'lng': 12.2035, 'name': 'Ravenna'},
-    'BIL': {'lat': 43.2630, 'lng': -2.9350, 'name': 'Bilbao'},
-    'AMS': {'lat': 52.3676, 'lng': 4.9041, 'name': 'Amsterdam'},
     'TLS': {'lat': 43.6047, 'lng': 1.4442, 'name': 'Toulouse'},
     'BDX': {'lat': 44.8378, 'lng': -0.5792, 'name': 'Bordeaux'},
     'NTE': {'lat': 47.2184, 'lng': -1.5536, 'name': 'Nantes'},
     'NA': {'lat': 47.2184, 'lng': -1.5536, 'name': 'Nantes'},
-    'LIL': {'lat': 50.6292, 'lng': 3.0573, 'name': 'Lille'},
     'LILE': {'lat': 50.6292, 'lng': 3.0573, 'name': 'Lille'},
+    'LIL': {'lat': 50.6292, 'lng': 3.0573, 'name': 'Lille'},
+    'LILL': {'lat': 50.6292, 'lng': 3.0573, 'name': 'Lille'},
     'STR': {'lat': 48.5734, 'lng': 7.7521, 'name': 'Strasbourg'},
+    'STRG': {'lat': 48.5734, 'lng': 7.7521, 'name': 'Strasbourg'},
     'MTP': {'lat': 43.6108, 'lng': 3.8767, 'name': 'Montpellier'},
     'MPL': {'lat': 43.6108, 'lng': 3.8767, 'name': 'Montpellier'},
     'NICE': {'lat': 43.7102, 'lng': 7.2620, 'name': 'Nice'},
-    'REIM': {'lat': 49.2583, 'lng': 4.0317, 'name': 'Reims'},
-    'VER': {'lat': 48.8014, 'lng': 2.1301, 'name': 'Versailles'},
-    'VRS': {'lat': 48.8014, 'lng': 2.1301, 'name': 'Versailles'},
+    'NP': {'lat': 43.7102, 'lng': 7.2620, 'name': 'Nice'},
     'AMI': {'lat': 49.8941, 'lng': 2.2958, 'name': 'Amiens'},
     'ORLN': {'lat': 47.9029, 'lng': 1.9039, 'name': 'Orléans'},
     'DIJ': {'lat': 47.3220, 'lng': 5.0415, 'name': 'Dijon'},
@@ -213,25 +256,94 @@ CITY_CENTERS = {
     'NIM': {'lat': 43.8367, 'lng': 4.3601, 'name': 'Nîmes'},
     'CLR': {'lat': 45.7772, 'lng': 3.0870, 'name': 'Clermont-Ferrand'},
     'RN': {'lat': 48.1173, 'lng': -1.6778, 'name': 'Rennes'},
+    'RNS': {'lat': 48.1173, 'lng': -1.6778, 'name': 'Rennes'},
+    'REIM': {'lat': 49.2583, 'lng': 4.0317, 'name': 'Reims'},
+    'VER': {'lat': 48.8014, 'lng': 2.1301, 'name': 'Versailles'},
+    'VRS': {'lat': 48.8014, 'lng': 2.1301, 'name': 'Versailles'},
+    'BAB': {'lat': 43.4832, 'lng': -1.5586, 'name': 'Bayonne-Anglet-Biarritz'},
+    'FTBL': {'lat': 48.4010, 'lng': 2.7024, 'name': 'Fontainebleau'},
+    'PAU': {'lat': 43.2965, 'lng': -0.3708, 'name': 'Pau'},
+    'PRP': {'lat': 42.6988, 'lng': 2.8948, 'name': 'Perpignan'},
+    'MTB': {'lat': 44.0171, 'lng': 1.3527, 'name': 'Montauban'},
+    'CAPF': {'lat': 44.6357, 'lng': -1.2479, 'name': 'Cap Ferret'},
+    'CAZ': {'lat': 43.2141, 'lng': 5.5378, 'name': 'Cassis'},
+    'LCT': {'lat': 43.1748, 'lng': 5.6095, 'name': 'La Ciotat'},
+    'LBR': {'lat': 43.8324, 'lng': 5.3658, 'name': 'Luberon'},
+    'FRQ': {'lat': 43.9600, 'lng': 5.7810, 'name': 'Forcalquier'},
+    'MEN': {'lat': 43.7764, 'lng': 7.5048, 'name': 'Menton'},
+    'CON': {'lat': 44.0900, 'lng': -1.3150, 'name': 'Contis'},
+    'VLMO': {'lat': 45.4553, 'lng': 6.4506, 'name': 'Valmorel'},
+    'REUN': {'lat': -21.1151, 'lng': 55.5364, 'name': 'La Réunion'},
+    'BTA': {'lat': 42.6973, 'lng': 9.4510, 'name': 'Bastia'},
+    # UK
+    'LDN': {'lat': 51.5074, 'lng': -0.1278, 'name': 'London'},
+    'MAN': {'lat': 53.4808, 'lng': -2.2426, 'name': 'Manchester'},
+    'NCL': {'lat': 54.9783, 'lng': -1.6178, 'name': 'Newcastle'},
+    # Europe
+    'BCN': {'lat': 41.3851, 'lng': 2.1734, 'name': 'Barcelona'},
+    'BRC': {'lat': 41.3851, 'lng': 2.1734, 'name': 'Barcelona'},
+    'ROM': {'lat': 41.9028, 'lng': 12.4964, 'name': 'Rome'},
+    'RAV': {'lat': 44.4184, 'lng': 12.2035, 'name': 'Ravenna'},
+    'RA': {'lat': 44.4184, 'lng': 12.2035, 'name': 'Ravenna'},
+    'FLRN': {'lat': 43.7696, 'lng': 11.2558, 'name': 'Florence'},
+    'MLN': {'lat': 45.4642, 'lng': 9.1900, 'name': 'Milan'},
+    'VRN': {'lat': 25.2854, 'lng': 82.9990, 'name': 'Varanasi'},
+    'MLGA': {'lat': 36.7213, 'lng': -4.4214, 'name': 'Malaga'},
+    'BIL': {'lat': 43.2630, 'lng': -2.9350, 'name': 'Bilbao'},
+    'BBO': {'lat': 43.2630, 'lng': -2.9350, 'name': 'Bilbao'},
+    'AMS': {'lat': 52.3676, 'lng': 4.9041, 'name': 'Amsterdam'},
+    'RTD': {'lat': 51.9225, 'lng': 4.4792, 'name': 'Rotterdam'},
+    'NOO': {'lat': 52.2361, 'lng': 4.4303, 'name': 'Noordwijk'},
     'BRL': {'lat': 52.5200, 'lng': 13.4050, 'name': 'Berlin'},
     'MUN': {'lat': 48.1351, 'lng': 11.5820, 'name': 'Munich'},
     'KLN': {'lat': 50.9375, 'lng': 6.9603, 'name': 'Cologne'},
+    'FKF': {'lat': 50.1109, 'lng': 8.6821, 'name': 'Frankfurt'},
     'WN': {'lat': 48.2082, 'lng': 16.3738, 'name': 'Vienna'},
     'BXL': {'lat': 50.8503, 'lng': 4.3517, 'name': 'Brussels'},
+    'CHAR': {'lat': 50.4108, 'lng': 4.4446, 'name': 'Charleroi'},
+    'ANVR': {'lat': 51.2194, 'lng': 4.4025, 'name': 'Antwerp'},
+    'BRN': {'lat': 46.9480, 'lng': 7.4474, 'name': 'Bern'},
     'BSL': {'lat': 47.5596, 'lng': 7.5886, 'name': 'Basel'},
     'GNV': {'lat': 46.2044, 'lng': 6.1432, 'name': 'Geneva'},
     'LSN': {'lat': 46.5197, 'lng': 6.6323, 'name': 'Lausanne'},
-    'RTD': {'lat': 51.9244, 'lng': 4.4777, 'name': 'Rotterdam'},
-    'PRT': {'lat': 41.1579, 'lng': -8.6291, 'name': 'Porto'},
+    'ANZR': {'lat': 46.3100, 'lng': 7.3870, 'name': 'Anzère'},
+    'LJU': {'lat': 46.0569, 'lng': 14.5058, 'name': 'Ljubljana'},
     'FAO': {'lat': 37.0194, 'lng': -7.9322, 'name': 'Faro'},
-    'BRC': {'lat': 41.3874, 'lng': 2.1686, 'name': 'Barcelona'},
-    'MLGA': {'lat': 36.7213, 'lng': -4.4214, 'name': 'Malaga'},
-    'BBO': {'lat': 43.2630, 'lng': -2.9350, 'name': 'Bilbao'},
-    'MAN': {'lat': 53.4808, 'lng': -2.2426, 'name': 'Manchester'},
-    'NCL': {'lat': 54.9783, 'lng': -1.6178, 'name': 'Newcastle'},
     'IST': {'lat': 41.0082, 'lng': 28.9784, 'name': 'Istanbul'},
-    'RAV': {'lat': 44.4184, 'lng': 12.2035, 'name': 'Ravenna'},
-    'VRN': {'lat': 45.4384, 'lng': 10.9916, 'name': 'Verona'},
+    'RVK': {'lat': 64.1466, 'lng': -21.9426, 'name': 'Reykjavik'},
+    'HALM': {'lat': 56.6745, 'lng': 12.8578, 'name': 'Halmstad'},
+    'VSB': {'lat': 57.6349, 'lng': 18.2948, 'name': 'Visby'},
+    'GRU': {'lat': 43.2615, 'lng': 17.0186, 'name': 'Gruž'},
+    # Africa
+    'MRAK': {'lat': 31.6295, 'lng': -7.9811, 'name': 'Marrakech'},
+    'RBA': {'lat': 34.0209, 'lng': -6.8416, 'name': 'Rabat'},
+    'DJBA': {'lat': 33.8076, 'lng': 10.8451, 'name': 'Djerba'},
+    'MBSA': {'lat': -4.0435, 'lng': 39.6682, 'name': 'Mombasa'},
+    # Asia
+    'TK': {'lat': 35.6762, 'lng': 139.6503, 'name': 'Tokyo'},
+    'HK': {'lat': 22.3193, 'lng': 114.1694, 'name': 'Hong Kong'},
+    'BKK': {'lat': 13.7563, 'lng': 100.5018, 'name': 'Bangkok'},
+    'BGK': {'lat': 13.7563, 'lng': 100.5018, 'name': 'Bangkok'},
+    'KAT': {'lat': 27.7172, 'lng': 85.3240, 'name': 'Kathmandu'},
+    'DHK': {'lat': 23.8103, 'lng': 90.4125, 'name': 'Dhaka'},
+    'DJN': {'lat': 36.3504, 'lng': 127.3845, 'name': 'Daejeon'},
+    'SL': {'lat': 37.5665, 'lng': 126.9780, 'name': 'Seoul'},
+    'BT': {'lat': 27.4712, 'lng': 89.6339, 'name': 'Bhutan'},
+    'CCU': {'lat': 21.1619, 'lng': -86.8515, 'name': 'Cancún'},
+    # Americas
+    'NY': {'lat': 40.7128, 'lng': -74.0060, 'name': 'New York'},
+    'LA': {'lat': 34.0522, 'lng': -118.2437, 'name': 'Los Angeles'},
+    'MIA': {'lat': 25.7617, 'lng': -80.1918, 'name': 'Miami'},
+    'SD': {'lat': 32.7157, 'lng': -117.1611, 'name': 'San Diego'},
+    'SP': {'lat': -23.5505, 'lng': -46.6333, 'name': 'São Paulo'},
+    'POTI': {'lat': -19.5836, 'lng': -65.7531, 'name': 'Potosí'},
+    # Oceania
+    'PRT': {'lat': -31.9505, 'lng': 115.8605, 'name': 'Perth'},
+    'MLB': {'lat': -37.8136, 'lng': 144.9631, 'name': 'Melbourne'},
+    # Autres
+    'ELT': {'lat': 29.5577, 'lng': 34.9519, 'name': 'Eilat'},
+    'GRTI': {'lat': 29.0333, 'lng': -13.6333, 'name': 'Graciosa'},
+    'RDU': {'lat': 50.3543, 'lng': 5.4563, 'name': 'Durbuy'},
 }
 
 # Mapping des codes ville
@@ -285,24 +397,50 @@ CITY_NAMES = {
 }
 
 
+# Noms de ville utilisés dans les requêtes de recherche web (geolocate_invader)
+SEARCH_CITY_NAMES = {
+    'PA': 'Paris', 'LY': 'Lyon', 'MARS': 'Marseille', 'TLS': 'Toulouse',
+    'BDX': 'Bordeaux', 'NTE': 'Nantes', 'LILE': 'Lille', 'STR': 'Strasbourg',
+    'LDN': 'London', 'NY': 'New York', 'LA': 'Los Angeles', 'TK': 'Tokyo',
+    'ROM': 'Rome', 'BCN': 'Barcelona', 'BKK': 'Bangkok', 'HK': 'Hong Kong',
+    'MIA': 'Miami', 'SD': 'San Diego', 'RAV': 'Ravenna', 'BIL': 'Bilbao',
+    'MTP': 'Montpellier', 'NICE': 'Nice', 'REIM': 'Reims', 'AMS': 'Amsterdam',
+    'VER': 'Versailles', 'CLER': 'Clermont-Ferrand', 'AVIGN': 'Avignon',
+}
+
+
+# Préfixe ville d'un id invader ("PA_1529" → "PA")
+_CITY_PREFIX_RE = re.compile(r'^([A-Z]+)[-_]')
+
+
 def fetch_url(url, timeout=30, retries=3):
-    """Télécharge une URL avec retry"""
+    """Télécharge une URL avec retry (backoff exponentiel avec jitter)"""
     headers = {'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'}
     for attempt in range(retries):
         try:
             req = Request(url, headers=headers)
             with urlopen(req, timeout=timeout) as response:
                 content = response.read()
-                for enc in ['utf-8-sig', 'utf-8', 'latin-1']:
-                    try:
-                        return content.decode(enc)
-                    except:
-                        continue
-        except Exception as e:
+            break
+        except HTTPError as e:
             print(f"   ⚠️ Tentative {attempt + 1}/{retries}: {e}")
-            if attempt < retries - 1:
-                time.sleep(2 ** attempt)
-    return None
+            # Erreur client (404…): inutile de réessayer, sauf rate limit
+            if e.code < 500 and e.code != 429:
+                return None
+        except (OSError, HTTPException) as e:  # URLError, timeout, connexion coupée
+            print(f"   ⚠️ Tentative {attempt + 1}/{retries}: {e}")
+        if attempt < retries - 1:
+            # Full jitter: même attente moyenne que 2**attempt, sans relances synchronisées
+            time.sleep(random.uniform(0, 2 ** (attempt + 1)))
+    else:
+        return None
+    
+    for enc in ['utf-8-sig', 'utf-8']:
+        try:
+            return content.decode(enc)
+        except UnicodeDecodeError:
+            continue
+    return content.decode('latin-1')  # Ne peut pas échouer
 
 
 def load_github_database():
@@ -327,8 +465,11 @@ def load_master_file():
         return load_github_database()
     
     print(f"📂 Chargement du master local: {MASTER_FILE}")
-    with open(MASTER_FILE, 'r', encoding='utf-8') as f:
-        invaders = json.load(f)
+    if ORJSON_AVAILABLE:
+        invaders = orjson.loads(MASTER_FILE.read_bytes())
+    else:
+        with open(MASTER_FILE, 'r', encoding='utf-8') as f:
+            invaders = json.load(f)
     print(f"✅ {len(invaders)} invaders chargés depuis le master")
     return invaders
 
@@ -338,7 +479,7 @@ def get_cities_from_github(github_db):
     cities = defaultdict(int)
     for inv in github_db:
         name = inv.get('id', inv.get('name', ''))
-        match = re.match(r'^([A-Z]+)[-_]', name)
+        match = _CITY_PREFIX_RE.match(name)
         if match:
             cities[match.group(1)] += 1
     return dict(cities)
@@ -355,110 +496,230 @@ def load_community_reports(filepath="community_reports.json"):
         return []
 
 
+# Groupes de définition RTF (polices, couleurs), supprimés avant les commandes
+_RTF_GROUPS_RE = re.compile(
+    r'\{\\fonttbl[^}]*\}|\{\\colortbl[^}]*\}|\{\\\*\\expandedcolortbl[^}]*\}'
+)
+# Commandes RTF à supprimer (une alternation, dans l'ordre de priorité)
+_RTF_COMMANDS_RE = re.compile('|'.join([
+    r'\\rtf1[^\\]*', r'\\ansi[^\\s]*',
+    r'\\cocoartf\d+', r'\\cocoatextscaling\d+', r'\\cocoaplatform\d+',
+    r'\\paperw\d+', r'\\paperh\d+', r'\\margl\d+', r'\\margr\d+',
+    r'\\vieww\d+', r'\\viewh\d+', r'\\viewkind\d+',
+    r'\\pard[^\\]*', r'\\tx\d+', r'\\pardirnatural', r'\\partightenfactor\d+',
+    r'\\f\d+', r'\\fs\d+', r'\\cf\d+',
+]))
+_RTF_SPACES_RE = re.compile(r' +')
+_RTF_NEWLINES_RE = re.compile(r'\n+')
+
+# Artefacts RTF en début d'adresse et format des codes invaders (PA_1529)
+_LEADING_DIGITS_RE = re.compile(r'^[\s\d]*\s*')
+_INVADER_CODE_RE = re.compile(r'^[A-Z]+_\d+$')
+
+
+def _strip_rtf(content):
+    """Réduit un export RTF (TextEdit) à son texte brut"""
+    # Supprimer les groupes de définition puis les commandes RTF (une passe chacun)
+    content = _RTF_GROUPS_RE.sub('', content)
+    content = _RTF_COMMANDS_RE.sub('', content)
+    
+    # Remplacer les retours à la ligne RTF
+    content = content.replace('\\\n', '\n')
+    content = content.replace('\\', '')
+    
+    # Supprimer les accolades restantes
+    content = content.replace('{', '').replace('}', '')
+    
+    # Nettoyer les espaces multiples
+    content = _RTF_SPACES_RE.sub(' ', content)
+    content = _RTF_NEWLINES_RE.sub('\n', content)
+    return content
+
+
+def _parse_manual_address_lines(lines):
+    """Parse des lignes CSV code,URL,adresse (itérable de lignes, consommé au fil de l'eau)"""
+    addresses = {}
+    
+    for line in lines:
+        # Header, lignes vides ou trop courtes ignorés
+        line = line.strip()
+        if not line or len(line) < 5 or line.startswith('code,'):
+            continue
+        
+        # Une ligne = un enregistrement: un guillemet non fermé ne casse que sa ligne
+        parts = next(csv.reader([line], skipinitialspace=True))
+        if len(parts) >= 3:
+            code = parts[0].strip().upper().replace('-', '_')
+            url = parts[1].strip()
+            address = parts[2].strip().strip('"')
+            
+            # Nettoyer l'adresse des artefacts RTF résiduels
+            address = _LEADING_DIGITS_RE.sub('', address) if address.startswith(' ') else address
+            
+            if code and _INVADER_CODE_RE.match(code):
+                addresses[code] = {
+                    'address': address,
+                    'image_url': url
+                }
+    return addresses
+
+
 def load_manual_addresses(filepath):
     """Charge le fichier d'adresses manuelles (CSV ou RTF)"""
     if not os.path.exists(filepath):
         print(f"❌ Fichier non trouvé: {filepath}")
         return {}
     
-    addresses = {}
-    
     try:
         with open(filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Nettoyer le contenu RTF si nécessaire
-        if content.startswith('{\\rtf'):
-            # Supprimer les headers RTF
-            # Trouver le début du contenu réel (après les définitions de police, couleur, etc.)
-            import re
-            
-            # Supprimer les groupes RTF de définition
-            content = re.sub(r'\{\\fonttbl[^}]*\}', '', content)
-            content = re.sub(r'\{\\colortbl[^}]*\}', '', content)
-            content = re.sub(r'\{\\\*\\expandedcolortbl[^}]*\}', '', content)
-            
-            # Supprimer les commandes RTF
-            content = re.sub(r'\\rtf1[^\\]*', '', content)
-            content = re.sub(r'\\ansi[^\\s]*', '', content)
-            content = re.sub(r'\\cocoartf\d+', '', content)
-            content = re.sub(r'\\cocoatextscaling\d+', '', content)
-            content = re.sub(r'\\cocoaplatform\d+', '', content)
-            content = re.sub(r'\\paperw\d+', '', content)
-            content = re.sub(r'\\paperh\d+', '', content)
-            content = re.sub(r'\\margl\d+', '', content)
-            content = re.sub(r'\\margr\d+', '', content)
-            content = re.sub(r'\\vieww\d+', '', content)
-            content = re.sub(r'\\viewh\d+', '', content)
-            content = re.sub(r'\\viewkind\d+', '', content)
-            content = re.sub(r'\\pard[^\\]*', '', content)
-            content = re.sub(r'\\tx\d+', '', content)
-            content = re.sub(r'\\pardirnatural', '', content)
-            content = re.sub(r'\\partightenfactor\d+', '', content)
-            content = re.sub(r'\\f\d+', '', content)
-            content = re.sub(r'\\fs\d+', '', content)
-            content = re.sub(r'\\cf\d+', '', content)
-            
-            # Remplacer les retours à la ligne RTF
-            content = content.replace('\\\n', '\n')
-            content = content.replace('\\', '')
-            
-            # Supprimer les accolades restantes
-            content = content.replace('{', '').replace('}', '')
-            
-            # Nettoyer les espaces multiples
-            content = re.sub(r' +', ' ', content)
-            content = re.sub(r'\n+', '\n', content)
-        
-        # Parser ligne par ligne
-        lines = content.strip().split('\n')
-        
-        for line in lines:
-            line = line.strip()
-            
-            # Skip header ou lignes vides
-            if line.startswith('code,') or not line or len(line) < 5:
-                continue
-            
-            # Parser la ligne CSV (avec gestion des guillemets)
-            parts = []
-            current = ''
-            in_quotes = False
-            
-            for char in line:
-                if char == '"':
-                    in_quotes = not in_quotes
-                elif char == ',' and not in_quotes:
-                    parts.append(current.strip())
-                    current = ''
-                else:
-                    current += char
-            parts.append(current.strip())
-            
-            if len(parts) >= 3:
-                code = parts[0].strip().upper().replace('-', '_')
-                url = parts[1].strip()
-                address = parts[2].strip().strip('"')
-                
-                # Nettoyer l'adresse des artefacts RTF résiduels
-                address = re.sub(r'^[\s\d]*\s*', '', address) if address.startswith(' ') else address
-                
-                if code and re.match(r'^[A-Z]+_\d+$', code):
-                    addresses[code] = {
-                        'address': address,
-                        'image_url': url
-                    }
+            is_rtf = f.read(5) == '{\\rtf'
+            f.seek(0)
+            if is_rtf:
+                # Le nettoyage RTF travaille sur tout le document (groupes multi-lignes)
+                addresses = _parse_manual_address_lines(_strip_rtf(f.read()).split('\n'))
+            else:
+                # CSV: lecture ligne par ligne, sans charger le fichier en mémoire
+                addresses = _parse_manual_address_lines(f)
         
         print(f"📋 {len(addresses)} adresses manuelles chargées")
         return addresses
         
     except Exception as e:
         print(f"❌ Erreur lecture fichier adresses: {e}")
-        import traceback
         traceback.print_exc()
         return {}
 
 
+# ----------------------------------------------------------------------------
+# Standardisation d'adresses: tables et regex compilées une seule fois
+# ----------------------------------------------------------------------------
+
+# Mapping code ville → infos (patterns: regex de détection de la ville dans l'adresse)
+ADDRESS_CITY_INFO = {
+    'PA': {'name': 'Paris', 'country': 'France', 'patterns': [r'75\d{3}', r'paris']},
+    'LY': {'name': 'Lyon', 'country': 'France', 'patterns': [r'69\d{3}', r'lyon']},
+    'MARS': {'name': 'Marseille', 'country': 'France', 'patterns': [r'13\d{3}', r'marseille']},
+    'LDN': {'name': 'London', 'country': 'UK', 'patterns': [r'[A-Z]{1,2}\d[A-Z\d]?\s*\d[A-Z]{2}', r'london']},
+    'NY': {'name': 'New York', 'country': 'USA', 'patterns': [r'NY\s*\d{5}', r'new york', r'nyc', r'brooklyn', r'manhattan']},
+    'LA': {'name': 'Los Angeles', 'country': 'USA', 'patterns': [r'CA\s*\d{5}', r'los angeles']},
+    'TK': {'name': 'Tokyo', 'country': 'Japan', 'patterns': [r'tokyo']},
+    'ROM': {'name': 'Rome', 'country': 'Italy', 'patterns': [r'roma', r'rome']},
+    'BCN': {'name': 'Barcelona', 'country': 'Spain', 'patterns': [r'barcelona']},
+    'BKK': {'name': 'Bangkok', 'country': 'Thailand', 'patterns': [r'bangkok']},
+    'HK': {'name': 'Hong Kong', 'country': 'China', 'patterns': [r'hong kong']},
+    'MIA': {'name': 'Miami', 'country': 'USA', 'patterns': [r'FL\s*\d{5}', r'miami']},
+    'SD': {'name': 'San Diego', 'country': 'USA', 'patterns': [r'san diego']},
+    'RAV': {'name': 'Ravenna', 'country': 'Italy', 'patterns': [r'ravenna']},
+    'BIL': {'name': 'Bilbao', 'country': 'Spain', 'patterns': [r'bilbao']},
+    'AMS': {'name': 'Amsterdam', 'country': 'Netherlands', 'patterns': [r'amsterdam']},
+    'TLS': {'name': 'Toulouse', 'country': 'France', 'patterns': [r'31\d{3}', r'toulouse']},
+    'BDX': {'name': 'Bordeaux', 'country': 'France', 'patterns': [r'33\d{3}', r'bordeaux']},
+    'NTE': {'name': 'Nantes', 'country': 'France', 'patterns': [r'44\d{3}', r'nantes']},
+    'LILE': {'name': 'Lille', 'country': 'France', 'patterns': [r'59\d{3}', r'lille']},
+    'STR': {'name': 'Strasbourg', 'country': 'France', 'patterns': [r'67\d{3}', r'strasbourg']},
+    'MTP': {'name': 'Montpellier', 'country': 'France', 'patterns': [r'34\d{3}', r'montpellier']},
+    'NICE': {'name': 'Nice', 'country': 'France', 'patterns': [r'06\d{3}', r'nice']},
+    'REIM': {'name': 'Reims', 'country': 'France', 'patterns': [r'51\d{3}', r'reims']},
+    'VER': {'name': 'Versailles', 'country': 'France', 'patterns': [r'78\d{3}', r'versailles']},
+}
+
+# Une regex (alternation insensible à la casse) par ville
+_CITY_PATTERN_RES = {
+    code: re.compile('|'.join(info['patterns']), re.IGNORECASE)
+    for code, info in ADDRESS_CITY_INFO.items()
+}
+
+# Codes hexadécimaux RTF → caractères
+RTF_CHARS = {
+    "'e0": "à", "'e1": "á", "'e2": "â", "'e3": "ã", "'e4": "ä",
+    "'e8": "è", "'e9": "é", "'ea": "ê", "'eb": "ë",
+    "'ec": "ì", "'ed": "í", "'ee": "î", "'ef": "ï",
+    "'f2": "ò", "'f3": "ó", "'f4": "ô", "'f5": "õ", "'f6": "ö",
+    "'f9": "ù", "'fa": "ú", "'fb": "û", "'fc": "ü",
+    "'e7": "ç", "'f1": "ñ",
+    "'c0": "À", "'c1": "Á", "'c2": "Â", "'c3": "Ã", "'c4": "Ä",
+    "'c8": "È", "'c9": "É", "'ca": "Ê", "'cb": "Ë",
+    "'d4": "Ô", "'d9": "Ù",
+}
+_RTF_RESIDUAL_RE = re.compile(r"'[a-f0-9]{2}")
+
+# Mention(s) de pays en fin d'adresse (elles peuvent perturber Nominatim),
+# une suite comme ", England, UK" est retirée en une fois
+_COUNTRY_RE = re.compile(
+    r'(?:,?\s*(?:Royaume-Uni|United Kingdom|UK|France|Italia|Italy|España|Spain|USA'
+    r'|United States|England))+\s*$',
+    re.IGNORECASE
+)
+
+# Abréviations françaises
+_FR_ABBR = [
+    (r'\bBd\b\.?', 'Boulevard'),
+    (r'\bBoul\b\.?', 'Boulevard'),
+    (r'\bAv\b\.?', 'Avenue'),
+    (r'\bGal\b\.?', 'Galerie'),
+    (r'\bPl\b\.?', 'Place'),
+    (r'\bR\b\.(?=\s)', 'Rue'),
+    (r'\bSt\b\.?(?=\s+[A-Z])', 'Saint'),
+    (r'\bSte\b\.?(?=\s+[A-Z])', 'Sainte'),
+    (r'\bImp\b\.?', 'Impasse'),
+    (r'\bPass\b\.?', 'Passage'),
+    (r'\bFbg\b\.?', 'Faubourg'),
+    (r'\bCrs\b\.?', 'Cours'),
+]
+
+# Abréviations anglaises (villes anglophones uniquement)
+_EN_ABBR = [
+    (r'\bSt\b\.?(?=\s*,|\s*$|\s+[A-Z][a-z])', 'Street'),  # "Brewer St," → "Brewer Street"
+    (r'\bRd\b\.?', 'Road'),
+    (r'\bAve\b\.?', 'Avenue'),
+    (r'\bBlvd\b\.?', 'Boulevard'),
+    (r'\bLn\b\.?', 'Lane'),
+    (r'\bDr\b\.?(?=\s*,|\s*$)', 'Drive'),
+    (r'\bCt\b\.?(?=\s*,|\s*$)', 'Court'),
+    (r'\bPl\b\.?(?=\s*,|\s*$)', 'Place'),
+    (r'\bSq\b\.?', 'Square'),
+]
+EN_ABBR_CITIES = frozenset(['LDN', 'NY', 'LA', 'MIA', 'SD'])
+
+
+def _abbreviation_re(table):
+    """Une seule regex pour toute une table d'abréviations (groupe nommé a<i> par entrée)"""
+    return re.compile('|'.join(f'(?P<a{i}>{pattern})' for i, (pattern, _) in enumerate(table)))
+
+
+def _expand_abbreviations(address, table, table_re, changes):
+    """Remplace toutes les abréviations de la table en une seule passe sur l'adresse.
+
+    Les changements sont notés une fois par abréviation trouvée, dans l'ordre de la table.
+    """
+    found = set()
+
+    def repl(m):
+        i = int(m.lastgroup[1:])
+        found.add(i)
+        return table[i][1]
+
+    address = table_re.sub(repl, address)
+    for i in sorted(found):
+        pattern, replacement = table[i]
+        changes.append(f"{pattern} → {replacement}")
+    return address
+
+
+_FR_ABBR_RE = _abbreviation_re(_FR_ABBR)
+_EN_ABBR_RE = _abbreviation_re(_EN_ABBR)
+
+# "in the 9th arrondissement" (Paris)
+_ARR_RE = re.compile(r'in the (\d+)(?:st|nd|rd|th)?\s*arrondissement', re.IGNORECASE)
+_ARR_STRIP_RE = re.compile(r'\s*in the \d+(?:st|nd|rd|th)?\s*arrondissement\s*', re.IGNORECASE)
+
+# Nettoyage final
+_SPACES_RE = re.compile(r'\s+')
+_DOUBLE_COMMA_RE = re.compile(r',\s*,')
+_COMMA_SPACING_RE = re.compile(r'\s*,\s*')
+_ROAD_CODE_RE = re.compile(r'^\d+\s+A\d+\s')
+
+
 def standardize_address(address, city_code, verbose=False):
     """
     Standardise et complète une adresse pour améliorer le géocodage.
@@ -474,115 +735,52 @@ def standardize_address(address, city_code, verbose=False):
     if not address:
         return None, "Adresse vide"
     
-    original = address
-    changes = []
+    standardized, changes = _standardize_cached(address, city_code)
     
-    # Mapping code ville → infos
-    city_info = {
-        'PA': {'name': 'Paris', 'country': 'France', 'patterns': [r'75\d{3}', r'paris']},
-        'LY': {'name': 'Lyon', 'country': 'France', 'patterns': [r'69\d{3}', r'lyon']},
-        'MARS': {'name': 'Marseille', 'country': 'France', 'patterns': [r'13\d{3}', r'marseille']},
-        'LDN': {'name': 'London', 'country': 'UK', 'patterns': [r'[A-Z]{1,2}\d[A-Z\d]?\s*\d[A-Z]{2}', r'london']},
-        'NY': {'name': 'New York', 'country': 'USA', 'patterns': [r'NY\s*\d{5}', r'new york', r'nyc', r'brooklyn', r'manhattan']},
-        'LA': {'name': 'Los Angeles', 'country': 'USA', 'patterns': [r'CA\s*\d{5}', r'los angeles']},
-        'TK': {'name': 'Tokyo', 'country': 'Japan', 'patterns': [r'tokyo']},
-        'ROM': {'name': 'Rome', 'country': 'Italy', 'patterns': [r'roma', r'rome']},
-        'BCN': {'name': 'Barcelona', 'country': 'Spain', 'patterns': [r'barcelona']},
-        'BKK': {'name': 'Bangkok', 'country': 'Thailand', 'patterns': [r'bangkok']},
-        'HK': {'name': 'Hong Kong', 'country': 'China', 'patterns': [r'hong kong']},
-        'MIA': {'name': 'Miami', 'country': 'USA', 'patterns': [r'FL\s*\d{5}', r'miami']},
-        'SD': {'name': 'San Diego', 'country': 'USA', 'patterns': [r'san diego']},
-        'RAV': {'name': 'Ravenna', 'country': 'Italy', 'patterns': [r'ravenna']},
-        'BIL': {'name': 'Bilbao', 'country': 'Spain', 'patterns': [r'bilbao']},
-        'AMS': {'name': 'Amsterdam', 'country': 'Netherlands', 'patterns': [r'amsterdam']},
-        'TLS': {'name': 'Toulouse', 'country': 'France', 'patterns': [r'31\d{3}', r'toulouse']},
-        'BDX': {'name': 'Bordeaux', 'country': 'France', 'patterns': [r'33\d{3}', r'bordeaux']},
-        'NTE': {'name': 'Nantes', 'country': 'France', 'patterns': [r'44\d{3}', r'nantes']},
-        'LILE': {'name': 'Lille', 'country': 'France', 'patterns': [r'59\d{3}', r'lille']},
-        'STR': {'name': 'Strasbourg', 'country': 'France', 'patterns': [r'67\d{3}', r'strasbourg']},
-        'MTP': {'name': 'Montpellier', 'country': 'France', 'patterns': [r'34\d{3}', r'montpellier']},
-        'NICE': {'name': 'Nice', 'country': 'France', 'patterns': [r'06\d{3}', r'nice']},
-        'REIM': {'name': 'Reims', 'country': 'France', 'patterns': [r'51\d{3}', r'reims']},
-        'VER': {'name': 'Versailles', 'country': 'France', 'patterns': [r'78\d{3}', r'versailles']},
-    }
+    # Log des changements
+    if verbose and changes:
+        print(f"      📝 {address[:40]}...")
+        print(f"         → {standardized[:40]}...")
+        print(f"         Modifications: {', '.join(changes)}")
+    
+    return standardized, list(changes)
+
+
+@lru_cache(maxsize=8192)
+def _standardize_cached(address, city_code):
+    """Standardisation pure (sans log), mise en cache: une même adresse revient
+    souvent pour plusieurs invaders et à chaque relance.
+
+    Retourne (adresse standardisée, tuple des modifications).
+    """
+    changes = []
     
-    city = city_info.get(city_code, {})
+    city = ADDRESS_CITY_INFO.get(city_code, {})
     city_name = city.get('name', '')
     country = city.get('country', '')
     
     # 1. Nettoyer les caractères spéciaux RTF résiduels
     # Convertir les codes hexadécimaux RTF en caractères
-    rtf_chars = {
-        "'e0": "à", "'e1": "á", "'e2": "â", "'e3": "ã", "'e4": "ä",
-        "'e8": "è", "'e9": "é", "'ea": "ê", "'eb": "ë",
-        "'ec": "ì", "'ed": "í", "'ee": "î", "'ef": "ï",
-        "'f2": "ò", "'f3": "ó", "'f4": "ô", "'f5": "õ", "'f6": "ö",
-        "'f9": "ù", "'fa": "ú", "'fb": "û", "'fc": "ü",
-        "'e7": "ç", "'f1": "ñ",
-        "'c0": "À", "'c1": "Á", "'c2": "Â", "'c3": "Ã", "'c4": "Ä",
-        "'c8": "È", "'c9": "É", "'ca": "Ê", "'cb": "Ë",
-        "'d4": "Ô", "'d9": "Ù",
-    }
-    for rtf_code, char in rtf_chars.items():
+    for rtf_code, char in RTF_CHARS.items():
         if rtf_code in address:
             address = address.replace(rtf_code, char)
             changes.append(f"RTF {rtf_code} → {char}")
     
     # Nettoyer les codes RTF restants non reconnus
-    address = re.sub(r"'[a-f0-9]{2}", "", address)
+    address = _RTF_RESIDUAL_RE.sub("", address)
     address = address.replace("'", "'").replace("'", "'")
     
     # 2. Supprimer les mentions de pays (elles peuvent perturber Nominatim)
-    countries_to_remove = [
-        r',?\s*Royaume-Uni\s*$', r',?\s*United Kingdom\s*$', r',?\s*UK\s*$',
-        r',?\s*France\s*$', r',?\s*Italia\s*$', r',?\s*Italy\s*$',
-        r',?\s*España\s*$', r',?\s*Spain\s*$', r',?\s*USA\s*$',
-        r',?\s*United States\s*$', r',?\s*England\s*$',
-    ]
-    for pattern in countries_to_remove:
-        if re.search(pattern, address, re.IGNORECASE):
-            address = re.sub(pattern, '', address, flags=re.IGNORECASE)
-            changes.append("Pays supprimé")
+    address, n_countries = _COUNTRY_RE.subn('', address)
+    if n_countries:
+        changes.append("Pays supprimé")
     
     # 3. Expansion des abréviations françaises
-    fr_abbreviations = [
-        (r'\bBd\b\.?', 'Boulevard'),
-        (r'\bBoul\b\.?', 'Boulevard'),
-        (r'\bAv\b\.?', 'Avenue'),
-        (r'\bGal\b\.?', 'Galerie'),
-        (r'\bPl\b\.?', 'Place'),
-        (r'\bR\b\.(?=\s)', 'Rue'),
-        (r'\bSt\b\.?(?=\s+[A-Z])', 'Saint'),
-        (r'\bSte\b\.?(?=\s+[A-Z])', 'Sainte'),
-        (r'\bImp\b\.?', 'Impasse'),
-        (r'\bPass\b\.?', 'Passage'),
-        (r'\bFbg\b\.?', 'Faubourg'),
-        (r'\bCrs\b\.?', 'Cours'),
-    ]
-    
-    for pattern, replacement in fr_abbreviations:
-        if re.search(pattern, address):
-            address = re.sub(pattern, replacement, address)
-            changes.append(f"{pattern} → {replacement}")
+    address = _expand_abbreviations(address, _FR_ABBR, _FR_ABBR_RE, changes)
     
     # 4. Expansion des abréviations anglaises
-    en_abbreviations = [
-        (r'\bSt\b\.?(?=\s*,|\s*$|\s+[A-Z][a-z])', 'Street'),  # "Brewer St," → "Brewer Street"
-        (r'\bRd\b\.?', 'Road'),
-        (r'\bAve\b\.?', 'Avenue'),
-        (r'\bBlvd\b\.?', 'Boulevard'),
-        (r'\bLn\b\.?', 'Lane'),
-        (r'\bDr\b\.?(?=\s*,|\s*$)', 'Drive'),
-        (r'\bCt\b\.?(?=\s*,|\s*$)', 'Court'),
-        (r'\bPl\b\.?(?=\s*,|\s*$)', 'Place'),
-        (r'\bSq\b\.?', 'Square'),
-    ]
-    
-    if city_code in ['LDN', 'NY', 'LA', 'MIA', 'SD']:
-        for pattern, replacement in en_abbreviations:
-            if re.search(pattern, address):
-                address = re.sub(pattern, replacement, address)
-                changes.append(f"{pattern} → {replacement}")
+    if city_code in EN_ABBR_CITIES:
+        address = _expand_abbreviations(address, _EN_ABBR, _EN_ABBR_RE, changes)
     
     # 5. Normaliser "Londres" → "London"
     if 'Londres' in address:
@@ -591,20 +789,15 @@ def standardize_address(address, city_code, verbose=False):
     
     # 6. Traiter les descriptions textuelles
     # "in the 9th arrondissement" → ", 75009 Paris"
-    arr_match = re.search(r'in the (\d+)(?:st|nd|rd|th)?\s*arrondissement', address, re.IGNORECASE)
+    arr_match = _ARR_RE.search(address)
     if arr_match and city_code == 'PA':
         arr_num = int(arr_match.group(1))
-        address = re.sub(r'\s*in the \d+(?:st|nd|rd|th)?\s*arrondissement\s*', '', address, flags=re.IGNORECASE)
+        address = _ARR_STRIP_RE.sub('', address)
         address = f"{address}, 750{arr_num:02d} Paris"
         changes.append(f"Arrondissement {arr_num} → code postal")
     
     # 7. Vérifier si la ville est présente
-    has_city = False
-    if city_name:
-        for pattern in city.get('patterns', []):
-            if re.search(pattern, address, re.IGNORECASE):
-                has_city = True
-                break
+    has_city = bool(city_name) and _CITY_PATTERN_RES[city_code].search(address) is not None
     
     # 8. Ajouter la ville si manquante
     if not has_city and city_name:
@@ -614,181 +807,179 @@ def standardize_address(address, city_code, verbose=False):
         changes.append(f"Ville ajoutée: {city_name}")
     
     # 9. Nettoyer les espaces et ponctuations multiples
-    address = re.sub(r'\s+', ' ', address)
-    address = re.sub(r',\s*,', ',', address)
-    address = re.sub(r'\s*,\s*', ', ', address)
+    address = _SPACES_RE.sub(' ', address)
+    address = _DOUBLE_COMMA_RE.sub(',', address)
+    address = _COMMA_SPACING_RE.sub(', ', address)
     address = address.strip().strip(',').strip()
     
     # 10. Supprimer les codes route (A501, A5201, A41) qui perturbent le géocodage
-    if re.match(r'^\d+\s+A\d+\s', address):
+    if _ROAD_CODE_RE.match(address):
         # "16 A501, London" → problème, garder tel quel mais noter
         changes.append("⚠️ Code route détecté")
     
-    # Log des changements
-    if verbose and changes:
-        print(f"      📝 {original[:40]}...")
-        print(f"         → {address[:40]}...")
-        print(f"         Modifications: {', '.join(changes)}")
-    
-    return address, changes
+    return address, tuple(changes)
+
+
+def geocode_cache_key(query):
+    """Clé du cache de géocodage: requête en minuscules, espaces normalisés"""
+    return ' '.join(query.lower().split())
+
+
+def geocode_cache_lookup(cache, key):
+    """(trouvé, résultat) pour une clé du cache de géocodage
+
+    Les échecs sont stockés {'miss_at': date ISO} et expirent après
+    GEOCODE_MISS_TTL; un ancien échec sans date (None) est retenté.
+    """
+    if cache is None:
+        return False, None
+    entry = cache.get(key)
+    if entry is None:
+        return False, None
+    if 'miss_at' in entry:
+        try:
+            fresh = datetime.now() - datetime.fromisoformat(entry['miss_at']) < GEOCODE_MISS_TTL
+        except (TypeError, ValueError):
+            fresh = False
+        return fresh, None
+    return True, entry
+
+
+def load_geocode_cache(filepath=GEOCODE_CACHE_FILE):
+    """Charge le cache persistant de géocodage ({} si absent ou corrompu)"""
+    try:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
 
 
-def geocode_address_sync(address, city_name=None):
-    """Géocode une adresse via Nominatim (synchrone)"""
-    import urllib.request
-    import urllib.parse
+def save_geocode_cache(cache, filepath=GEOCODE_CACHE_FILE):
+    """Sauvegarde le cache persistant de géocodage
+
+    Écrit une copie: un thread de géocodage d'une source annulée peut encore
+    compléter le cache pendant l'écriture.
+    """
+    with open(filepath, 'w', encoding='utf-8') as f:
+        json.dump(dict(cache), f, ensure_ascii=False, indent=2)
+
+
+def geocode_query(address, city_name=None):
+    """Requête Nominatim: adresse + ville si elle n'y figure pas déjà"""
+    if city_name and city_name.lower() not in address.lower():
+        return f"{address}, {city_name}"
+    return address
+
+
+class NominatimRateLimiter:
+    """Espacement minimal entre deux requêtes Nominatim (politique: 1 req/sec).
+
+    Seules les vraies requêtes réseau prennent un créneau: les hits du cache
+    et le temps passé à traiter les réponses ne font pas attendre.
+    Utilisable depuis plusieurs threads (geocode_address via asyncio.to_thread).
+    """
     
+    def __init__(self, interval=NOMINATIM_MIN_INTERVAL):
+        self.interval = interval
+        self._next = 0.0  # time.monotonic() du prochain créneau libre
+        self._lock = threading.Lock()
+    
+    def take(self):
+        """Réserve le prochain créneau, puis attend qu'il arrive si nécessaire"""
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if wait > 0:
+            time.sleep(wait)
+
+
+# Limiteur partagé par tous les appels à geocode_address_sync
+NOMINATIM_LIMITER = NominatimRateLimiter()
+
+# Session HTTP Nominatim: connexion TCP/TLS réutilisée d'une requête à l'autre
+NOMINATIM_SESSION = requests.Session()
+NOMINATIM_SESSION.headers['User-Agent'] = 'InvaderHunter/1.0'
+
+
+def geocode_address_sync(address, city_name=None, cache=None):
+    """Géocode une adresse via Nominatim (synchrone)
+
+    cache: dict {clé requête: résultat ou {'miss_at': date}}, consulté avant le
+    réseau et complété après (les erreurs réseau ne sont pas mises en cache,
+    les adresses introuvables sont retentées après GEOCODE_MISS_TTL).
+    """
     if not address or len(address.strip()) < 3:
         return None
     
+    query = geocode_query(address, city_name)
+    key = geocode_cache_key(query)
+    found, geo = geocode_cache_lookup(cache, key)
+    if found:
+        return geo
+    
     try:
-        query = address
-        if city_name and city_name.lower() not in address.lower():
-            query += f", {city_name}"
-        
-        url = f"https://nominatim.openstreetmap.org/search?q={urllib.parse.quote(query)}&format=json&limit=1"
-        
-        req = urllib.request.Request(url, headers={'User-Agent': 'InvaderHunter/1.0'})
-        with urllib.request.urlopen(req, timeout=10) as response:
-            data = json.loads(response.read().decode())
-            if data:
-                return {
-                    'lat': float(data[0]['lat']),
-                    'lng': float(data[0]['lon']),
-                    'display_name': data[0].get('display_name', ''),
-                    'source': 'nominatim',
-                    'confidence': 'high'
-                }
+        NOMINATIM_LIMITER.take()
+        response = NOMINATIM_SESSION.get(
+            NOMINATIM_URL, params={'q': query, 'format': 'json', 'limit': 1}, timeout=10
+        )
+        response.raise_for_status()  # Erreur HTTP: pas de mise en cache
+        data = response.json()
+        geo = None
+        if data:
+            geo = {
+                'lat': float(data[0]['lat']),
+                'lng': float(data[0]['lon']),
+                'display_name': data[0].get('display_name', ''),
+                'source': 'nominatim',
+                'confidence': 'high'
+            }
+        if cache is not None:
+            cache[key] = geo or {'miss_at': datetime.now().isoformat()}
+        return geo
     except Exception as e:
         pass
     return None
 
 
-def geocode_manual_addresses(manual_addresses, verbose=False):
-    """Géocode toutes les adresses manuelles avec standardisation préalable"""
-    
-    # Centres des villes pour les adresses inconnues
-    city_centers = {
-        # France
-        'PA': {'lat': 48.8566, 'lng': 2.3522, 'name': 'Paris'},
-        'LY': {'lat': 45.7640, 'lng': 4.8357, 'name': 'Lyon'},
-        'MARS': {'lat': 43.2965, 'lng': 5.3698, 'name': 'Marseille'},
-        'TLS': {'lat': 43.6047, 'lng': 1.4442, 'name': 'Toulouse'},
-        'BDX': {'lat': 44.8378, 'lng': -0.5792, 'name': 'Bordeaux'},
-        'NTE': {'lat': 47.2184, 'lng': -1.5536, 'name': 'Nantes'},
-        'NA': {'lat': 47.2184, 'lng': -1.5536, 'name': 'Nantes'},
-        'LILE': {'lat': 50.6292, 'lng': 3.0573, 'name': 'Lille'},
-        'LIL': {'lat': 50.6292, 'lng': 3.0573, 'name': 'Lille'},
-        'LILL': {'lat': 50.6292, 'lng': 3.0573, 'name': 'Lille'},
-        'STR': {'lat': 48.5734, 'lng': 7.7521, 'name': 'Strasbourg'},
-        'STRG': {'lat': 48.5734, 'lng': 7.7521, 'name': 'Strasbourg'},
-        'MTP': {'lat': 43.6108, 'lng': 3.8767, 'name': 'Montpellier'},
-        'MPL': {'lat': 43.6108, 'lng': 3.8767, 'name': 'Montpellier'},
-        'NICE': {'lat': 43.7102, 'lng': 7.2620, 'name': 'Nice'},
-        'NP': {'lat': 43.7102, 'lng': 7.2620, 'name': 'Nice'},
-        'AMI': {'lat': 49.8941, 'lng': 2.2958, 'name': 'Amiens'},
-        'ORLN': {'lat': 47.9029, 'lng': 1.9039, 'name': 'Orléans'},
-        'DIJ': {'lat': 47.3220, 'lng': 5.0415, 'name': 'Dijon'},
-        'GRN': {'lat': 45.1885, 'lng': 5.7245, 'name': 'Grenoble'},
-        'AIX': {'lat': 43.5297, 'lng': 5.4474, 'name': 'Aix-en-Provence'},
-        'AVI': {'lat': 43.9493, 'lng': 4.8055, 'name': 'Avignon'},
-        'NIM': {'lat': 43.8367, 'lng': 4.3601, 'name': 'Nîmes'},
-        'CLR': {'lat': 45.7772, 'lng': 3.0870, 'name': 'Clermont-Ferrand'},
-        'RN': {'lat': 48.1173, 'lng': -1.6778, 'name': 'Rennes'},
-        'RNS': {'lat': 48.1173, 'lng': -1.6778, 'name': 'Rennes'},
-        'REIM': {'lat': 49.2583, 'lng': 4.0317, 'name': 'Reims'},
-        'VER': {'lat': 48.8014, 'lng': 2.1301, 'name': 'Versailles'},
-        'VRS': {'lat': 48.8014, 'lng': 2.1301, 'name': 'Versailles'},
-        'BAB': {'lat': 43.4832, 'lng': -1.5586, 'name': 'Bayonne-Anglet-Biarritz'},
-        'FTBL': {'lat': 48.4010, 'lng': 2.7024, 'name': 'Fontainebleau'},
-        'PAU': {'lat': 43.2965, 'lng': -0.3708, 'name': 'Pau'},
-        'PRP': {'lat': 42.6988, 'lng': 2.8948, 'name': 'Perpignan'},
-        'MTB': {'lat': 44.0171, 'lng': 1.3527, 'name': 'Montauban'},
-        'CAPF': {'lat': 44.6357, 'lng': -1.2479, 'name': 'Cap Ferret'},
-        'CAZ': {'lat': 43.2141, 'lng': 5.5378, 'name': 'Cassis'},
-        'LCT': {'lat': 43.1748, 'lng': 5.6095, 'name': 'La Ciotat'},
-        'LBR': {'lat': 43.8324, 'lng': 5.3658, 'name': 'Luberon'},
-        'FRQ': {'lat': 43.9600, 'lng': 5.7810, 'name': 'Forcalquier'},
-        'MEN': {'lat': 43.7764, 'lng': 7.5048, 'name': 'Menton'},
-        'CON': {'lat': 44.0900, 'lng': -1.3150, 'name': 'Contis'},
-        'VLMO': {'lat': 45.4553, 'lng': 6.4506, 'name': 'Valmorel'},
-        'REUN': {'lat': -21.1151, 'lng': 55.5364, 'name': 'La Réunion'},
-        'BTA': {'lat': 42.6973, 'lng': 9.4510, 'name': 'Bastia'},
-        # UK
-        'LDN': {'lat': 51.5074, 'lng': -0.1278, 'name': 'London'},
-        'MAN': {'lat': 53.4808, 'lng': -2.2426, 'name': 'Manchester'},
-        'NCL': {'lat': 54.9783, 'lng': -1.6178, 'name': 'Newcastle'},
-        # Europe
-        'BCN': {'lat': 41.3851, 'lng': 2.1734, 'name': 'Barcelona'},
-        'BRC': {'lat': 41.3851, 'lng': 2.1734, 'name': 'Barcelona'},
-        'ROM': {'lat': 41.9028, 'lng': 12.4964, 'name': 'Rome'},
-        'RAV': {'lat': 44.4184, 'lng': 12.2035, 'name': 'Ravenna'},
-        'RA': {'lat': 44.4184, 'lng': 12.2035, 'name': 'Ravenna'},
-        'FLRN': {'lat': 43.7696, 'lng': 11.2558, 'name': 'Florence'},
-        'MLN': {'lat': 45.4642, 'lng': 9.1900, 'name': 'Milan'},
-        'VRN': {'lat': 25.2854, 'lng': 82.9990, 'name': 'Varanasi'},
-        'MLGA': {'lat': 36.7213, 'lng': -4.4214, 'name': 'Malaga'},
-        'BIL': {'lat': 43.2630, 'lng': -2.9350, 'name': 'Bilbao'},
-        'BBO': {'lat': 43.2630, 'lng': -2.9350, 'name': 'Bilbao'},
-        'AMS': {'lat': 52.3676, 'lng': 4.9041, 'name': 'Amsterdam'},
-        'RTD': {'lat': 51.9225, 'lng': 4.4792, 'name': 'Rotterdam'},
-        'NOO': {'lat': 52.2361, 'lng': 4.4303, 'name': 'Noordwijk'},
-        'BRL': {'lat': 52.5200, 'lng': 13.4050, 'name': 'Berlin'},
-        'MUN': {'lat': 48.1351, 'lng': 11.5820, 'name': 'Munich'},
-        'KLN': {'lat': 50.9375, 'lng': 6.9603, 'name': 'Cologne'},
-        'FKF': {'lat': 50.1109, 'lng': 8.6821, 'name': 'Frankfurt'},
-        'WN': {'lat': 48.2082, 'lng': 16.3738, 'name': 'Vienna'},
-        'BXL': {'lat': 50.8503, 'lng': 4.3517, 'name': 'Brussels'},
-        'CHAR': {'lat': 50.4108, 'lng': 4.4446, 'name': 'Charleroi'},
-        'ANVR': {'lat': 51.2194, 'lng': 4.4025, 'name': 'Antwerp'},
-        'BRN': {'lat': 46.9480, 'lng': 7.4474, 'name': 'Bern'},
-        'BSL': {'lat': 47.5596, 'lng': 7.5886, 'name': 'Basel'},
-        'GNV': {'lat': 46.2044, 'lng': 6.1432, 'name': 'Geneva'},
-        'LSN': {'lat': 46.5197, 'lng': 6.6323, 'name': 'Lausanne'},
-        'ANZR': {'lat': 46.3100, 'lng': 7.3870, 'name': 'Anzère'},
-        'LJU': {'lat': 46.0569, 'lng': 14.5058, 'name': 'Ljubljana'},
-        'FAO': {'lat': 37.0194, 'lng': -7.9322, 'name': 'Faro'},
-        'IST': {'lat': 41.0082, 'lng': 28.9784, 'name': 'Istanbul'},
-        'RVK': {'lat': 64.1466, 'lng': -21.9426, 'name': 'Reykjavik'},
-        'HALM': {'lat': 56.6745, 'lng': 12.8578, 'name': 'Halmstad'},
-        'VSB': {'lat': 57.6349, 'lng': 18.2948, 'name': 'Visby'},
-        'GRU': {'lat': 43.2615, 'lng': 17.0186, 'name': 'Gruž'},
-        # Africa
-        'MRAK': {'lat': 31.6295, 'lng': -7.9811, 'name': 'Marrakech'},
-        'RBA': {'lat': 34.0209, 'lng': -6.8416, 'name': 'Rabat'},
-        'DJBA': {'lat': 33.8076, 'lng': 10.8451, 'name': 'Djerba'},
-        'MBSA': {'lat': -4.0435, 'lng': 39.6682, 'name': 'Mombasa'},
-        # Asia
-        'TK': {'lat': 35.6762, 'lng': 139.6503, 'name': 'Tokyo'},
-        'HK': {'lat': 22.3193, 'lng': 114.1694, 'name': 'Hong Kong'},
-        'BKK': {'lat': 13.7563, 'lng': 100.5018, 'name': 'Bangkok'},
-        'BGK': {'lat': 13.7563, 'lng': 100.5018, 'name': 'Bangkok'},
-        'KAT': {'lat': 27.7172, 'lng': 85.3240, 'name': 'Kathmandu'},
-        'DHK': {'lat': 23.8103, 'lng': 90.4125, 'name': 'Dhaka'},
-        'DJN': {'lat': 36.3504, 'lng': 127.3845, 'name': 'Daejeon'},
-        'SL': {'lat': 37.5665, 'lng': 126.9780, 'name': 'Seoul'},
-        'BT': {'lat': 27.4712, 'lng': 89.6339, 'name': 'Bhutan'},
-        'CCU': {'lat': 21.1619, 'lng': -86.8515, 'name': 'Cancún'},
-        # Americas
-        'NY': {'lat': 40.7128, 'lng': -74.0060, 'name': 'New York'},
-        'LA': {'lat': 34.0522, 'lng': -118.2437, 'name': 'Los Angeles'},
-        'MIA': {'lat': 25.7617, 'lng': -80.1918, 'name': 'Miami'},
-        'SD': {'lat': 32.7157, 'lng': -117.1611, 'name': 'San Diego'},
-        'SP': {'lat': -23.5505, 'lng': -46.6333, 'name': 'São Paulo'},
-        'POTI': {'lat': -19.5836, 'lng': -65.7531, 'name': 'Potosí'},
-        # Oceania
-        'PRT': {'lat': -31.9505, 'lng': 115.8605, 'name': 'Perth'},
-        'MLB': {'lat': -37.8136, 'lng': 144.9631, 'name': 'Melbourne'},
-        # Autres
-        'ELT': {'lat': 29.5577, 'lng': 34.9519, 'name': 'Eilat'},
-        'GRTI': {'lat': 29.0333, 'lng': -13.6333, 'name': 'Graciosa'},
-        'RDU': {'lat': 50.3543, 'lng': 5.4563, 'name': 'Durbuy'},
+# Lignes de repli au centre-ville, construites une fois par ville et copiées par adresse
+_CITY_CENTER_ROWS = {
+    code: {
+        'lat': c['lat'],
+        'lng': c['lng'],
+        'address_original': '',
+        'source': 'city_center',
+        'confidence': 'very_low',
+        'location_unknown': True
     }
-    
+    for code, c in CITY_CENTERS.items()
+}
+_CITY_CENTER_FALLBACK_ROWS = {
+    code: {
+        'lat': c['lat'],
+        'lng': c['lng'],
+        'address_original': '',
+        'address_standardized': '',
+        'source': 'city_center_fallback',
+        'confidence': 'very_low',
+        'location_unknown': True
+    }
+    for code, c in CITY_CENTERS.items()
+}
+
+
+def geocode_manual_addresses(manual_addresses, verbose=False, use_cache=True):
+    """Géocode toutes les adresses manuelles avec standardisation préalable
+
+    use_cache: réutilise data/geocode_cache.json (pas de requête ni de pause
+    rate limit pour les adresses déjà géocodées)
+    """
     results = {}
     success_count = 0
     unknown_count = 0
     standardized_count = 0
+    cache_hits = 0
+    geo_cache = load_geocode_cache() if use_cache else None
     
     print(f"\n📍 Géocodage de {len(manual_addresses)} adresses manuelles...")
     print(f"   (Étape 1: Standardisation → Étape 2: Géocodage Nominatim)")
@@ -797,10 +988,9 @@ def geocode_manual_addresses(manual_addresses, verbose=False):
         address = data.get('address', '')
         
         # Extraire le code ville
-        city_match = re.match(r'^([A-Z]+)[-_]', code)
+        city_match = _CITY_PREFIX_RE.match(code)
         city_code = city_match.group(1) if city_match else None
-        city_info = city_centers.get(city_code, {})
-        city_name = city_info.get('name', '')
+        city_name = CITY_CENTERS.get(city_code, {}).get('name', '')
         
         if verbose:
             print(f"\n   [{i+1}/{len(manual_addresses)}] {code}")
@@ -819,7 +1009,10 @@ def geocode_manual_addresses(manual_addresses, verbose=False):
             
             # Étape 2: Géocoder l'adresse standardisée
             if standardized:
-                geo = geocode_address_sync(standardized, None)  # Ville déjà dans l'adresse
+                # Rate limit Nominatim géré par NOMINATIM_LIMITER (requêtes réseau uniquement)
+                if geocode_cache_lookup(geo_cache, geocode_cache_key(standardized))[0]:
+                    cache_hits += 1
+                geo = geocode_address_sync(standardized, None, cache=geo_cache)  # Ville déjà dans l'adresse
                 
                 if geo:
                     results[code] = {
@@ -837,16 +1030,12 @@ def geocode_manual_addresses(manual_addresses, verbose=False):
                         print(f"      ✅ Géocodé: ({geo['lat']:.6f}, {geo['lng']:.6f})")
                 else:
                     # Géocodage échoué, utiliser centre ville
-                    if city_code and city_code in city_centers:
-                        results[code] = {
-                            'lat': city_info['lat'],
-                            'lng': city_info['lng'],
-                            'address_original': address,
-                            'address_standardized': standardized,
-                            'source': 'city_center_fallback',
-                            'confidence': 'very_low',
-                            'location_unknown': True
-                        }
+                    fallback = _CITY_CENTER_FALLBACK_ROWS.get(city_code)
+                    if fallback is not None:
+                        row = fallback.copy()
+                        row['address_original'] = address
+                        row['address_standardized'] = standardized
+                        results[code] = row
                         unknown_count += 1
                         if verbose:
                             print(f"      ⚠️ Échec géocodage → centre {city_name}")
@@ -858,29 +1047,24 @@ def geocode_manual_addresses(manual_addresses, verbose=False):
                     print(f"      ❌ Adresse invalide après standardisation")
         else:
             # Pas d'adresse, utiliser centre ville
-            if city_code and city_code in city_centers:
-                results[code] = {
-                    'lat': city_info['lat'],
-                    'lng': city_info['lng'],
-                    'address_original': '',
-                    'source': 'city_center',
-                    'confidence': 'very_low',
-                    'location_unknown': True
-                }
+            if city_code in _CITY_CENTER_ROWS:
+                results[code] = _CITY_CENTER_ROWS[city_code].copy()
                 unknown_count += 1
                 if verbose:
                     print(f"      📍 Pas d'adresse → centre {city_name}")
             else:
                 if verbose:
                     print(f"      ❌ Pas d'adresse ni de ville connue")
-        
-        # Pause pour respecter rate limit Nominatim (1 req/sec)
-        time.sleep(1.1)
+    
+    if geo_cache is not None:
+        save_geocode_cache(geo_cache)
     
     print(f"\n   📊 Résumé:")
     print(f"      ✅ {success_count} géolocalisés avec succès")
     print(f"      ⚠️ {unknown_count} au centre ville (position inconnue)")
     print(f"      📝 {standardized_count} adresses standardisées")
+    if geo_cache is not None:
+        print(f"      💾 {cache_hits} reprises du cache ({GEOCODE_CACHE_FILE.name})")
     
     return results
 
@@ -889,296 +1073,351 @@ def geocode_manual_addresses(manual_addresses, verbose=False):
 # GÉOLOCALISATION PAR RECHERCHE WEB
 # ============================================================================
 
+# Onglets Playwright partagés entre les sources d'un même invader
+GEOLOCATE_PAGES = 3
+
+# Invaders géolocalisés en parallèle (un contexte navigateur chacun)
+GEOLOCATE_WORKERS = 2
+
+# Ressources jamais lues par les sources (seul le HTML compte): requêtes annulées
+BLOCKED_RESOURCE_TYPES = frozenset({'image', 'stylesheet', 'font', 'media'})
+
+# Durée maximale d'une source (recherche, pages visitées et géocodage compris)
+SOURCE_TIMEOUT = 30
+
+# Page Google exploitable: résultats affichés, ou page CAPTCHA ("sorry")
+SERP_READY_SELECTOR = '#rso, #search, #captcha-form, form[action*="sorry"]'
+
+# Extrait d'une page Google renvoyé par le navigateur: texte visible de la
+# colonne de résultats (une ligne par <p>) et ses liens, en HTML minimal pour
+# que les regex des sources s'appliquent sans sérialiser tout le DOM
+SERP_PROJECTION_JS = """() => {
+    const root = document.getElementById('rso') || document.body;
+    if (!root) return '';
+    const lines = root.innerText.split('\\n').filter(line => line.trim());
+    const links = Array.from(root.querySelectorAll('a[href]'), a => a.href);
+    return lines.map(line => '<p>' + line + '</p>')
+        .concat(links.map(href => '<a href="' + href + '"></a>'))
+        .join('\\n');
+}"""
+
+# Regex des sources web, compilées une seule fois
+_COORD_RE = re.compile(r'(\d{1,2}\.\d{4,})[°,\s]+(-?\d{1,3}\.\d{4,})')
+_PAGE_COORD_RE = re.compile(r'(\d{1,2}\.\d{4,})[,\s]+(-?\d{1,3}\.\d{4,})')
+_LATLNG_PARAM_RE = re.compile(r'lat[=:]\s*(\d{1,2}\.\d+)[&,\s]+(?:lng|lon)[=:]\s*(-?\d{1,3}\.\d+)', re.IGNORECASE)
+_SERP_ADDRESS_RES = [re.compile(p, re.IGNORECASE) for p in (
+    r'(\d+[\s,]+(?:rue|avenue|boulevard|place|passage|impasse|quai|cours|allée)[^<,]{5,60})',
+    r'(\d+[\s,]+(?:street|road|avenue|lane|drive|way|place)[^<,]{5,60})',
+    r'(\d+[\s,]+(?:via|piazza|corso|viale)[^<,]{5,60})',
+    r'(\d+[\s,]+(?:calle|avenida|plaza|paseo)[^<,]{5,60})',
+)]
+_STREETARTCITIES_ADDRESS_RE = re.compile(r'(\d+[,\s]+(?:rue|avenue|boulevard|street|road)[^<,]{5,50})', re.IGNORECASE)
+_ILLUMINATE_ADDRESS_RE = re.compile(r'(\d+[,\s]+(?:rue|avenue|boulevard|street)[^<,]{5,50})', re.IGNORECASE)
+_PARIS_ARR_RES = [re.compile(p, re.IGNORECASE) for p in (
+    r'(\d{1,2})(?:e|ème|er|eme|è)\s*(?:arrondissement)?',
+    r'(?:arrondissement|arr\.?)\s*(\d{1,2})',
+    r'paris\s*(\d{1,2})(?:e|ème)?',
+)]
+
+# Centres approximatifs des arrondissements de Paris
+PARIS_ARR_CENTERS = {
+    1: (48.8606, 2.3376), 2: (48.8683, 2.3441), 3: (48.8640, 2.3614),
+    4: (48.8539, 2.3582), 5: (48.8462, 2.3472), 6: (48.8510, 2.3329),
+    7: (48.8566, 2.3130), 8: (48.8744, 2.3106), 9: (48.8767, 2.3378),
+    10: (48.8762, 2.3598), 11: (48.8597, 2.3793), 12: (48.8396, 2.3876),
+    13: (48.8322, 2.3561), 14: (48.8331, 2.3264), 15: (48.8421, 2.2993),
+    16: (48.8637, 2.2769), 17: (48.8867, 2.3166), 18: (48.8925, 2.3444),
+    19: (48.8871, 2.3824), 20: (48.8638, 2.3986),
+}
+
+_FLICKR_LINK_RE = re.compile(r'https://(?:www\.)?flickr\.com/photos/[^"\s<>]+')
+_FLICKR_GEO_RES = [re.compile(p) for p in (
+    r'data-lat="(\d{1,2}\.\d+)"[^>]*data-lon="(-?\d{1,3}\.\d+)"',
+    r'"latitude":(\d{1,2}\.\d+),"longitude":(-?\d{1,3}\.\d+)',
+    r'geo:(\d{1,2}\.\d+),(-?\d{1,3}\.\d+)',
+)]
+_ILLUMINATE_LINK_RE = re.compile(r'https://illuminateartofficial\.com/[^"\s<>]+invader[^"\s<>]*', re.IGNORECASE)
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+_WS_RE = re.compile(r'\s+')
+
+# Indices de page CAPTCHA: une seule passe insensible à la casse, sans copie .lower()
+CAPTCHA_INDICATORS = (
+    'captcha', 'recaptcha', 'unusual traffic',
+    'trafic inhabituel', 'robot', 'automated',
+    'verify you\'re human', 'vérifier que vous'
+)
+_CAPTCHA_RE = re.compile('|'.join(map(re.escape, CAPTCHA_INDICATORS)), re.IGNORECASE)
+
+
+# Boutons d'acceptation Google: une seule requête locator (union CSS, visibles
+# uniquement) au lieu d'un aller-retour CDP par sélecteur
+GOOGLE_CONSENT_SELECTORS = (
+    'button:has-text("Tout accepter")',
+    'button:has-text("Accept all")',
+    'button:has-text("Accepter tout")',
+    'button:has-text("J\'accepte")',
+    'button:has-text("I agree")',
+    '[aria-label="Tout accepter"]',
+    '[aria-label="Accept all"]',
+    '#L2AGLb',  # ID du bouton Google
+    'button[id*="accept"]',
+)
+GOOGLE_CONSENT_SELECTOR = ', '.join(f"{sel}:visible" for sel in GOOGLE_CONSENT_SELECTORS)
+
+# Pages sans bandeau de consentement avant d'arrêter de le chercher dans un contexte
+GOOGLE_CONSENT_MAX_MISSES = 2
+
+
 async def accept_google_consent(page):
-    """Accepte les cookies Google si la page de consentement apparaît"""
+    """Accepte les cookies Google si la page de consentement apparaît
+
+    Le consentement vaut pour tout le contexte navigateur: une fois accepté,
+    ou absent de GOOGLE_CONSENT_MAX_MISSES pages, il n'est plus recherché.
+    Après la première acceptation du navigateur, les cookies sont enregistrés
+    dans GOOGLE_STATE_FILE (un seul contexte l'écrit).
+    """
+    context = page.context
+    if getattr(context, '_google_consent_done', False):
+        return False
     try:
-        # Différents boutons possibles pour accepter
-        consent_selectors = [
-            'button:has-text("Tout accepter")',
-            'button:has-text("Accept all")',
-            'button:has-text("Accepter tout")',
-            'button:has-text("J\'accepte")',
-            'button:has-text("I agree")',
-            '[aria-label="Tout accepter"]',
-            '[aria-label="Accept all"]',
-            '#L2AGLb',  # ID du bouton Google
-            'button[id*="accept"]',
-        ]
-        
-        for selector in consent_selectors:
-            try:
-                btn = page.locator(selector).first
-                if await btn.count() > 0 and await btn.is_visible():
-                    await btn.click()
-                    await page.wait_for_timeout(1000)
-                    return True
-            except:
-                continue
+        btn = page.locator(GOOGLE_CONSENT_SELECTOR).first
+        if await btn.count() > 0:
+            await btn.click()
+            await page.wait_for_timeout(1000)
+            context._google_consent_done = True
+            browser = context.browser
+            if not getattr(browser, '_google_state_saved', False):
+                browser._google_state_saved = True  # Posé avant l'await: les autres workers passent
+                await context.storage_state(path=_p(GOOGLE_STATE_FILE))
+            return True
+        misses = getattr(context, '_google_consent_misses', 0) + 1
+        context._google_consent_misses = misses
+        if misses >= GOOGLE_CONSENT_MAX_MISSES:
+            context._google_consent_done = True
         return False
-    except:
+    except Exception:
         return False
 
 
-async def check_for_captcha(page):
-    """Vérifie si Google affiche un CAPTCHA"""
+def check_for_captcha(html):
+    """Vérifie si le HTML d'une page Google est un CAPTCHA"""
+    return _CAPTCHA_RE.search(html) is not None
+
+
+async def geocode_address(address, city_name=None, cache=None):
+    """Convertit une adresse en coordonnées via Nominatim (OpenStreetMap)
+
+    cache: même dict que geocode_address_sync (data/geocode_cache.json).
+    La requête tourne dans un thread pour ne pas bloquer la boucle asyncio.
+    """
+    return await asyncio.to_thread(geocode_address_sync, address, city_name, cache)
+
+
+async def _block_heavy_resources(route):
+    """Handler context.route: annule images, CSS, polices et médias"""
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+def google_cse_search(query):
+    """Recherche via l'API Google Custom Search
+
+    Renvoie les résultats (lien, titre, extrait, pagemap) sous forme de HTML
+    minimal, pour que les regex des sources s'appliquent comme sur une page
+    de résultats Google.
+    """
+    # Clé passée en en-tête, jamais dans l'URL : les messages d'erreur de
+    # requests contiennent l'URL et finissent dans l'audit commité
     try:
-        html = await page.content()
-        captcha_indicators = [
-            'captcha', 'recaptcha', 'unusual traffic',
-            'trafic inhabituel', 'robot', 'automated',
-            'verify you\'re human', 'vérifier que vous'
-        ]
-        html_lower = html.lower()
-        for indicator in captcha_indicators:
-            if indicator in html_lower:
-                return True
-        return False
-    except:
-        return False
+        response = requests.get(GOOGLE_CSE_URL, params={
+            'cx': GOOGLE_CSE_ID, 'q': query, 'num': 10
+        }, headers={'X-Goog-Api-Key': GOOGLE_CSE_KEY}, timeout=10)
+        response.raise_for_status()
+        items = response.json().get('items', [])
+    except requests.RequestException as e:
+        status = getattr(e.response, 'status_code', None)
+        detail = f"HTTP {status}" if status else type(e).__name__
+        raise RuntimeError(f"Google CSE: {detail}") from None
+    
+    parts = []
+    for item in items:
+        parts.append(f'<a href="{item.get("link", "")}">{item.get("title", "")}</a>')
+        parts.append(f'<p>{item.get("snippet", "")}</p>')
+        for entries in item.get('pagemap', {}).values():
+            for entry in entries:
+                if isinstance(entry, dict):
+                    parts.extend(f'<p>{key}: {value}</p>' for key, value in entry.items())
+    return '\n'.join(parts)
 
 
-async def geocode_address(address, city_name=None):
-    """Convertit une adresse en coordonnées via Nominatim (OpenStreetMap)"""
-    import urllib.request
-    import urllib.parse
-    
+async def _google_serp(page, search_url, source, audit):
+    """Charge une page de résultats Google; renvoie le HTML, ou None si CAPTCHA
+
+    Avec GOOGLE_CSE_KEY/GOOGLE_CSE_ID, passe par l'API JSON (ni navigateur,
+    ni consentement, ni CAPTCHA).
+    """
+    source['url'] = search_url
+
+    if GOOGLE_CSE_KEY and GOOGLE_CSE_ID:
+        query = parse_qs(urlsplit(search_url).query)['q'][0]
+        return await asyncio.to_thread(google_cse_search, query)
+
+    await page.goto(search_url, wait_until='domcontentloaded', timeout=10000)
+    await accept_google_consent(page)
     try:
-        query = address
-        if city_name:
-            query += f", {city_name}"
-        
-        url = f"https://nominatim.openstreetmap.org/search?q={urllib.parse.quote(query)}&format=json&limit=1"
-        
-        req = urllib.request.Request(url, headers={'User-Agent': 'InvaderHunter/1.0'})
-        with urllib.request.urlopen(req, timeout=10) as response:
-            data = json.loads(response.read().decode())
-            if data:
-                return {
-                    'lat': float(data[0]['lat']),
-                    'lng': float(data[0]['lon']),
-                    'display_name': data[0].get('display_name', '')
-                }
-    except Exception as e:
-        pass
-    return None
+        await page.wait_for_selector(SERP_READY_SELECTOR, timeout=2500)
+    except Exception:
+        pass  # On analyse quand même ce qui est chargé
 
+    # Projection côté navigateur plutôt que page.content() (DOM complet)
+    html = await page.evaluate(SERP_PROJECTION_JS)
+    if not html:
+        html = await page.content()
+    if check_for_captcha(html):
+        audit['captcha_detected'] = True
+        source['error'] = 'CAPTCHA detected'
+        return None
+    return html
 
-async def geolocate_invader(page, invader_name, city_code, verbose=False):
-    """Recherche les coordonnées d'un invader via plusieurs sources"""
-    
-    # Structure d'audit pour cet invader
-    audit = {
-        'invader': invader_name,
-        'city_code': city_code,
-        'timestamp': datetime.now().isoformat(),
-        'sources_tried': [],
-        'addresses_found': [],
-        'coordinates_found': [],
-        'errors': [],
-        'captcha_detected': False,
-        'final_result': None
-    }
-    
-    # Mapping des codes ville vers noms complets
-    city_names = {
-        'PA': 'Paris', 'LY': 'Lyon', 'MARS': 'Marseille', 'TLS': 'Toulouse',
-        'BDX': 'Bordeaux', 'NTE': 'Nantes', 'LILE': 'Lille', 'STR': 'Strasbourg',
-        'LDN': 'London', 'NY': 'New York', 'LA': 'Los Angeles', 'TK': 'Tokyo',
-        'ROM': 'Rome', 'BCN': 'Barcelona', 'BKK': 'Bangkok', 'HK': 'Hong Kong',
-        'MIA': 'Miami', 'SD': 'San Diego', 'RAV': 'Ravenna', 'BIL': 'Bilbao',
-        'MTP': 'Montpellier', 'NICE': 'Nice', 'REIM': 'Reims', 'AMS': 'Amsterdam',
-        'VER': 'Versailles', 'CLER': 'Clermont-Ferrand', 'AVIGN': 'Avignon',
-    }
-    city_name = city_names.get(city_code, city_code)
-    audit['city_name'] = city_name
-    
-    results = []
-    
-    # Source 1: Atlas du Street Art (spécialisé invaders)
-    source1 = {'name': 'atlas-streetart', 'url': None, 'result': None, 'error': None}
+
+async def _source_atlas_streetart(page, invader_name, city_code, city_name, audit, geo_cache=None):
+    """Source 1: Atlas du Street Art (spécialisé invaders)"""
+    source = {'name': 'atlas-streetart', 'url': None, 'result': None, 'error': None}
     try:
-        search_url = f"https://www.google.com/search?q=site:atlas-streetart.com+{invader_name}"
-        source1['url'] = search_url
-        
-        await page.goto(search_url, timeout=10000)
-        await accept_google_consent(page)
-        await page.wait_for_timeout(1500)
-        
-        if await check_for_captcha(page):
-            audit['captcha_detected'] = True
-            source1['error'] = 'CAPTCHA detected'
-        else:
-            html = await page.content()
-            
-            # Chercher des coordonnées dans les snippets
-            coord_match = re.search(r'(\d{1,2}\.\d{4,})[°,\s]+(-?\d{1,3}\.\d{4,})', html)
-            if coord_match:
-                lat, lng = float(coord_match.group(1)), float(coord_match.group(2))
-                if 40 <= lat <= 60 and -10 <= lng <= 20:  # Plausible pour Europe
-                    result = {'lat': lat, 'lng': lng, 'source': 'atlas-streetart', 'confidence': 'medium'}
-                    results.append(result)
-                    source1['result'] = result
-                    audit['coordinates_found'].append({'source': 'atlas-streetart', 'lat': lat, 'lng': lng})
+        async with asyncio.timeout(SOURCE_TIMEOUT):
+            search_url = f"https://www.google.com/search?q=site:atlas-streetart.com+{invader_name}"
+            html = await _google_serp(page, search_url, source, audit)
+            if html is not None:
+                # Chercher des coordonnées dans les snippets
+                coord_match = _COORD_RE.search(html)
+                if coord_match:
+                    lat, lng = float(coord_match.group(1)), float(coord_match.group(2))
+                    if 40 <= lat <= 60 and -10 <= lng <= 20:  # Plausible pour Europe
+                        result = {'lat': lat, 'lng': lng, 'source': 'atlas-streetart', 'confidence': 'medium'}
+                        source['result'] = result
+                        audit['coordinates_found'].append({'source': 'atlas-streetart', 'lat': lat, 'lng': lng})
+    except TimeoutError:
+        source['error'] = 'timeout'
+        audit['errors'].append(f"{source['name']}: timeout")
     except Exception as e:
-        source1['error'] = str(e)
+        source['error'] = str(e)
         audit['errors'].append(f"atlas-streetart: {e}")
-    audit['sources_tried'].append(source1)
-    
-    # Source 2: Recherche Google avec nom ville pour trouver adresse
-    source2 = {'name': 'google_address_search', 'url': None, 'result': None, 'error': None}
-    try:
-        search_query = f"{invader_name} {city_name} street art adresse rue"
-        search_url = f"https://www.google.com/search?q={search_query.replace(' ', '+')}"
-        source2['url'] = search_url
-        
-        await page.goto(search_url, timeout=10000)
-        await accept_google_consent(page)
-        await page.wait_for_timeout(1500)
-        
-        if await check_for_captcha(page):
-            audit['captcha_detected'] = True
-            source2['error'] = 'CAPTCHA detected'
-        else:
-            html = await page.content()
-            
-            # Chercher des adresses françaises/internationales
-            address_patterns = [
-                r'(\d+[\s,]+(?:rue|avenue|boulevard|place|passage|impasse|quai|cours|allée)[^<,]{5,60})',
-                r'(\d+[\s,]+(?:street|road|avenue|lane|drive|way|place)[^<,]{5,60})',
-                r'(\d+[\s,]+(?:via|piazza|corso|viale)[^<,]{5,60})',
-                r'(\d+[\s,]+(?:calle|avenida|plaza|paseo)[^<,]{5,60})',
-            ]
-            
-            addresses_found = []
-            for pattern in address_patterns:
-                matches = re.findall(pattern, html, re.IGNORECASE)
-                for match in matches[:3]:
-                    address = match.strip()
-                    address = re.sub(r'<[^>]+>', '', address)  # Supprimer HTML
-                    address = re.sub(r'\s+', ' ', address)
-                    if len(address) > 10 and address not in addresses_found:
-                        addresses_found.append(address)
-                        audit['addresses_found'].append({'source': 'google', 'address': address})
-            
-            # Géocoder la première adresse valide
-            for address in addresses_found[:3]:
-                geo = await geocode_address(address, city_name)
-                if geo:
-                    result = {
-                        'lat': geo['lat'],
-                        'lng': geo['lng'],
-                        'address': address,
-                        'geocoded_address': geo.get('display_name', ''),
-                        'source': 'google+nominatim',
-                        'confidence': 'medium'
-                    }
-                    results.append(result)
-                    source2['result'] = result
-                    audit['coordinates_found'].append({
-                        'source': 'nominatim',
-                        'address': address,
-                        'lat': geo['lat'],
-                        'lng': geo['lng']
-                    })
-                    break
-                await page.wait_for_timeout(500)  # Respecter rate limit Nominatim
+    return source
+
+
+async def _source_google_address(page, invader_name, city_code, city_name, audit, geo_cache=None):
+    """Source 2: Recherche Google avec nom ville pour trouver adresse"""
+    source = {'name': 'google_address_search', 'url': None, 'result': None, 'error': None}
+    try:
+        async with asyncio.timeout(SOURCE_TIMEOUT):
+            search_query = f"{invader_name} {city_name} street art adresse rue"
+            search_url = f"https://www.google.com/search?q={search_query.replace(' ', '+')}"
+            html = await _google_serp(page, search_url, source, audit)
+            if html is not None:
+                addresses_found = []
+                # Chercher des adresses françaises/internationales
+                for pattern in _SERP_ADDRESS_RES:
+                    matches = pattern.findall(html)
+                    for match in matches[:3]:
+                        address = match.strip()
+                        address = _HTML_TAG_RE.sub('', address)  # Supprimer HTML
+                        address = _WS_RE.sub(' ', address)
+                        if len(address) > 10 and address not in addresses_found:
+                            addresses_found.append(address)
+                            audit['addresses_found'].append({'source': 'google', 'address': address})
+
+                # Géocoder la première adresse valide
+                for address in addresses_found[:3]:
+                    geo = await geocode_address(address, city_name, geo_cache)
+                    if geo:
+                        result = {
+                            'lat': geo['lat'],
+                            'lng': geo['lng'],
+                            'address': address,
+                            'geocoded_address': geo.get('display_name', ''),
+                            'source': 'google+nominatim',
+                            'confidence': 'medium'
+                        }
+                        source['result'] = result
+                        audit['coordinates_found'].append({
+                            'source': 'nominatim',
+                            'address': address,
+                            'lat': geo['lat'],
+                            'lng': geo['lng']
+                        })
+                        break
+    except TimeoutError:
+        source['error'] = 'timeout'
+        audit['errors'].append(f"{source['name']}: timeout")
     except Exception as e:
-        source2['error'] = str(e)
+        source['error'] = str(e)
         audit['errors'].append(f"google_address: {e}")
-    audit['sources_tried'].append(source2)
-    
-    # Source 3: FlashInvaders / blogs spécialisés
-    source3 = {'name': 'flashinvaders_blogs', 'url': None, 'result': None, 'error': None}
+    return source
+
+
+async def _source_flashinvaders(page, invader_name, city_code, city_name, audit, geo_cache=None):
+    """Source 3: FlashInvaders / blogs spécialisés"""
+    source = {'name': 'flashinvaders_blogs', 'url': None, 'result': None, 'error': None}
     try:
-        search_url = f"https://www.google.com/search?q={invader_name}+flashinvaders+OR+streetart+OR+space+invader+coordinates+OR+location"
-        source3['url'] = search_url
-        
-        await page.goto(search_url, timeout=10000)
-        await accept_google_consent(page)
-        await page.wait_for_timeout(1500)
-        
-        if await check_for_captcha(page):
-            audit['captcha_detected'] = True
-            source3['error'] = 'CAPTCHA detected'
-        else:
-            html = await page.content()
-            
-            # Coordonnées décimales directes
-            coord_matches = re.findall(r'(\d{1,2}\.\d{4,})[°,\s]+(-?\d{1,3}\.\d{4,})', html)
-            for match in coord_matches[:5]:
-                lat, lng = float(match[0]), float(match[1])
-                plausible = False
-                
-                # Vérifier plausibilité selon la ville
-                if city_code == 'PA' and 48.5 <= lat <= 49.2 and 1.5 <= lng <= 3.0:
-                    plausible = True
-                elif city_code == 'LDN' and 51.2 <= lat <= 51.8 and -0.6 <= lng <= 0.4:
-                    plausible = True
-                elif city_code == 'NY' and 40.4 <= lat <= 41.0 and -74.5 <= lng <= -73.5:
-                    plausible = True
-                elif -90 <= lat <= 90 and -180 <= lng <= 180:
-                    plausible = True
-                
-                if plausible:
-                    result = {'lat': lat, 'lng': lng, 'source': 'web_search', 'confidence': 'low'}
-                    results.append(result)
-                    source3['result'] = result
-                    audit['coordinates_found'].append({'source': 'web_search', 'lat': lat, 'lng': lng})
-                    break
+        async with asyncio.timeout(SOURCE_TIMEOUT):
+            search_url = f"https://www.google.com/search?q={invader_name}+flashinvaders+OR+streetart+OR+space+invader+coordinates+OR+location"
+            html = await _google_serp(page, search_url, source, audit)
+            if html is not None:
+                # Coordonnées décimales directes
+                coord_matches = _COORD_RE.findall(html)
+                for match in coord_matches[:5]:
+                    lat, lng = float(match[0]), float(match[1])
+                    plausible = False
+
+                    # Vérifier plausibilité selon la ville
+                    if city_code == 'PA' and 48.5 <= lat <= 49.2 and 1.5 <= lng <= 3.0:
+                        plausible = True
+                    elif city_code == 'LDN' and 51.2 <= lat <= 51.8 and -0.6 <= lng <= 0.4:
+                        plausible = True
+                    elif city_code == 'NY' and 40.4 <= lat <= 41.0 and -74.5 <= lng <= -73.5:
+                        plausible = True
+                    elif -90 <= lat <= 90 and -180 <= lng <= 180:
+                        plausible = True
+
+                    if plausible:
+                        result = {'lat': lat, 'lng': lng, 'source': 'web_search', 'confidence': 'low'}
+                        source['result'] = result
+                        audit['coordinates_found'].append({'source': 'web_search', 'lat': lat, 'lng': lng})
+                        break
+    except TimeoutError:
+        source['error'] = 'timeout'
+        audit['errors'].append(f"{source['name']}: timeout")
     except Exception as e:
-        source3['error'] = str(e)
+        source['error'] = str(e)
         audit['errors'].append(f"flashinvaders: {e}")
-    audit['sources_tried'].append(source3)
-    
-    # Source 4: Recherche de l'arrondissement/quartier pour Paris
-    source4 = {'name': 'arrondissement', 'url': None, 'result': None, 'error': None}
-    if city_code == 'PA':
-        try:
+    return source
+
+
+async def _source_arrondissement(page, invader_name, city_code, city_name, audit, geo_cache=None):
+    """Source 4: Recherche de l'arrondissement/quartier pour Paris"""
+    source = {'name': 'arrondissement', 'url': None, 'result': None, 'error': None}
+    try:
+        async with asyncio.timeout(SOURCE_TIMEOUT):
             search_url = f"https://www.google.com/search?q={invader_name}+paris+arrondissement+quartier"
-            source4['url'] = search_url
-            
-            await page.goto(search_url, timeout=10000)
-            await accept_google_consent(page)
-            await page.wait_for_timeout(1500)
-            
-            if await check_for_captcha(page):
-                audit['captcha_detected'] = True
-                source4['error'] = 'CAPTCHA detected'
-            else:
-                html = await page.content()
-                
+            html = await _google_serp(page, search_url, source, audit)
+            if html is not None:
                 # Chercher l'arrondissement
-                arr_patterns = [
-                    r'(\d{1,2})(?:e|ème|er|eme|è)\s*(?:arrondissement)?',
-                    r'(?:arrondissement|arr\.?)\s*(\d{1,2})',
-                    r'paris\s*(\d{1,2})(?:e|ème)?',
-                ]
-                
                 arr_found = None
-                for pattern in arr_patterns:
-                    arr_match = re.search(pattern, html, re.IGNORECASE)
+                for pattern in _PARIS_ARR_RES:
+                    arr_match = pattern.search(html)
                     if arr_match:
                         arr = int(arr_match.group(1))
                         if 1 <= arr <= 20:
                             arr_found = arr
                             break
-                
+
                 if arr_found:
                     audit['arrondissement'] = arr_found
-                    
-                    # Centres approximatifs des arrondissements de Paris
-                    arr_centers = {
-                        1: (48.8606, 2.3376), 2: (48.8683, 2.3441), 3: (48.8640, 2.3614),
-                        4: (48.8539, 2.3582), 5: (48.8462, 2.3472), 6: (48.8510, 2.3329),
-                        7: (48.8566, 2.3130), 8: (48.8744, 2.3106), 9: (48.8767, 2.3378),
-                        10: (48.8762, 2.3598), 11: (48.8597, 2.3793), 12: (48.8396, 2.3876),
-                        13: (48.8322, 2.3561), 14: (48.8331, 2.3264), 15: (48.8421, 2.2993),
-                        16: (48.8637, 2.2769), 17: (48.8867, 2.3166), 18: (48.8925, 2.3444),
-                        19: (48.8871, 2.3824), 20: (48.8638, 2.3986),
-                    }
-                    
-                    if arr_found in arr_centers:
-                        lat, lng = arr_centers[arr_found]
+
+                    if arr_found in PARIS_ARR_CENTERS:
+                        lat, lng = PARIS_ARR_CENTERS[arr_found]
                         result = {
                             'lat': lat, 'lng': lng,
                             'address': f"{arr_found}e arrondissement, Paris",
@@ -1186,292 +1425,458 @@ async def geolocate_invader(page, invader_name, city_code, verbose=False):
                             'confidence': 'very_low',
                             'arrondissement': arr_found
                         }
-                        results.append(result)
-                        source4['result'] = result
+                        source['result'] = result
                         audit['coordinates_found'].append({
                             'source': 'arrondissement',
                             'arrondissement': arr_found,
                             'lat': lat,
                             'lng': lng
                         })
-        except Exception as e:
-            source4['error'] = str(e)
-            audit['errors'].append(f"arrondissement: {e}")
-        audit['sources_tried'].append(source4)
-    
-    # Source 5: Street Art Cities (très bonne source avec coordonnées)
-    source5 = {'name': 'streetartcities', 'url': None, 'result': None, 'error': None}
+    except TimeoutError:
+        source['error'] = 'timeout'
+        audit['errors'].append(f"{source['name']}: timeout")
+    except Exception as e:
+        source['error'] = str(e)
+        audit['errors'].append(f"arrondissement: {e}")
+    return source
+
+
+async def _source_streetartcities(page, invader_name, city_code, city_name, audit, geo_cache=None):
+    """Source 5: Street Art Cities (très bonne source avec coordonnées)"""
+    source = {'name': 'streetartcities', 'url': None, 'result': None, 'error': None}
     try:
-        search_url = f"https://www.google.com/search?q=site:streetartcities.com+{invader_name}+OR+%22{invader_name.replace('_', '-')}%22"
-        source5['url'] = search_url
-        
-        await page.goto(search_url, timeout=10000)
-        await accept_google_consent(page)
-        await page.wait_for_timeout(1500)
-        
-        if await check_for_captcha(page):
-            audit['captcha_detected'] = True
-            source5['error'] = 'CAPTCHA detected'
-        else:
-            html = await page.content()
-            
-            # Chercher des coordonnées dans les snippets ou URLs
-            # streetartcities.com utilise des URLs avec coordonnées parfois
-            coord_patterns = [
-                r'(\d{1,2}\.\d{4,})[,\s°]+(-?\d{1,3}\.\d{4,})',
-                r'lat[=:]\s*(\d{1,2}\.\d+)[&,\s]+(?:lng|lon)[=:]\s*(-?\d{1,3}\.\d+)',
-            ]
-            
-            for pattern in coord_patterns:
-                matches = re.findall(pattern, html, re.IGNORECASE)
-                for match in matches[:3]:
-                    lat, lng = float(match[0]), float(match[1])
-                    if 40 <= lat <= 60 and -10 <= lng <= 20:  # Europe
-                        result = {'lat': lat, 'lng': lng, 'source': 'streetartcities', 'confidence': 'medium'}
-                        results.append(result)
-                        source5['result'] = result
-                        audit['coordinates_found'].append({'source': 'streetartcities', 'lat': lat, 'lng': lng})
+        async with asyncio.timeout(SOURCE_TIMEOUT):
+            search_url = f"https://www.google.com/search?q=site:streetartcities.com+{invader_name}+OR+%22{invader_name.replace('_', '-')}%22"
+            html = await _google_serp(page, search_url, source, audit)
+            if html is not None:
+                # Chercher des coordonnées dans les snippets ou URLs
+                # streetartcities.com utilise des URLs avec coordonnées parfois
+                for pattern in (_COORD_RE, _LATLNG_PARAM_RE):
+                    matches = pattern.findall(html)
+                    for match in matches[:3]:
+                        lat, lng = float(match[0]), float(match[1])
+                        if 40 <= lat <= 60 and -10 <= lng <= 20:  # Europe
+                            result = {'lat': lat, 'lng': lng, 'source': 'streetartcities', 'confidence': 'medium'}
+                            source['result'] = result
+                            audit['coordinates_found'].append({'source': 'streetartcities', 'lat': lat, 'lng': lng})
+                            break
+                    if source['result']:
                         break
-                if source5['result']:
-                    break
-            
-            # Chercher aussi des adresses
-            if not source5['result']:
-                address_match = re.search(r'(\d+[,\s]+(?:rue|avenue|boulevard|street|road)[^<,]{5,50})', html, re.IGNORECASE)
-                if address_match:
-                    address = re.sub(r'<[^>]+>', '', address_match.group(1)).strip()
-                    audit['addresses_found'].append({'source': 'streetartcities', 'address': address})
-                    geo = await geocode_address(address, city_name)
-                    if geo:
-                        result = {'lat': geo['lat'], 'lng': geo['lng'], 'address': address, 'source': 'streetartcities+nominatim', 'confidence': 'medium'}
-                        results.append(result)
-                        source5['result'] = result
+
+                # Chercher aussi des adresses
+                if not source['result']:
+                    address_match = _STREETARTCITIES_ADDRESS_RE.search(html)
+                    if address_match:
+                        address = _HTML_TAG_RE.sub('', address_match.group(1)).strip()
+                        audit['addresses_found'].append({'source': 'streetartcities', 'address': address})
+                        geo = await geocode_address(address, city_name, geo_cache)
+                        if geo:
+                            result = {'lat': geo['lat'], 'lng': geo['lng'], 'address': address, 'source': 'streetartcities+nominatim', 'confidence': 'medium'}
+                            source['result'] = result
+    except TimeoutError:
+        source['error'] = 'timeout'
+        audit['errors'].append(f"{source['name']}: timeout")
     except Exception as e:
-        source5['error'] = str(e)
+        source['error'] = str(e)
         audit['errors'].append(f"streetartcities: {e}")
-    audit['sources_tried'].append(source5)
-    
-    # Source 6: Flickr (photos avec géolocalisation EXIF)
-    source6 = {'name': 'flickr', 'url': None, 'result': None, 'error': None}
+    return source
+
+
+async def _source_flickr(page, invader_name, city_code, city_name, audit, geo_cache=None):
+    """Source 6: Flickr (photos avec géolocalisation EXIF)"""
+    source = {'name': 'flickr', 'url': None, 'result': None, 'error': None}
     try:
-        # Rechercher sur Flickr via Google
-        search_url = f"https://www.google.com/search?q=site:flickr.com+{invader_name}+invader+OR+space+invader"
-        source6['url'] = search_url
-        
-        await page.goto(search_url, timeout=10000)
-        await accept_google_consent(page)
-        await page.wait_for_timeout(1500)
-        
-        if await check_for_captcha(page):
-            audit['captcha_detected'] = True
-            source6['error'] = 'CAPTCHA detected'
-        else:
-            html = await page.content()
-            
-            # Flickr montre parfois les coordonnées dans les snippets
-            coord_match = re.search(r'(\d{1,2}\.\d{4,})[,\s°]+(-?\d{1,3}\.\d{4,})', html)
-            if coord_match:
-                lat, lng = float(coord_match.group(1)), float(coord_match.group(2))
-                if -90 <= lat <= 90 and -180 <= lng <= 180:
-                    result = {'lat': lat, 'lng': lng, 'source': 'flickr', 'confidence': 'medium'}
-                    results.append(result)
-                    source6['result'] = result
-                    audit['coordinates_found'].append({'source': 'flickr', 'lat': lat, 'lng': lng})
-            
-            # Essayer d'extraire un lien Flickr et le visiter directement
-            if not source6['result']:
-                flickr_links = re.findall(r'https://(?:www\.)?flickr\.com/photos/[^"\s<>]+', html)
-                for flickr_url in flickr_links[:2]:  # Max 2 liens
-                    try:
-                        await page.goto(flickr_url, timeout=10000)
-                        await page.wait_for_timeout(2000)
-                        flickr_html = await page.content()
-                        
-                        # Chercher les coordonnées dans la page Flickr
-                        # Flickr affiche souvent "Taken in [location]" ou des coords dans les métadonnées
-                        geo_patterns = [
-                            r'data-lat="(\d{1,2}\.\d+)"[^>]*data-lon="(-?\d{1,3}\.\d+)"',
-                            r'"latitude":(\d{1,2}\.\d+),"longitude":(-?\d{1,3}\.\d+)',
-                            r'geo:(\d{1,2}\.\d+),(-?\d{1,3}\.\d+)',
-                        ]
-                        
-                        for pattern in geo_patterns:
-                            match = re.search(pattern, flickr_html)
-                            if match:
-                                lat, lng = float(match.group(1)), float(match.group(2))
-                                if -90 <= lat <= 90 and -180 <= lng <= 180:
-                                    result = {'lat': lat, 'lng': lng, 'source': 'flickr_direct', 'confidence': 'high', 'flickr_url': flickr_url}
-                                    results.append(result)
-                                    source6['result'] = result
-                                    audit['coordinates_found'].append({'source': 'flickr_direct', 'lat': lat, 'lng': lng, 'url': flickr_url})
-                                    break
-                        if source6['result']:
-                            break
-                    except:
-                        continue
+        async with asyncio.timeout(SOURCE_TIMEOUT):
+            # Rechercher sur Flickr via Google
+            search_url = f"https://www.google.com/search?q=site:flickr.com+{invader_name}+invader+OR+space+invader"
+            html = await _google_serp(page, search_url, source, audit)
+            if html is not None:
+                # Flickr montre parfois les coordonnées dans les snippets
+                coord_match = _COORD_RE.search(html)
+                if coord_match:
+                    lat, lng = float(coord_match.group(1)), float(coord_match.group(2))
+                    if -90 <= lat <= 90 and -180 <= lng <= 180:
+                        result = {'lat': lat, 'lng': lng, 'source': 'flickr', 'confidence': 'medium'}
+                        source['result'] = result
+                        audit['coordinates_found'].append({'source': 'flickr', 'lat': lat, 'lng': lng})
+
+                # Essayer d'extraire un lien Flickr et le visiter directement
+                if not source['result']:
+                    flickr_links = _FLICKR_LINK_RE.findall(html)
+                    for flickr_url in flickr_links[:2]:  # Max 2 liens
+                        try:
+                            await page.goto(flickr_url, timeout=10000)
+                            await page.wait_for_timeout(2000)
+                            flickr_html = await page.content()
+
+                            # Chercher les coordonnées dans la page Flickr
+                            # Flickr affiche souvent "Taken in [location]" ou des coords dans les métadonnées
+                            for pattern in _FLICKR_GEO_RES:
+                                match = pattern.search(flickr_html)
+                                if match:
+                                    lat, lng = float(match.group(1)), float(match.group(2))
+                                    if -90 <= lat <= 90 and -180 <= lng <= 180:
+                                        result = {'lat': lat, 'lng': lng, 'source': 'flickr_direct', 'confidence': 'high', 'flickr_url': flickr_url}
+                                        source['result'] = result
+                                        audit['coordinates_found'].append({'source': 'flickr_direct', 'lat': lat, 'lng': lng, 'url': flickr_url})
+                                        break
+                            if source['result']:
+                                break
+                        except Exception:
+                            continue
+    except TimeoutError:
+        source['error'] = 'timeout'
+        audit['errors'].append(f"{source['name']}: timeout")
     except Exception as e:
-        source6['error'] = str(e)
+        source['error'] = str(e)
         audit['errors'].append(f"flickr: {e}")
-    audit['sources_tried'].append(source6)
-    
-    # Source 7: Illuminate Art Official
-    source7 = {'name': 'illuminateart', 'url': None, 'result': None, 'error': None}
+    return source
+
+
+async def _source_illuminateart(page, invader_name, city_code, city_name, audit, geo_cache=None):
+    """Source 7: Illuminate Art Official"""
+    source = {'name': 'illuminateart', 'url': None, 'result': None, 'error': None}
     try:
-        search_url = f"https://www.google.com/search?q=site:illuminateartofficial.com+{invader_name}"
-        source7['url'] = search_url
-        
-        await page.goto(search_url, timeout=10000)
-        await accept_google_consent(page)
-        await page.wait_for_timeout(1500)
-        
-        if await check_for_captcha(page):
-            audit['captcha_detected'] = True
-            source7['error'] = 'CAPTCHA detected'
-        else:
-            html = await page.content()
-            
-            # Chercher des coordonnées ou adresses
-            coord_match = re.search(r'(\d{1,2}\.\d{4,})[,\s°]+(-?\d{1,3}\.\d{4,})', html)
-            if coord_match:
-                lat, lng = float(coord_match.group(1)), float(coord_match.group(2))
-                if -90 <= lat <= 90 and -180 <= lng <= 180:
-                    result = {'lat': lat, 'lng': lng, 'source': 'illuminateart', 'confidence': 'medium'}
-                    results.append(result)
-                    source7['result'] = result
-                    audit['coordinates_found'].append({'source': 'illuminateart', 'lat': lat, 'lng': lng})
-            
-            # Chercher des liens vers le site et les visiter
-            if not source7['result']:
-                illuminate_links = re.findall(r'https://illuminateartofficial\.com/[^"\s<>]+invader[^"\s<>]*', html, re.IGNORECASE)
-                for link in illuminate_links[:1]:
-                    try:
-                        await page.goto(link, timeout=10000)
-                        await page.wait_for_timeout(2000)
-                        page_html = await page.content()
-                        
-                        # Chercher coordonnées ou adresses dans la page
-                        geo_match = re.search(r'(\d{1,2}\.\d{4,})[,\s]+(-?\d{1,3}\.\d{4,})', page_html)
-                        if geo_match:
-                            lat, lng = float(geo_match.group(1)), float(geo_match.group(2))
-                            result = {'lat': lat, 'lng': lng, 'source': 'illuminateart_direct', 'confidence': 'medium'}
-                            results.append(result)
-                            source7['result'] = result
-                            audit['coordinates_found'].append({'source': 'illuminateart_direct', 'lat': lat, 'lng': lng})
-                        
-                        # Chercher adresse
-                        if not source7['result']:
-                            addr_match = re.search(r'(\d+[,\s]+(?:rue|avenue|boulevard|street)[^<,]{5,50})', page_html, re.IGNORECASE)
-                            if addr_match:
-                                address = re.sub(r'<[^>]+>', '', addr_match.group(1)).strip()
-                                audit['addresses_found'].append({'source': 'illuminateart', 'address': address})
-                                geo = await geocode_address(address, city_name)
-                                if geo:
-                                    result = {'lat': geo['lat'], 'lng': geo['lng'], 'address': address, 'source': 'illuminateart+nominatim', 'confidence': 'medium'}
-                                    results.append(result)
-                                    source7['result'] = result
-                    except:
-                        continue
+        async with asyncio.timeout(SOURCE_TIMEOUT):
+            search_url = f"https://www.google.com/search?q=site:illuminateartofficial.com+{invader_name}"
+            html = await _google_serp(page, search_url, source, audit)
+            if html is not None:
+                # Chercher des coordonnées ou adresses
+                coord_match = _COORD_RE.search(html)
+                if coord_match:
+                    lat, lng = float(coord_match.group(1)), float(coord_match.group(2))
+                    if -90 <= lat <= 90 and -180 <= lng <= 180:
+                        result = {'lat': lat, 'lng': lng, 'source': 'illuminateart', 'confidence': 'medium'}
+                        source['result'] = result
+                        audit['coordinates_found'].append({'source': 'illuminateart', 'lat': lat, 'lng': lng})
+
+                # Chercher des liens vers le site et les visiter
+                if not source['result']:
+                    illuminate_links = _ILLUMINATE_LINK_RE.findall(html)
+                    for link in illuminate_links[:1]:
+                        try:
+                            await page.goto(link, timeout=10000)
+                            await page.wait_for_timeout(2000)
+                            page_html = await page.content()
+
+                            # Chercher coordonnées ou adresses dans la page
+                            geo_match = _PAGE_COORD_RE.search(page_html)
+                            if geo_match:
+                                lat, lng = float(geo_match.group(1)), float(geo_match.group(2))
+                                result = {'lat': lat, 'lng': lng, 'source': 'illuminateart_direct', 'confidence': 'medium'}
+                                source['result'] = result
+                                audit['coordinates_found'].append({'source': 'illuminateart_direct', 'lat': lat, 'lng': lng})
+
+                            # Chercher adresse
+                            if not source['result']:
+                                addr_match = _ILLUMINATE_ADDRESS_RE.search(page_html)
+                                if addr_match:
+                                    address = _HTML_TAG_RE.sub('', addr_match.group(1)).strip()
+                                    audit['addresses_found'].append({'source': 'illuminateart', 'address': address})
+                                    geo = await geocode_address(address, city_name, geo_cache)
+                                    if geo:
+                                        result = {'lat': geo['lat'], 'lng': geo['lng'], 'address': address, 'source': 'illuminateart+nominatim', 'confidence': 'medium'}
+                                        source['result'] = result
+                        except Exception:
+                            continue
+    except TimeoutError:
+        source['error'] = 'timeout'
+        audit['errors'].append(f"{source['name']}: timeout")
     except Exception as e:
-        source7['error'] = str(e)
+        source['error'] = str(e)
         audit['errors'].append(f"illuminateart: {e}")
-    audit['sources_tried'].append(source7)
-    
-    # Retourner le meilleur résultat
+    return source
+
+
+# Sources de géolocalisation, dans l'ordre de lancement: Flickr (seule source
+# 'high') et Street Art Cities d'abord, l'arrondissement (centre approximatif,
+# Paris seulement) en dernier. Ordre aussi utilisé pour l'audit et à confiance égale.
+SOURCE_LAUNCH_ORDER = (
+    _source_flickr, _source_streetartcities, _source_atlas_streetart,
+    _source_google_address, _source_illuminateart, _source_flashinvaders,
+    _source_arrondissement,
+)
+
+# Rang de confiance des résultats (0 = meilleur)
+CONFIDENCE_RANK = {'high': 0, 'medium': 1, 'low': 2, 'very_low': 3}
+
+# Deux résultats 'medium' à moins de cette distance (m) suffisent à conclure
+AGREEMENT_RADIUS_M = 100
+
+
+def _results_sufficient(results):
+    """Vrai si un résultat 'high' ou deux résultats 'medium' concordants sont trouvés"""
+    if any(r.get('confidence') == 'high' for r in results):
+        return True
+    medium = [r for r in results if r.get('confidence') == 'medium']
+    return any(
+        calculate_distance(a['lat'], a['lng'], b['lat'], b['lng']) <= AGREEMENT_RADIUS_M
+        for i, a in enumerate(medium) for b in medium[i + 1:]
+    )
+
+
+async def geolocate_invader(pages, invader_name, city_code, verbose=False, geo_cache=None):
+    """Recherche les coordonnées d'un invader via plusieurs sources
+
+    Les sources tournent en parallèle, au plus une par onglet de `pages`.
+    Dès qu'un résultat 'high' ou deux résultats 'medium' concordants sont
+    trouvés, les sources restantes sont annulées. geo_cache: cache de géocodage partagé (voir geocode_address).
+    """
+
+    # Structure d'audit pour cet invader
+    audit = {
+        'invader': invader_name,
+        'city_code': city_code,
+        'timestamp': datetime.now().isoformat(),
+        'sources_tried': [],
+        'addresses_found': [],
+        'coordinates_found': [],
+        'errors': [],
+        'captcha_detected': False,
+        'final_result': None
+    }
+
+    city_name = SEARCH_CITY_NAMES.get(city_code, city_code)
+    audit['city_name'] = city_name
+
+    source_fns = [fn for fn in SOURCE_LAUNCH_ORDER if fn is not _source_arrondissement or city_code == 'PA']
+
+    # Pool d'onglets: chaque source en emprunte un le temps de sa recherche
+    free_pages = asyncio.Queue()
+    for page in pages:
+        free_pages.put_nowait(page)
+
+    async def run_source(source_fn):
+        page = await free_pages.get()
+        try:
+            return await source_fn(page, invader_name, city_code, city_name, audit, geo_cache)
+        finally:
+            free_pages.put_nowait(page)
+
+    # Les sources les plus fiables obtiennent un onglet en premier
+    async with asyncio.TaskGroup() as tg:
+        tasks = {fn: tg.create_task(run_source(fn)) for fn in source_fns}
+        pending = set(tasks.values())
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            found = [t.result()['result'] for t in tasks.values() if t.done() and t.result()['result']]
+            if _results_sufficient(found):
+                for t in pending:
+                    t.cancel()
+                break
+
+    # Garder l'ordre des sources (et non l'ordre d'arrivée) pour l'audit et le tri
+    audit['sources_tried'] = [tasks[fn].result() for fn in source_fns if not tasks[fn].cancelled()]
+    results = [s['result'] for s in audit['sources_tried'] if s['result']]
+
+    # Retourner le meilleur résultat (à confiance égale, la première source)
     if results:
-        # Trier par confiance
-        confidence_order = {'high': 0, 'medium': 1, 'low': 2, 'very_low': 3}
-        results.sort(key=lambda x: confidence_order.get(x.get('confidence', 'low'), 2))
-        audit['final_result'] = results[0]
+        best = min(results, key=lambda x: CONFIDENCE_RANK.get(x.get('confidence', 'low'), 2))
+        audit['final_result'] = best
         audit['all_results'] = results
-        return results[0], audit
-    
+        return best, audit
+
     audit['final_result'] = None
     return None, audit
 
 
-async def geolocate_missing_invaders(not_in_github, headless=True, verbose=False, max_count=50):
-    """Géolocalise les invaders manquants via recherche web"""
+async def new_geolocate_context(browser):
+    """Contexte navigateur de géolocalisation, avec les cookies Google enregistrés"""
+    user_agent = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
+    if GOOGLE_STATE_FILE.exists():
+        try:
+            # Le bandeau reste recherché: si les cookies ont expiré, il réapparaît,
+            # sinon GOOGLE_CONSENT_MAX_MISSES pages sans bandeau arrêtent la recherche
+            return await browser.new_context(user_agent=user_agent, storage_state=_p(GOOGLE_STATE_FILE))
+        except Exception as e:
+            print(f"   ⚠️ {GOOGLE_STATE_FILE.name} illisible, ignoré: {e}")
+    return await browser.new_context(user_agent=user_agent)
+
+
+async def geolocate_missing_invaders(not_in_github, headless=True, verbose=False, max_count=50, use_cache=True):
+    """Géolocalise les invaders manquants via recherche web
+
+    GEOLOCATE_WORKERS workers se partagent la file d'invaders, chacun avec
+    son propre contexte navigateur (cookies et CAPTCHA isolés).
+    use_cache: réutilise/complète data/geocode_cache.json pour Nominatim.
+    """
     if not not_in_github:
         return [], []
     
-    print(f"\n🔍 Géolocalisation de {min(len(not_in_github), max_count)} invaders...")
+    to_process = not_in_github[:max_count]
+    total = len(to_process)
+    print(f"\n🔍 Géolocalisation de {total} invaders...")
     
     from playwright.async_api import async_playwright
     
-    geolocated = []
-    all_audits = []
+    # Résultats rangés par position pour garder l'ordre d'entrée
+    geolocated_at = [None] * total
+    audits_at = [None] * total
     captcha_count = 0
+    too_many_captchas = asyncio.Event()
+    geo_cache = load_geocode_cache() if use_cache else None
+    
+    queue = asyncio.Queue()
+    for item in enumerate(to_process):
+        queue.put_nowait(item)
+    
+    async def worker(browser):
+        nonlocal captcha_count
+        context = await new_geolocate_context(browser)
+        await context.route("**/*", _block_heavy_resources)
+        pages = [await context.new_page() for _ in range(GEOLOCATE_PAGES)]
+        page = pages[0]
+        try:
+            while not too_many_captchas.is_set():
+                try:
+                    i, inv = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                
+                name = inv.get('name', '')
+                city = inv.get('city', '')
+                
+                result, audit = await geolocate_invader(pages, name, city, verbose, geo_cache)
+                
+                # Ajouter les infos de l'invader à l'audit
+                audit['image_invader'] = inv.get('image_invader')
+                audit['image_lieu'] = inv.get('image_lieu')
+                audit['status'] = inv.get('status', 'OK')
+                audit['points'] = inv.get('points', 0)
+                audits_at[i] = audit
+                
+                if audit.get('captcha_detected'):
+                    captcha_count += 1
+                
+                if result:
+                    inv_copy = inv.copy()
+                    inv_copy.update(result)
+                    geolocated_at[i] = inv_copy
+                    if verbose:
+                        confidence = result.get('confidence', '?')
+                        if result.get('lat'):
+                            outcome = f"✓ ({result['lat']:.4f}, {result['lng']:.4f}) [{confidence}]"
+                        elif result.get('address'):
+                            outcome = f"✓ {result['address'][:30]}... [{confidence}]"
+                        else:
+                            outcome = f"✓ [{confidence}]"
+                elif verbose:
+                    outcome = "⚠️ CAPTCHA" if audit.get('captcha_detected') else "○"
+                
+                if verbose:
+                    print(f"   [{i+1}/{total}] {name}... {outcome}")
+                
+                # Si trop de CAPTCHAs, arrêter tous les workers
+                if captcha_count >= 5 and not too_many_captchas.is_set():
+                    print(f"\n   ⚠️ Trop de CAPTCHAs détectés ({captcha_count}), arrêt de la géolocalisation")
+                    too_many_captchas.set()
+                    break
+                
+                # Pause plus longue si CAPTCHA détecté
+                if audit.get('captcha_detected'):
+                    await page.wait_for_timeout(5000)
+                else:
+                    await page.wait_for_timeout(1500)
+        finally:
+            await context.close()
     
     async with async_playwright() as p:
         browser = await p.chromium.launch(headless=headless)
-        context = await browser.new_context(user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36')
-        page = await context.new_page()
-        
-        for i, inv in enumerate(not_in_github[:max_count]):
-            name = inv.get('name', '')
-            city = inv.get('city', '')
-            
-            if verbose:
-                print(f"   [{i+1}/{min(len(not_in_github), max_count)}] {name}...", end='', flush=True)
-            
-            result, audit = await geolocate_invader(page, name, city, verbose)
-            
-            # Ajouter les infos de l'invader à l'audit
-            audit['image_invader'] = inv.get('image_invader')
-            audit['image_lieu'] = inv.get('image_lieu')
-            audit['status'] = inv.get('status', 'OK')
-            audit['points'] = inv.get('points', 0)
-            all_audits.append(audit)
-            
-            if audit.get('captcha_detected'):
-                captcha_count += 1
-            
-            if result:
-                inv_copy = inv.copy()
-                inv_copy.update(result)
-                geolocated.append(inv_copy)
-                if verbose:
-                    confidence = result.get('confidence', '?')
-                    if result.get('lat'):
-                        print(f" ✓ ({result['lat']:.4f}, {result['lng']:.4f}) [{confidence}]")
-                    elif result.get('address'):
-                        print(f" ✓ {result['address'][:30]}... [{confidence}]")
-                    else:
-                        print(f" ✓ [{confidence}]")
-            else:
-                if verbose:
-                    if audit.get('captcha_detected'):
-                        print(" ⚠️ CAPTCHA")
-                    else:
-                        print(" ○")
-            
-            # Pause plus longue si CAPTCHA détecté
-            if audit.get('captcha_detected'):
-                await page.wait_for_timeout(5000)
-            else:
-                await page.wait_for_timeout(1500)
-            
-            # Si trop de CAPTCHAs, arrêter
-            if captcha_count >= 5:
-                print(f"\n   ⚠️ Trop de CAPTCHAs détectés ({captcha_count}), arrêt de la géolocalisation")
-                break
-        
+        await asyncio.gather(*(worker(browser) for _ in range(min(GEOLOCATE_WORKERS, total))))
         await browser.close()
     
-    print(f"   ✅ {len(geolocated)}/{min(len(not_in_github), max_count)} géolocalisés")
+    if geo_cache is not None:
+        save_geocode_cache(geo_cache)
+    
+    geolocated = [inv for inv in geolocated_at if inv is not None]
+    all_audits = [audit for audit in audits_at if audit is not None]
+    
+    print(f"   ✅ {len(geolocated)}/{total} géolocalisés")
     if captcha_count > 0:
         print(f"   ⚠️ {captcha_count} CAPTCHAs rencontrés")
     
     return geolocated, all_audits
-    
-    print(f"   ✅ {len(geolocated)}/{min(len(not_in_github), max_count)} géolocalisés")
-    return geolocated
 
 
 # ============================================================================
 # SCRAPING PLAYWRIGHT (logique éprouvée)
 # ============================================================================
 
+# Recherche du lien de la ville dans villes.php, en un seul aller-retour :
+# mêmes paliers que les sélecteurs Playwright (href javascript:envoi, puis
+# onclick envoi, puis texte exact du lien). Retourne l'index du lien parmi
+# tous les <a> de la page (-1 si absent) et les hrefs envoi pour le debug.
+CITY_LINK_JS = """([code, name]) => {
+    const needles = ['"' + code.toUpperCase() + '"', "'" + code.toUpperCase() + "'"];
+    const hasCode = value => value && needles.some(n => value.toUpperCase().includes(n));
+    const anchors = Array.from(document.querySelectorAll('a'));
+    const hrefs = anchors.map(a => a.getAttribute('href') || '');
+    let index = anchors.findIndex((a, i) => hrefs[i].startsWith('javascript:envoi') && hasCode(hrefs[i]));
+    if (index < 0) {
+        index = anchors.findIndex(a => {
+            const onclick = a.getAttribute('onclick') || '';
+            return onclick.includes('envoi') && hasCode(onclick);
+        });
+    }
+    if (index < 0) {
+        index = anchors.findIndex(a => a.textContent.replace(/\\s+/g, ' ').trim() === name);
+    }
+    return {index, hrefs: index < 0 ? hrefs.filter(h => h.startsWith('javascript:envoi')) : []};
+}"""
+
+
+def _changepage_template(request, page_num):
+    """Gabarit de rejeu HTTP de la requête émise par changepage(page_num), ou None.
+
+    Le numéro de page doit être porté par un seul paramètre, d'un formulaire
+    POST urlencodé ou de la query string d'un GET.
+    """
+    if request is None:
+        return None
+    if request.method == 'POST':
+        content_type = request.headers.get('content-type', '')
+        if not content_type.startswith('application/x-www-form-urlencoded'):
+            return None
+        url = request.url
+        fields = parse_qsl(request.post_data or '', keep_blank_values=True)
+    else:
+        parts = urlsplit(request.url)
+        url = parts._replace(query='').geturl()
+        fields = parse_qsl(parts.query, keep_blank_values=True)
+    
+    page_keys = [key for key, value in fields if value == str(page_num)]
+    if len(page_keys) != 1 or len(dict(fields)) != len(fields):
+        return None
+    return {'method': request.method, 'url': url, 'fields': dict(fields), 'page_key': page_keys[0]}
+
+
+async def _fetch_changepage(page, template, page_num):
+    """Rejoue changepage(page_num) sans navigation (cookies du contexte), retourne le HTML"""
+    fields = {**template['fields'], template['page_key']: str(page_num)}
+    payload = {'form': fields} if template['method'] == 'POST' else {'params': fields}
+    response = await page.context.request.fetch(template['url'], method=template['method'], **payload)
+    if not response.ok:
+        return None
+    return await response.text()
+
+
+async def _learn_changepage_replay(page, request, page_num, html_content, city_code):
+    """Gabarit de rejeu de changepage, gardé seulement s'il redonne exactement
+    les invaders de la page obtenue par navigation"""
+    template = _changepage_template(request, page_num)
+    if not template:
+        return None
+    try:
+        replayed = await _fetch_changepage(page, template, page_num)
+    except Exception:
+        return None
+    if not replayed:
+        return None
+    if extract_statuses_from_html(replayed, city_code) != extract_statuses_from_html(html_content, city_code):
+        return None
+    return template
+
+
 async def scrape_city_playwright(page, city_code, verbose=False, max_retries=3):
     """Scrape une ville - logique de update_invaders_playwright.py"""
     statuses = {}
@@ -1481,49 +1886,29 @@ async def scrape_city_playwright(page, city_code, verbose=False, max_retries=3):
             if verbose:
                 print(f"\n      Tentative {attempt + 1} pour {city_code}...")
             
-            # Aller sur villes.php
-            await page.goto(f"{INVADER_SPOTTER_BASE}/villes.php", wait_until='networkidle', timeout=30000)
-            await page.wait_for_timeout(1000)
+            # Aller sur villes.php : la liste des villes est dans le HTML initial,
+            # inutile d'attendre la fin du trafic réseau
+            await page.goto(f"{INVADER_SPOTTER_BASE}/villes.php", wait_until='domcontentloaded', timeout=30000)
+            # Attendre les liens envoi (href ou onclick); sans eux, la recherche
+            # par texte du lien est quand même tentée
+            try:
+                await page.wait_for_selector('a[href^="javascript:envoi"], a[onclick*="envoi"]', timeout=10000)
+            except Exception:
+                pass
             
-            # Trouver et cliquer sur le lien de la ville
-            # Pattern 1: a[href^="javascript:envoi"]
-            links = await page.query_selector_all('a[href^="javascript:envoi"]')
+            # Trouver et cliquer sur le lien de la ville (sélection faite dans la page)
+            city_name = CITY_NAMES.get(city_code, city_code)
+            found = await page.evaluate(CITY_LINK_JS, [city_code, city_name])
             link = None
-            for l in links:
-                href = await l.get_attribute('href')
-                if href:
-                    href_upper = href.upper()
-                    # Chercher le code en majuscules ou minuscules
-                    if f'"{city_code.upper()}"' in href_upper or f"'{city_code.upper()}'" in href_upper:
-                        link = l
-                        break
-            
-            # Pattern 2: a[onclick*="envoi"] si le premier n'a pas marché
-            if not link:
-                onclick_links = await page.query_selector_all('a[onclick*="envoi"]')
-                for l in onclick_links:
-                    onclick = await l.get_attribute('onclick')
-                    if onclick:
-                        onclick_upper = onclick.upper()
-                        if f'"{city_code.upper()}"' in onclick_upper or f"'{city_code.upper()}'" in onclick_upper:
-                            link = l
-                            break
-            
-            # Pattern 3: Chercher par texte du lien (nom de la ville)
-            if not link:
-                city_name = CITY_NAMES.get(city_code, city_code)
-                try:
-                    link = await page.query_selector(f'a:text-is("{city_name}")')
-                except:
-                    pass
+            if found['index'] >= 0:
+                link = await page.query_selector(f"a >> nth={found['index']}")
             
             if not link:
                 if verbose:
                     print(f"      ⚠️ Lien non trouvé pour {city_code}")
                     # Afficher les codes disponibles pour debug
                     available_codes = []
-                    for l in links:
-                        href = await l.get_attribute('href')
+                    for href in found['hrefs']:
                         if href:
                             match = re.search(r'envoi\([\'"]([^"\']+)[\'"]\)', href)
                             if match:
@@ -1532,14 +1917,14 @@ async def scrape_city_playwright(page, city_code, verbose=False, max_retries=3):
                         print(f"         Codes disponibles: {available_codes[:20]}...")
                 return statuses
             
-            # Cliquer et attendre
+            # Cliquer et attendre que les invaders de la ville soient dans la page
+            invader_selector = f'b:has-text("{city_code}")'
             try:
-                async with page.expect_navigation(wait_until='load', timeout=15000):
+                async with page.expect_navigation(wait_until='domcontentloaded', timeout=15000):
                     await link.click()
-                await page.wait_for_load_state('networkidle')
+                await page.wait_for_selector(invader_selector, timeout=15000)
             except:
                 await page.wait_for_timeout(3000)
-            await page.wait_for_timeout(1000)
             
             # Récupérer le HTML
             html_content = None
@@ -1574,12 +1959,26 @@ async def scrape_city_playwright(page, city_code, verbose=False, max_retries=3):
                 total_str = total_match.group(2) if total_match else '?'
                 print(f"      {total_str} invaders sur {max_page} pages")
             
-            # Parcourir les pages
+            # Parcourir les pages. La requête HTTP de changepage(2) est apprise
+            # puis rejouée directement pour les pages suivantes (sans navigation),
+            # avec retour à la navigation si le rejeu ne donne rien
+            replay = None
+            replay_checked = False
             for page_num in range(1, max_page + 1):
                 if page_num > 1:
                     success = False
+                    nav_response = None
+                    
+                    if replay:
+                        try:
+                            html_content = await _fetch_changepage(page, replay, page_num)
+                            if html_content and extract_statuses_from_html(html_content, city_code):
+                                success = True
+                        except Exception as e:
+                            if verbose:
+                                print(f"      ⚠️ Rejeu page {page_num}: {str(e)[:60]}")
                     
-                    for nav_attempt in range(3):
+                    for nav_attempt in range(0 if success else 3):
                         try:
                             # Attendre que la page soit stable avant de naviguer
                             await page.wait_for_load_state('domcontentloaded', timeout=5000)
@@ -1588,12 +1987,12 @@ async def scrape_city_playwright(page, city_code, verbose=False, max_retries=3):
                         
                         try:
                             # Déclencher la navigation et attendre qu'elle se termine
-                            async with page.expect_navigation(timeout=30000, wait_until='domcontentloaded'):
+                            async with page.expect_navigation(timeout=30000, wait_until='domcontentloaded') as nav_info:
                                 await page.evaluate(f'changepage({page_num})')
+                            nav_response = await nav_info.value
                             
-                            # Attendre que la page soit complètement chargée
-                            await page.wait_for_load_state('load', timeout=15000)
-                            await page.wait_for_timeout(1000)
+                            # Attendre que les invaders de la nouvelle page soient présents
+                            await page.wait_for_selector(invader_selector, timeout=15000)
                             
                             html_content = await page.content()
                             test_statuses = extract_statuses_from_html(html_content, city_code)
@@ -1623,6 +2022,12 @@ async def scrape_city_playwright(page, city_code, verbose=False, max_retries=3):
                         if verbose:
                             print(f"      ⚠️ Skip page {page_num}")
                         continue
+                    
+                    if not replay_checked and nav_response:
+                        replay_checked = True
+                        replay = await _learn_changepage_replay(page, nav_response.request, page_num, html_content, city_code)
+                        if verbose and replay:
+                            print(f"      Pages suivantes rejouées en HTTP ({replay['method']} {replay['url']})")
                 
                 page_statuses = extract_statuses_from_html(html_content, city_code)
                 
@@ -1649,6 +2054,29 @@ async def scrape_city_playwright(page, city_code, verbose=False, max_retries=3):
     return statuses
 
 
+# Regex d'extraction indépendantes de la ville, compilées une seule fois
+_INVADER_NAME_RE = re.compile(r'([A-Z]+)[-_]?(\d+)')
+_LANDING_RE = re.compile(r'(?:Landed\s+on|Date\s+de\s+pose)\s*:\s*(\d{1,2}/\d{1,2}/\d{4})', re.IGNORECASE)
+_LAST_STATE_RE = re.compile(r'(?:Last\s+known\s+state|Dernier\s+[ée]tat\s+connu)\s*:\s*(.+?)(?=Date|Instagram|$)', re.IGNORECASE)
+_DATE_SOURCE_RE = re.compile(r'Date\s+(?:and|et)\s+source\s*:\s*([^\n<(]+)(?:\s*\(([^)]+)\))?', re.IGNORECASE)
+
+CityPatterns = namedtuple('CityPatterns', ['invader', 'next_invader', 'link'])
+
+
+@lru_cache(maxsize=256)
+def _city_patterns(city_code):
+    """Regex d'extraction propres à une ville, compilées une fois par ville."""
+    return CityPatterns(
+        invader=re.compile(rf'<b>\s*({city_code}[-_]?\d+)\s*\[(\d+|\?\?)\s*pts?\]</b>', re.IGNORECASE),
+        next_invader=re.compile(rf'{city_code}[-_]?\d+\s*\[', re.IGNORECASE),
+        # Contenu du lien borné au </a> : pas de backtracking d'un <a> à l'autre
+        link=re.compile(
+            rf'<a[^>]*>(?:(?!</a>).)*?({city_code}[-_]?\d+)\s*\[(\d+|\?\?)\s*pts?\](?:(?!</a>).)*</a>',
+            re.IGNORECASE | re.DOTALL
+        ),
+    )
+
+
 def extract_statuses_from_html(html_content, city_code):
     """
     Extrait les invaders et statuts depuis le HTML.
@@ -1666,6 +2094,12 @@ def extract_statuses_from_html(html_content, city_code):
         Instagram: hashtag #WN_01
     """
     statuses = {}
+    pats = _city_patterns(city_code)
+    
+    # Débuts de tous les noms d'invaders de la page, repérés en une seule passe :
+    # le contexte de chaque invader s'arrête au premier d'entre eux situé
+    # au moins 50 caractères après lui (pour ne pas se re-matcher)
+    boundaries = [m.start() for m in pats.next_invader.finditer(html_content)]
     
     # Le format réel est :
     # <b>PA_01 [10 pts]</b> ... <img src='nav/spot_invader_destroyed.png'> ...
@@ -1674,13 +2108,11 @@ def extract_statuses_from_html(html_content, city_code):
     
     # Pattern pour trouver les blocs d'invaders (dans <td> ou sections)
     # Cherche le nom en bold : <b>PA_01 [10 pts]</b>
-    invader_pattern = rf'<b>\s*({city_code}[-_]?\d+)\s*\[(\d+|\?\?)\s*pts?\]</b>'
-    
-    for match in re.finditer(invader_pattern, html_content, re.IGNORECASE):
+    for match in pats.invader.finditer(html_content):
         inv_name_raw = match.group(1).upper().replace('-', '_')
         points_raw = match.group(2)
         
-        name_match = re.match(r'([A-Z]+)[-_]?(\d+)', inv_name_raw)
+        name_match = _INVADER_NAME_RE.match(inv_name_raw)
         if name_match:
             prefix, num = name_match.groups()
             inv_name = f"{prefix}_{num}"
@@ -1697,17 +2129,15 @@ def extract_statuses_from_html(html_content, city_code):
         # Cela évite de capturer les informations d'un autre invader par erreur
         match_pos = match.start()
         
-        # Chercher la position du prochain invader après celui-ci (avec un offset de 50 pour éviter de se re-matcher)
-        next_invader = re.search(rf'{city_code}[-_]?\d+\s*\[', html_content[match_pos + 50:], re.IGNORECASE)
-        if next_invader:
+        # Position du prochain invader après celui-ci (avec un offset de 50 pour éviter de se re-matcher)
+        next_idx = bisect_left(boundaries, match_pos + 50)
+        if next_idx < len(boundaries):
             # Le contexte s'arrête au début du prochain invader
-            context_end = match_pos + 50 + next_invader.start()
+            context_end = boundaries[next_idx]
         else:
             # Pas de prochain invader, prendre 1500 chars max (dernier de la page)
             context_end = min(len(html_content), match_pos + 1500)
         
-        context = html_content[match_pos:context_end]
-        context_lower = context.lower()
         
         # ============================================
         # V4: Extraction de la date de pose (landing_date)
@@ -1715,7 +2145,7 @@ def extract_statuses_from_html(html_content, city_code):
         # Format FR: "Date de pose : DD/MM/YYYY"
         # ============================================
         landing_date = None
-        landing_match = re.search(r'(?:Landed\s+on|Date\s+de\s+pose)\s*:\s*(\d{1,2}/\d{1,2}/\d{4})', context, re.IGNORECASE)
+        landing_match = _LANDING_RE.search(html_content, match_pos, context_end)
         if landing_match:
             landing_date = landing_match.group(1).strip()
         
@@ -1726,11 +2156,11 @@ def extract_statuses_from_html(html_content, city_code):
         # Note: On capture jusqu'au prochain label (Date, Instagram) car pas de retour ligne
         # ============================================
         status = 'OK'
-        status_match = re.search(r'(?:Last\s+known\s+state|Dernier\s+[ée]tat\s+connu)\s*:\s*(.+?)(?=Date|Instagram|$)', context, re.IGNORECASE)
+        status_match = _LAST_STATE_RE.search(html_content, match_pos, context_end)
         if status_match:
             raw_status = status_match.group(1).strip()
             # Nettoyer les balises HTML (ex: <img src="nav/spot_invader_unknown.png"...> Inconnu<br>)
-            raw_status = re.sub(r'<[^>]+>', '', raw_status).strip()
+            raw_status = _HTML_TAG_RE.sub('', raw_status).strip()
             raw_status_lower = raw_status.lower()
             
             # Normaliser le statut (FR + EN)
@@ -1753,6 +2183,7 @@ def extract_statuses_from_html(html_content, city_code):
                 status = raw_status.strip()
         else:
             # Fallback: Détecter le statut via l'image nav/spot_invader_*.png
+            context_lower = html_content[match_pos:context_end].lower()
             if 'spot_invader_destroyed' in context_lower or 'détruit' in context_lower or 'destroyed' in context_lower:
                 status = 'destroyed'
             elif 'spot_invader_degraded' in context_lower or 'dégradé' in context_lower or 'degraded' in context_lower:
@@ -1774,7 +2205,7 @@ def extract_statuses_from_html(html_content, city_code):
         # ============================================
         status_date = None
         status_source = None
-        date_source_match = re.search(r'Date\s+(?:and|et)\s+source\s*:\s*([^\n<(]+)(?:\s*\(([^)]+)\))?', context, re.IGNORECASE)
+        date_source_match = _DATE_SOURCE_RE.search(html_content, match_pos, context_end)
         if date_source_match:
             status_date = date_source_match.group(1).strip()
             if date_source_match.group(2):
@@ -1793,14 +2224,14 @@ def extract_statuses_from_html(html_content, city_code):
             
             # Image lieu : photos/PA/PA_0001-*.jpg (la plus récente, après le match)
             # Utiliser le même contexte délimité au prochain invader
-            photo = re.search(
+            photo = re.compile(
                 rf'photos/{city_code}/{city_code}[-_]?0*{num}-[^"\'>\s]+\.(jpg|jpeg|png)',
-                context, re.IGNORECASE
-            )
-            image = re.search(
+                re.IGNORECASE
+            ).search(html_content, match_pos, context_end)
+            image = re.compile(
                 rf'images/{city_code}/{city_code}[-_]?0*{num}-[^"\'>\s]+\.(jpg|jpeg|png)',
-                context, re.IGNORECASE
-            )
+                re.IGNORECASE
+            ).search(html_content, match_pos, context_end)
             if photo:
                 image_lieu = f"{INVADER_SPOTTER_BASE}/{photo.group(0)}"
             elif image:
@@ -1824,15 +2255,15 @@ def extract_statuses_from_html(html_content, city_code):
         
         statuses[inv_name] = inv_data
     
-    # Pattern 2: Fallback - chercher aussi le format avec lien <a>
-    # Au cas où certaines pages utilisent un format différent
-    link_pattern = rf'<a[^>]*>.*?({city_code}[-_]?\d+)\s*\[(\d+|\?\?)\s*pts?\].*?</a>'
-    
-    for match in re.finditer(link_pattern, html_content, re.IGNORECASE | re.DOTALL):
+    # Pattern 2: Fallback - format avec lien <a>
+    # Au cas où certaines pages utilisent un format différent (seulement si
+    # le format <b> n'a rien donné sur cette page)
+    link_matches = pats.link.finditer(html_content) if not statuses else ()
+    for match in link_matches:
         inv_name_raw = match.group(1).upper().replace('-', '_')
         points_raw = match.group(2)
         
-        name_match = re.match(r'([A-Z]+)[-_]?(\d+)', inv_name_raw)
+        name_match = _INVADER_NAME_RE.match(inv_name_raw)
         if name_match:
             prefix, num = name_match.groups()
             inv_name = f"{prefix}_{num}"
@@ -1848,25 +2279,23 @@ def extract_statuses_from_html(html_content, city_code):
         
         # Contexte délimité jusqu'au prochain invader (même logique que pattern principal)
         match_pos = match.start()
-        next_invader = re.search(rf'{city_code}[-_]?\d+\s*\[', html_content[match_pos + 50:], re.IGNORECASE)
-        if next_invader:
-            context_end = match_pos + 50 + next_invader.start()
+        next_idx = bisect_left(boundaries, match_pos + 50)
+        if next_idx < len(boundaries):
+            context_end = boundaries[next_idx]
         else:
             context_end = min(len(html_content), match_pos + 1500)
         
-        context = html_content[match_pos:context_end]
-        context_lower = context.lower()
         
         # V4: Extraction des dates et statuts pour le pattern fallback (FR + EN)
         landing_date = None
-        landing_match = re.search(r'(?:Landed\s+on|Date\s+de\s+pose)\s*:\s*(\d{1,2}/\d{1,2}/\d{4})', context, re.IGNORECASE)
+        landing_match = _LANDING_RE.search(html_content, match_pos, context_end)
         if landing_match:
             landing_date = landing_match.group(1).strip()
         
         status = 'OK'
-        status_match = re.search(r'(?:Last\s+known\s+state|Dernier\s+[ée]tat\s+connu)\s*:\s*(.+?)(?=Date|Instagram|$)', context, re.IGNORECASE)
+        status_match = _LAST_STATE_RE.search(html_content, match_pos, context_end)
         if status_match:
-            raw_status = re.sub(r'<[^>]+>', '', status_match.group(1)).strip().lower()
+            raw_status = _HTML_TAG_RE.sub('', status_match.group(1)).strip().lower()
             if 'very degraded' in raw_status or 'très dégradé' in raw_status:
                 status = 'destroyed'
             elif 'a little degraded' in raw_status or 'peu dégradé' in raw_status or 'légèrement dégradé' in raw_status:
@@ -1880,6 +2309,7 @@ def extract_statuses_from_html(html_content, city_code):
             elif 'unknown' in raw_status or 'inconnu' in raw_status:
                 status = 'unknown'
         else:
+            context_lower = html_content[match_pos:context_end].lower()
             if 'spot_invader_destroyed' in context_lower or 'détruit' in context_lower:
                 status = 'destroyed'
             elif 'spot_invader_degraded' in context_lower or 'dégradé' in context_lower:
@@ -1896,7 +2326,7 @@ def extract_statuses_from_html(html_content, city_code):
         
         status_date = None
         status_source = None
-        date_source_match = re.search(r'Date\s+(?:and|et)\s+source\s*:\s*([^\n<(]+)(?:\s*\(([^)]+)\))?', context, re.IGNORECASE)
+        date_source_match = _DATE_SOURCE_RE.search(html_content, match_pos, context_end)
         if date_source_match:
             status_date = date_source_match.group(1).strip()
             if date_source_match.group(2):
@@ -2007,12 +2437,41 @@ async def discover_cities_from_spotter(page, verbose=False):
             
     except Exception as e:
         print(f"⚠️ Erreur découverte villes: {e}")
-        import traceback
         traceback.print_exc()
     
     return discovered
 
 
+def load_scrape_checkpoint(filepath=SCRAPE_CHECKPOINT_FILE, max_age=SCRAPE_CHECKPOINT_MAX_AGE):
+    """Villes déjà scrapées lors d'un run interrompu récent: {city_code: statuses}"""
+    checkpoint = {}
+    try:
+        with open(filepath, 'rb') as f:
+            lines = f.readlines()
+    except FileNotFoundError:
+        return checkpoint
+    
+    oldest = time.time() - max_age
+    for line in lines:
+        try:
+            entry = orjson.loads(line) if ORJSON_AVAILABLE else json.loads(line)
+        except ValueError:
+            continue  # Ligne tronquée par un crash
+        if entry.get('ts', 0) >= oldest and entry.get('statuses'):
+            checkpoint[entry['city']] = entry['statuses']
+    return checkpoint
+
+
+def append_scrape_checkpoint(f, city_code, statuses):
+    """Ajoute une ville terminée au fichier de reprise (ouvert en 'ab')"""
+    entry = {'city': city_code, 'statuses': statuses, 'ts': time.time()}
+    if ORJSON_AVAILABLE:
+        f.write(orjson.dumps(entry) + b'\n')
+    else:
+        f.write(json.dumps(entry, ensure_ascii=False).encode('utf-8') + b'\n')
+    f.flush()
+
+
 async def scrape_all_cities(github_db, cities_filter=None, headless=True, verbose=False, max_retries=3, pause_ms=1000, discover_new=False):
     """Scrape toutes les villes (avec option de découverte des nouvelles)"""
     from playwright.async_api import async_playwright
@@ -2025,8 +2484,14 @@ async def scrape_all_cities(github_db, cities_filter=None, headless=True, verbos
     
     async with async_playwright() as p:
         browser = await p.chromium.launch(headless=headless)
-        context = await browser.new_context(user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36')
-        page = await context.new_page()
+        # Un seul navigateur, un contexte + une page par worker
+        pages = []
+        for _ in range(SCRAPE_WORKERS):
+            context = await browser.new_context(user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36')
+            # Seul le HTML est lu (les <img src> restent dans page.content())
+            await context.route("**/*", _block_heavy_resources)
+            pages.append(await context.new_page())
+        page = pages[0]
         
         # Découvrir les nouvelles villes si demandé
         if discover_new:
@@ -2066,29 +2531,51 @@ async def scrape_all_cities(github_db, cities_filter=None, headless=True, verbos
         if cities_not_in_github and verbose:
             print(f"   ℹ️ {len(cities_not_in_github)} villes dans CITY_CODES mais pas dans GitHub: {sorted(cities_not_in_github)[:10]}...")
         
-        print(f"\n🌐 Scraping {len(cities_to_scrape)} villes...")
-        
-        for i, (city_code, count) in enumerate(sorted(cities_to_scrape.items()), 1):
-            city_name = CITY_NAMES.get(city_code, city_code)
-            is_new = city_code in new_cities_found
-            is_not_in_github = city_code in cities_not_in_github
-            marker = "🆕 " if is_new else ("📍 " if is_not_in_github else "")
-            print(f"   [{i}/{len(cities_to_scrape)}] {marker}{city_code} ({city_name})...", end='', flush=True)
-            
-            statuses = await scrape_city_playwright(page, city_code, verbose, max_retries)
-            
-            if statuses:
-                all_statuses.update(statuses)
-                print(f" ✓ {len(statuses)}")
-                success_count += 1
-            else:
-                print(f" ○")
-            
-            if i < len(cities_to_scrape):
-                await page.wait_for_timeout(pause_ms)
+        print(f"\n🌐 Scraping {len(cities_to_scrape)} villes ({SCRAPE_WORKERS} en parallèle)...")
+        
+        # Reprendre les villes déjà terminées par un run interrompu récent
+        checkpoint = load_scrape_checkpoint()
+        city_statuses = {c: checkpoint[c] for c in cities_to_scrape if c in checkpoint}
+        if city_statuses:
+            print(f"   ♻️ {len(city_statuses)} villes reprises de {SCRAPE_CHECKPOINT_FILE.name}")
+        
+        queue = asyncio.Queue()
+        for i, city_code in enumerate(sorted(cities_to_scrape), 1):
+            if city_code not in city_statuses:
+                queue.put_nowait((i, city_code))
+        
+        async def worker(page):
+            while not queue.empty():
+                i, city_code = queue.get_nowait()
+                statuses = await scrape_city_playwright(page, city_code, verbose, max_retries)
+                city_statuses[city_code] = statuses
+                if statuses:
+                    append_scrape_checkpoint(checkpoint_file, city_code, statuses)
+                
+                city_name = CITY_NAMES.get(city_code, city_code)
+                is_new = city_code in new_cities_found
+                is_not_in_github = city_code in cities_not_in_github
+                marker = "🆕 " if is_new else ("📍 " if is_not_in_github else "")
+                result = f"✓ {len(statuses)}" if statuses else "○"
+                print(f"   [{i}/{len(cities_to_scrape)}] {marker}{city_code} ({city_name})... {result}")
+                
+                if not queue.empty():
+                    await page.wait_for_timeout(pause_ms)
         
+        with open(_p(SCRAPE_CHECKPOINT_FILE), 'ab') as checkpoint_file:
+            await asyncio.gather(*(worker(pg) for pg in pages))
         await browser.close()
     
+    # Run allé au bout: le prochain lancement repart de zéro
+    SCRAPE_CHECKPOINT_FILE.unlink(missing_ok=True)
+    
+    # Fusion dans l'ordre alphabétique des villes, comme en séquentiel
+    for city_code in sorted(city_statuses):
+        statuses = city_statuses[city_code]
+        if statuses:
+            all_statuses.update(statuses)
+            success_count += 1
+    
     print(f"\n✅ {success_count}/{len(cities_to_scrape)} villes, {len(all_statuses)} invaders")
     
     if new_cities_found:
@@ -2278,7 +2765,7 @@ def parse_github_issue(issue):
         result['city'] = city_match.group(1).strip()
     # Déduire de l'ID si pas trouvé
     if not result['city'] and result['invader_id']:
-        city_from_id = re.match(r'^([A-Z]+)[-_]', result['invader_id'])
+        city_from_id = _CITY_PREFIX_RE.match(result['invader_id'])
         if city_from_id:
             result['city'] = city_from_id.group(1)
     
@@ -2516,7 +3003,7 @@ def apply_github_issues(master_db, issues, repo=None, token=None, verbose=False,
             
         else:
             # Invader inconnu — l'ajouter comme nouveau
-            city_match = re.match(r'^([A-Z]+)[-_]', inv_id)
+            city_match = _CITY_PREFIX_RE.match(inv_id)
             city_code = city_match.group(1) if city_match else None
             
             new_inv = {
@@ -2697,7 +3184,7 @@ def merge_databases(github_db, spotter_statuses, community_reports=None, previou
                     updated_inv[v4_field] = prev_inv[v4_field]
         
         if not updated_inv.get('city'):
-            m = re.match(r'^([A-Z]+)[-_]', name)
+            m = _CITY_PREFIX_RE.match(name)
             if m:
                 updated_inv['city'] = m.group(1)
         
@@ -4077,6 +4564,7 @@ async def main_async():
     headless, verbose, merge_only, apply_reports, backup, dry_run = True, False, False, False, False, False
     geolocate, add_missing, discover_new, geolocate_missing, process_issues = False, False, False, False, False
     addresses_file = None
+    use_geocode_cache = True
     missing_file = _p(MISSING_FILE)
     merge_geolocated_file = None
     max_retries, pause_ms = 3, 1000
@@ -4102,6 +4590,7 @@ async def main_async():
         elif a == '--discover-new': discover_new = True
         elif a == '--geolocate-missing': geolocate_missing = True
         elif a == '--process-issues': process_issues = True
+        elif a == '--no-cache': use_geocode_cache = False
         elif a == '--merge-geolocated' and i+1 < len(args):
             merge_geolocated_file = args[i+1]; i += 1
         elif a == '--missing-file' and i+1 < len(args):
@@ -4305,7 +4794,7 @@ async def main_async():
     if addresses_file:
         manual_addresses = load_manual_addresses(addresses_file)
         if manual_addresses:
-            manual_geocoded = geocode_manual_addresses(manual_addresses, verbose)
+            manual_geocoded = geocode_manual_addresses(manual_addresses, verbose, use_geocode_cache)
     
     if merge_only:
         if SCRAPED_FILE.exists():
@@ -4329,7 +4818,7 @@ async def main_async():
     geolocated = []
     geo_audits = []
     if geolocate and not_in_github:
-        geolocated, geo_audits = await geolocate_missing_invaders(not_in_github, headless, verbose)
+        geolocated, geo_audits = await geolocate_missing_invaders(not_in_github, headless, verbose, use_cache=use_geocode_cache)
     
     # Ajouter les invaders manquants au JSON si demandé
     if add_missing:
@@ -4337,55 +4826,6 @@ async def main_async():
         manual_count = 0
         unknown_count = 0
         
-        # Centres des villes pour les invaders sans géolocalisation
-        city_centers = {
-            'PA': {'lat': 48.8566, 'lng': 2.3522, 'name': 'Paris'},
-            'LY': {'lat': 45.7640, 'lng': 4.8357, 'name': 'Lyon'},
-            'MARS': {'lat': 43.2965, 'lng': 5.3698, 'name': 'Marseille'},
-            'LDN': {'lat': 51.5074, 'lng': -0.1278, 'name': 'London'},
-            'NY': {'lat': 40.7128, 'lng': -74.0060, 'name': 'New York'},
-            'LA': {'lat': 34.0522, 'lng': -118.2437, 'name': 'Los Angeles'},
-            'TK': {'lat': 35.6762, 'lng': 139.6503, 'name': 'Tokyo'},
-            'ROM': {'lat': 41.9028, 'lng': 12.4964, 'name': 'Rome'},
-            'BCN': {'lat': 41.3851, 'lng': 2.1734, 'name': 'Barcelona'},
-            'BKK': {'lat': 13.7563, 'lng': 100.5018, 'name': 'Bangkok'},
-            'BGK': {'lat': 13.7563, 'lng': 100.5018, 'name': 'Bangkok'},
-            'HK': {'lat': 22.3193, 'lng': 114.1694, 'name': 'Hong Kong'},
-            'MIA': {'lat': 25.7617, 'lng': -80.1918, 'name': 'Miami'},
-            'SD': {'lat': 32.7157, 'lng': -117.1611, 'name': 'San Diego'},
-            'SP': {'lat': -23.5505, 'lng': -46.6333, 'name': 'São Paulo'},
-            'POTI': {'lat': -19.5836, 'lng': -65.7531, 'name': 'Potosí'},
-            'AMS': {'lat': 52.3676, 'lng': 4.9041, 'name': 'Amsterdam'},
-            'RTD': {'lat': 51.9225, 'lng': 4.4792, 'name': 'Rotterdam'},
-            'BRL': {'lat': 52.5200, 'lng': 13.4050, 'name': 'Berlin'},
-            'MUN': {'lat': 48.1351, 'lng': 11.5820, 'name': 'Munich'},
-            'KLN': {'lat': 50.9375, 'lng': 6.9603, 'name': 'Cologne'},
-            'FKF': {'lat': 50.1109, 'lng': 8.6821, 'name': 'Frankfurt'},
-            'WN': {'lat': 48.2082, 'lng': 16.3738, 'name': 'Vienna'},
-            'BXL': {'lat': 50.8503, 'lng': 4.3517, 'name': 'Brussels'},
-            'LJU': {'lat': 46.0569, 'lng': 14.5058, 'name': 'Ljubljana'},
-            'IST': {'lat': 41.0082, 'lng': 28.9784, 'name': 'Istanbul'},
-            'MLB': {'lat': -37.8136, 'lng': 144.9631, 'name': 'Melbourne'},
-            'PRT': {'lat': -31.9505, 'lng': 115.8605, 'name': 'Perth'},
-            'KAT': {'lat': 27.7172, 'lng': 85.3240, 'name': 'Kathmandu'},
-            'SL': {'lat': 37.5665, 'lng': 126.9780, 'name': 'Seoul'},
-            'DJN': {'lat': 36.3504, 'lng': 127.3845, 'name': 'Daejeon'},
-            'DHK': {'lat': 23.8103, 'lng': 90.4125, 'name': 'Dhaka'},
-            'BT': {'lat': 27.4712, 'lng': 89.6339, 'name': 'Bhutan'},
-            'CCU': {'lat': 21.1619, 'lng': -86.8515, 'name': 'Cancún'},
-            'DJBA': {'lat': 33.8076, 'lng': 10.8451, 'name': 'Djerba'},
-            'MRAK': {'lat': 31.6295, 'lng': -7.9811, 'name': 'Marrakech'},
-            'RBA': {'lat': 34.0209, 'lng': -6.8416, 'name': 'Rabat'},
-            'MBSA': {'lat': -4.0435, 'lng': 39.6682, 'name': 'Mombasa'},
-            'NCL': {'lat': 54.9783, 'lng': -1.6178, 'name': 'Newcastle'},
-            'MAN': {'lat': 53.4808, 'lng': -2.2426, 'name': 'Manchester'},
-            'MLGA': {'lat': 36.7213, 'lng': -4.4214, 'name': 'Malaga'},
-            'BBO': {'lat': 43.2630, 'lng': -2.9350, 'name': 'Bilbao'},
-            'BRC': {'lat': 41.3851, 'lng': 2.1734, 'name': 'Barcelona'},
-            'RA': {'lat': 44.4184, 'lng': 12.2035, 'name': 'Ravenna'},
-            'RAV': {'lat': 44.4184, 'lng': 12.2035, 'name': 'Ravenna'},
-        }
-        
         # Créer un index des invaders déjà dans updated_db
         existing_ids = set()
         for inv in updated_db:
@@ -4400,7 +4840,7 @@ async def main_async():
             for inv_id, geo in manual_geocoded.items():
                 if inv_id not in existing_ids:
                     # Extraire le code ville
-                    city_match = re.match(r'^([A-Z]+)[-_]', inv_id)
+                    city_match = _CITY_PREFIX_RE.match(inv_id)
                     city_code = city_match.group(1) if city_match else None
                     
                     # Chercher les infos dans not_in_github ou scraped_statuses
@@ -4461,7 +4901,7 @@ async def main_async():
                     continue
                 
                 city_code = inv.get('city')
-                city_info = city_centers.get(city_code, {})
+                city_info = CITY_CENTERS.get(city_code, {})
                 
                 new_inv = {
                     'id': inv_id,
@@ -4488,7 +4928,7 @@ async def main_async():
                     new_inv['location_unknown'] = False
                     if geo_data.get('address'):
                         new_inv['address'] = geo_data['address']
-                elif city_code and city_code in city_centers:
+                elif city_code and city_code in CITY_CENTERS:
                     # Fallback: centre de la ville
                     new_inv['lat'] = city_info['lat']
                     new_inv['lng'] = city_info['lng']
@@ -4532,7 +4972,6 @@ async def main_async():
     
     # Mettre à jour metadata.json
     if not dry_run:
-        from collections import Counter
         cities_count = Counter(inv.get('city', '?') for inv in updated_db)
         statuts_count = Counter(inv.get('status', '?') for inv in updated_db)
         with_coords = sum(1 for inv in updated_db if inv.get('lat') and inv.get('lng'))
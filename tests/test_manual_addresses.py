@@ -0,0 +1,37 @@
+"""Tests du parseur d'adresses manuelles (scripts/update_from_spotter.py)"""
+import io
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+from update_from_spotter import _parse_manual_address_lines
+
+
+class ParseManualAddressLinesTest(unittest.TestCase):
+
+    def test_quoted_address_with_comma(self):
+        lines = io.StringIO(
+            'code,url,adresse\n'
+            'PA_1, http://x, "12, rue de la Paix"\n'
+        )
+        addresses = _parse_manual_address_lines(lines)
+        self.assertEqual(addresses, {
+            'PA_1': {'address': '12, rue de la Paix', 'image_url': 'http://x'},
+        })
+
+    def test_unterminated_quote_only_breaks_its_line(self):
+        lines = io.StringIO(
+            'PA_1, http://x, "12 rue de la Paix\n'
+            'PA_2, http://y, 5 avenue Foch\n'
+            'PA_3, http://z, "8 boulevard Voltaire"\n'
+        )
+        addresses = _parse_manual_address_lines(lines)
+        self.assertEqual(addresses['PA_1']['address'], '12 rue de la Paix')
+        self.assertEqual(addresses['PA_2'], {'address': '5 avenue Foch', 'image_url': 'http://y'})
+        self.assertEqual(addresses['PA_3'], {'address': '8 boulevard Voltaire', 'image_url': 'http://z'})
+
+
+if __name__ == '__main__':
+    unittest.main()